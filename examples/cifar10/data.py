@@ -17,7 +17,10 @@ import os
 import numpy as np
 from PIL import Image
 from tqdm import tqdm
-from neon.frontend.aeon_shim import AeonDataLoader
+try:
+    from neon.frontend.aeon_shim import AeonDataLoader
+except ImportError:
+    from neon.frontend import ManifestDataLoader as AeonDataLoader
 from neon.util.persist import get_data_cache_or_nothing
 from neon.frontend import CIFAR10
 
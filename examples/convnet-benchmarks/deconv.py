@@ -0,0 +1,86 @@
+#!/usr/bin/env python
+# ******************************************************************************
+# Copyright 2017-2018 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ******************************************************************************
+"""
+Deconvolution Benchmark
+
+Times a deconvolution against the same transpose convolution written by hand as the
+derivative of a convolution with respect to its input, and checks they compute the same values.
+
+./deconv.py -z 32 -t 20
+
+"""
+from __future__ import print_function
+from contextlib import closing
+from timeit import default_timer
+
+import numpy as np
+import neon as ng
+import neon.transformers as ngt
+from neon.frontend import NeonArgparser
+
+parser = NeonArgparser(description='Time a deconvolution against a hand-built transpose conv')
+parser.add_argument('--image_size', type=int, default=32,
+                    help='height and width of the deconvolution output')
+parser.add_argument('--channels', type=int, default=64,
+                    help='number of input and output channels')
+parser.set_defaults(batch_size=32, num_iterations=20)
+args = parser.parse_args()
+
+N = ng.make_axis(length=args.batch_size, name='N')
+C = ng.make_axis(length=args.channels, name='C')
+K = ng.make_axis(length=args.channels, name='K')
+H = ng.make_axis(length=args.image_size, name='H')
+W = ng.make_axis(length=args.image_size, name='W')
+R = ng.make_axis(length=4, name='R')
+S = ng.make_axis(length=4, name='S')
+H_in = ng.make_axis(length=args.image_size // 2, name='H')
+W_in = ng.make_axis(length=args.image_size // 2, name='W')
+
+# the deconvolution is the transpose of a stride 2 convolution from (C, H, W) to (K, H_in, W_in)
+conv_params = dict(str_h=2, str_w=2, dil_h=1, dil_w=1, pad_h=1, pad_w=1)
+rng = np.random.RandomState(args.rng_seed)
+filter_values = rng.uniform(-0.1, 0.1, (K.length, C.length, R.length, S.length))
+x = ng.placeholder([N, K, H_in, W_in])
+
+deconv_filters = ng.constant(filter_values, [K, C, R, S])
+deconv = ng.deconvolution(conv_params, x, deconv_filters, axes=ng.make_axes([N, C, H, W]))
+
+conv_inputs = ng.variable([N, C, H, W], initial_value=0)
+conv_filters = ng.constant(filter_values, [K, C, R, S])
+conv = ng.convolution(conv_params, conv_inputs, conv_filters, axes=x.axes)
+transpose_conv = ng.deriv(ng.sum(conv * x, out_axes=()), conv_inputs)
+
+
+def time_computation(computation, x_value):
+    computation(x_value)
+    start = default_timer()
+    for _ in range(args.num_iterations):
+        result = computation(x_value)
+    return result, (default_timer() - start) / args.num_iterations
+
+
+with closing(ngt.make_transformer()) as transformer:
+    deconv_computation = transformer.computation(deconv, x)
+    transpose_computation = transformer.computation(transpose_conv, x)
+
+    x_value = rng.uniform(-1, 1, x.axes.lengths)
+    deconv_result, deconv_time = time_computation(deconv_computation, x_value)
+    transpose_result, transpose_time = time_computation(transpose_computation, x_value)
+
+print('deconvolution:         {:.3f} ms'.format(deconv_time * 1000))
+print('hand-built transpose:  {:.3f} ms'.format(transpose_time * 1000))
+print('max difference:        {:.3g}'.format(np.max(np.abs(deconv_result - transpose_result))))
@@ -0,0 +1,69 @@
+#!/usr/bin/env python
+# ******************************************************************************
+# Copyright 2017-2018 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ******************************************************************************
+"""
+Random Number Generation Benchmark
+
+Times a dropout mask generated inside the compiled function with Philox against the same mask
+drawn on the host with numpy and fed to the function, which is the default.
+
+./dropout_rng.py -z 128 -t 20
+
+"""
+from __future__ import print_function
+from contextlib import closing
+from timeit import default_timer
+
+import numpy as np
+import neon as ng
+import neon.transformers as ngt
+from neon.frontend import NeonArgparser
+
+parser = NeonArgparser(description='Time device against host generated dropout masks')
+parser.add_argument('--features', type=int, default=4096,
+                    help='number of features masked for each example')
+parser.add_argument('--keep', type=float, default=0.5,
+                    help='fraction of the features kept')
+parser.set_defaults(batch_size=128, num_iterations=20)
+args = parser.parse_args()
+
+F = ng.make_axis(length=args.features, name='F')
+N = ng.make_axis(length=args.batch_size, name='N')
+x = ng.placeholder([F, N])
+mask = ng.uniform(ng.make_axes([F, N]), low=0.0, high=1.0) <= args.keep
+dropout = x * mask * (1.0 / args.keep)
+
+
+def time_dropout(device_rng):
+    factory = ngt.make_transformer_factory(args.backend, rng_seed=args.rng_seed,
+                                           device_rng=device_rng)
+    with closing(factory()) as transformer:
+        computation = transformer.computation(dropout, x)
+        x_value = np.random.RandomState(args.rng_seed).uniform(0, 1, x.axes.lengths)
+        result = computation(x_value)
+        start = default_timer()
+        for _ in range(args.num_iterations):
+            result = computation(x_value)
+        return result, (default_timer() - start) / args.num_iterations
+
+
+host_result, host_time = time_dropout(False)
+device_result, device_time = time_dropout(True)
+
+print('host generated mask:    {:.3f} ms'.format(host_time * 1000))
+print('device generated mask:  {:.3f} ms'.format(device_time * 1000))
+print('kept fraction:          {:.3f} (host), {:.3f} (device)'.format(
+    (host_result != 0).mean(), (device_result != 0).mean()))
@@ -0,0 +1,131 @@
+# ******************************************************************************
+# Copyright 2017-2018 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ******************************************************************************
+"""
+Times the tokenization of the text datasets against the list based implementations they
+replaced, on the full Shakespeare, PTB and IMDB corpora.
+
+./text_loading.py --data_dir ./data
+./text_loading.py --synthetic
+
+With --synthetic, random corpora of the sizes of the real ones are used instead of downloading
+them.
+"""
+from __future__ import print_function
+import argparse
+import os
+import time
+
+import numpy as np
+
+from neon.frontend.data.imdb import preprocess_text
+from neon.frontend.data.text import lookup, make_vocab
+from neon.util.persist import fetch_file, pickle_load, valid_path_append
+
+
+def list_digitize(train, test):
+    vocab = sorted(set(train))
+    token_to_index = dict((t, i + 1) for i, t in enumerate(vocab))
+    return [np.asarray([token_to_index[t] if t in vocab else 0 for t in text], dtype=np.uint32)
+            for text in (train, test)]
+
+
+def array_digitize(train, test):
+    vocab, _ = make_vocab(train)
+    return [lookup(text, vocab, offset=1, unknown=0) for text in (train, test)]
+
+
+def list_map(phases):
+    vocab = sorted(set(phases[0]))
+    token_to_index = dict((t, i) for i, t in enumerate(vocab))
+    return [np.asarray([token_to_index[t] for t in tokens], dtype=np.uint32)
+            for tokens in phases]
+
+
+def array_map(phases):
+    vocab, train = make_vocab(phases[0])
+    return [train] + [lookup(tokens, vocab) for tokens in phases[1:]]
+
+
+def list_preprocess_text(X, vocab_size, oov=2, start=1, index_from=3):
+    X = [[start] + [w + index_from for w in x] for x in X]
+    return [[oov if w >= vocab_size else w for w in x] for x in X]
+
+
+def read(data_dir, url, filename):
+    workdir, filepath = valid_path_append(data_dir, '', filename)
+    if not os.path.exists(filepath):
+        fetch_file(url, filename, filepath)
+    return filepath
+
+
+def load_corpora(args):
+    rng = np.random.RandomState(0)
+    if args.synthetic:
+        chars = np.array(list('abcdefghijklmnopqrstuvwxyz ABCDEFGHIJKLMNOPQRSTUVWXYZ\n.,;:!?'))
+        shakespeare = ''.join(rng.choice(chars, 4573338))
+        words = ['w{}'.format(i) for i in range(10000)]
+        ptb = [' '.join(rng.choice(words, n)) for n in (887521, 78669, 70390)]
+        reviews = [rng.randint(0, 80000, rng.randint(10, 500)).tolist() for _ in range(50000)]
+        return shakespeare, ptb, reviews
+
+    shakespeare = open(read(args.data_dir, 'http://cs.stanford.edu/people/karpathy/char-rnn/',
+                            'shakespeare_input.txt')).read()
+    ptb = [open(read(args.data_dir,
+                     'https://raw.githubusercontent.com/wojzaremba/lstm/master/data',
+                     'ptb.{}.txt'.format(phase))).read()
+           for phase in ('train', 'test', 'valid')]
+    with open(read(args.data_dir, 'https://s3.amazonaws.com/text-datasets', 'imdb.pkl'),
+              'rb') as f:
+        reviews, _ = pickle_load(f)
+    return shakespeare, ptb, reviews
+
+
+def timed(name, function, *args):
+    start = time.time()
+    result = function(*args)
+    print('{:40s} {:8.3f} s'.format(name, time.time() - start))
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--data_dir', default='./data')
+    parser.add_argument('--synthetic', action='store_true')
+    args = parser.parse_args()
+
+    shakespeare, ptb, reviews = load_corpora(args)
+    split = int(0.9 * len(shakespeare))
+    texts = (shakespeare[:split], shakespeare[split:])
+    expected = timed('Shakespeare characters, lists', list_digitize, *texts)
+    result = timed('Shakespeare characters, arrays', array_digitize, *texts)
+    assert all(np.array_equal(x, y) for x, y in zip(expected, result))
+
+    expected = timed('PTB characters, lists', list_map, ptb)
+    result = timed('PTB characters, arrays', array_map, ptb)
+    assert all(np.array_equal(x, y) for x, y in zip(expected, result))
+
+    words = [text.strip().split() for text in ptb]
+    expected = timed('PTB words, lists', list_map, words)
+    result = timed('PTB words, arrays', array_map, words)
+    assert all(np.array_equal(x, y) for x, y in zip(expected, result))
+
+    expected = timed('IMDB reviews, lists', list_preprocess_text, reviews, 20000)
+    result = timed('IMDB reviews, arrays', preprocess_text, reviews, 20000)
+    assert all(np.array_equal(x, y) for x, y in zip(expected, result))
+
+
+if __name__ == '__main__':
+    main()
@@ -31,6 +31,7 @@ from neon.op_graph.batchnorm import batchnormcommon, batchnorminference, \
     batchnormoutput, batchnormmean, batchnormvar, batchnormbpropcommon, \
     batchnormbpropdata, batchnormbpropgamma, batchnormbpropbeta, batchnormtrain
 from neon.op_graph.relu import relu
+from neon.op_graph.scan import scan
 from neon.op_graph.debug import PrintOp
 from neon.op_graph.op_graph import *
 from neon.op_graph.op_graph import axes_with_order, \
@@ -41,7 +42,7 @@ from neon.op_graph.op_graph import axes_with_order, \
     temporary, variance, squared_L2, \
     negative, absolute, sin, cos, tanh, exp, log, reciprocal, safelog, sign, \
     square, sqrt, tensor_size, assign, batch_size, pad, sigmoid, \
-    one_hot, stack
+    one_hot, stack, checkpoint, recompute
 import neon.testing as testing
 
 __all__ = [
@@ -53,6 +54,7 @@ __all__ = [
     'batch_size',
     'broadcast',
     'cast_axes',
+    'checkpoint',
     'computation',
     'constant',
     'convolution',
@@ -71,7 +73,9 @@ __all__ = [
     'placeholder',
     'pooling',
     'reciprocal',
+    'recompute',
     'safelog',
+    'scan',
     'sequential',
     'sigmoid',
     'sign',
@@ -0,0 +1,212 @@
+# ******************************************************************************
+# Copyright 2017-2018 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ******************************************************************************
+from __future__ import division
+
+import itertools
+from collections import defaultdict
+
+from neon.op_graph.op_graph import Op
+from orderedset import OrderedSet
+
+
+def tensor_storage(op):
+    """
+    Returns the TensorDescription of the storage that holds the value of op.
+
+    Views such as broadcasts, reorders and slices share the storage of the op they view.
+
+    Arguments:
+        op: An op-graph Op.
+
+    Returns:
+        The base TensorDescription, or None if op does not have a tensor value.
+    """
+    if not op.is_tensor_op:
+        return None
+    try:
+        tensor_description = op.tensor_description()
+    except NotImplementedError:
+        return None
+    if tensor_description is None:
+        return None
+    return tensor_description.base
+
+
+def tensor_bytes(tensor_description, batch_size=None):
+    """
+    Size of a tensor in bytes.
+
+    Arguments:
+        tensor_description: A base TensorDescription.
+        batch_size (int, optional): If supplied, the size the tensor would have if its batch
+            axis had this length.
+
+    Returns:
+        The size in bytes.
+    """
+    size = tensor_description.tensor_size
+    if batch_size is not None:
+        batch_axis = tensor_description.axes.batch_axis()
+        if batch_axis is not None:
+            size = size * batch_size // batch_axis.length
+    return size
+
+
+def liveness(ordered_ops, returns=()):
+    """
+    Computes the transient tensors live while each op executes.
+
+    A tensor is live from the first op that touches it to the last op that reads it. Persistent
+    tensors (variables, constants and placeholders) are live for the whole computation and are
+    not included.
+
+    Arguments:
+        ordered_ops: Ops in execution order.
+        returns: Ops whose values must stay live until the end of the computation.
+
+    Returns:
+        A list with the OrderedSet of live base TensorDescriptions for each op in ordered_ops.
+    """
+    first_use = dict()
+    last_use = dict()
+    for index, op in enumerate(ordered_ops):
+        for arg in itertools.chain((op,), op.args):
+            storage = tensor_storage(arg)
+            if storage is None or storage.is_persistent:
+                continue
+            first_use.setdefault(storage, index)
+            last_use[storage] = index
+
+    for op in returns:
+        storage = tensor_storage(op.forwarded)
+        if storage in last_use:
+            last_use[storage] = len(ordered_ops) - 1
+
+    starts = defaultdict(list)
+    ends = defaultdict(list)
+    for storage, index in first_use.items():
+        starts[index].append(storage)
+    for storage, index in last_use.items():
+        ends[index].append(storage)
+
+    live_sets = []
+    live = OrderedSet()
+    for index in range(len(ordered_ops)):
+        live.update(starts[index])
+        live_sets.append(OrderedSet(live))
+        for storage in ends[index]:
+            live.discard(storage)
+    return live_sets
+
+
+class MemoryEstimate(object):
+    """
+    Memory use of a computation for a given execution order.
+
+    Arguments:
+        ordered_ops: Ops in execution order.
+        live_sets: Live transient tensors for each op, as computed by liveness.
+        batch_size (int, optional): Batch size used to scale tensors with a batch axis.
+
+    Attributes:
+        ordered_ops: Ops in execution order.
+        live_sets: Live transient tensors for each op.
+        live_bytes: Bytes of live transient tensors for each op.
+        peak_bytes: The largest value in live_bytes.
+        peak_op: The op executing when the peak is reached.
+        persistent_bytes: Bytes of variables, constants and placeholders used.
+    """
+
+    def __init__(self, ordered_ops, live_sets, batch_size=None, **kwargs):
+        super(MemoryEstimate, self).__init__(**kwargs)
+        self.ordered_ops = ordered_ops
+        self.live_sets = live_sets
+        self.batch_size = batch_size
+        self.live_bytes = [sum(tensor_bytes(storage, batch_size) for storage in live)
+                           for live in live_sets]
+
+        if self.live_bytes:
+            self.peak_index = max(range(len(self.live_bytes)), key=self.live_bytes.__getitem__)
+            self.peak_bytes = self.live_bytes[self.peak_index]
+            self.peak_op = ordered_ops[self.peak_index]
+        else:
+            self.peak_index = None
+            self.peak_bytes = 0
+            self.peak_op = None
+
+        persistent = OrderedSet()
+        for op in ordered_ops:
+            for arg in itertools.chain((op,), op.args):
+                storage = tensor_storage(arg)
+                if storage is not None and storage.is_persistent:
+                    persistent.add(storage)
+        self.persistent_bytes = sum(tensor_bytes(storage, batch_size) for storage in persistent)
+
+    @property
+    def total_peak_bytes(self):
+        """
+        Returns:
+            Peak transient memory plus all persistent memory.
+        """
+        return self.peak_bytes + self.persistent_bytes
+
+    def top_scopes(self, count=10, depth=None):
+        """
+        Finds the scopes holding the most memory at the peak.
+
+        Arguments:
+            count (int): Number of scopes to return.
+            depth (int, optional): If supplied, only the first depth components of each
+                scope name are used, so nested scopes are merged into their layer.
+
+        Returns:
+            A list of (scope name, bytes) pairs, largest first.
+        """
+        if self.peak_index is None:
+            return []
+        scope_bytes = defaultdict(int)
+        for storage in self.live_sets[self.peak_index]:
+            op = storage.op
+            scope = op.scope.name if op is not None and op.scope is not None else 'root'
+            if depth is not None:
+                scope = '/'.join(scope.split('/')[:depth])
+            scope_bytes[scope] += tensor_bytes(storage, self.batch_size)
+        return sorted(scope_bytes.items(), key=lambda item: item[1], reverse=True)[:count]
+
+    def __str__(self):
+        lines = ['Peak transient memory: {} bytes at {}'.format(self.peak_bytes, self.peak_op),
+                 'Persistent memory: {} bytes'.format(self.persistent_bytes)]
+        lines.extend('    {:<60} {:>14}'.format(scope, size) for scope, size in self.top_scopes())
+        return '\n'.join(lines)
+
+
+def estimate_memory(roots, batch_size=None, ordered_ops=None):
+    """
+    Estimates the peak memory needed to compute roots.
+
+    Arguments:
+        roots: Ops whose values are computed.
+        batch_size (int, optional): If supplied, tensors with a batch axis are scaled to this
+            batch size.
+        ordered_ops (optional): Execution order to analyze. Defaults to Op.ordered_ops(roots).
+
+    Returns:
+        A MemoryEstimate.
+    """
+    if ordered_ops is None:
+        ordered_ops = Op.ordered_ops(roots)
+    live_sets = liveness(ordered_ops, returns=roots)
+    return MemoryEstimate(ordered_ops, live_sets, batch_size=batch_size)
@@ -21,6 +21,8 @@ from neon.frontend.activation import Rectlin, Rectlinclip, Identity, Explin, Nor
     Logistic
 from neon.frontend.argparser import NeonArgparser
 from neon.frontend.arrayiterator import *
+from neon.frontend.augmentation import ImageAugmentation, AugmentedIterator
+from neon.frontend.manifestloader import ManifestDataLoader
 from neon.frontend.callbacks import *
 # from neon.frontend.callbacks2 import *
 from neon.frontend.layer import *
@@ -15,10 +15,12 @@
 # ******************************************************************************
 from __future__ import print_function, absolute_import
 import logging
+import os
 
 from builtins import object
 
 import neon as ng
+from neon.frontend.manifestloader import write_manifest_shard
 
 logger = logging.getLogger(__name__)
 try:
@@ -42,8 +44,21 @@ NAME_MAP = {"channels": "C",
 
 
 class AeonDataLoader(object):
+    """
+    Arguments:
+        config (dict): aeon DataLoader config.
+        num_shards (int): Number of data-parallel workers the manifest is split between. Each
+                          worker loads a disjoint shard of the manifest, written next to it.
+        shard_index (int): Index of the worker loading this shard.
+    """
 
-    def __init__(self, config, *args, **kwargs):
+    def __init__(self, config, num_shards=1, shard_index=0, *args, **kwargs):
+        if num_shards > 1:
+            manifest = config['manifest_filename']
+            config = dict(config,
+                          manifest_filename=write_manifest_shard(
+                              manifest, num_shards, shard_index, config.get('random_seed', 0)),
+                          manifest_root=config.get('manifest_root') or os.path.dirname(manifest))
         self.config = config
         self._dataloader = DataLoader(config)
         self.ndata = self._dataloader.ndata
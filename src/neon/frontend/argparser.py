@@ -111,5 +111,8 @@ class NeonArgparser(configargparse.ArgumentParser):
         return args
 
     def make_and_set_transformer_factory(self, args):
-        factory = ngt.make_transformer_factory(args.backend)
+        factory_args = dict()
+        if args.rng_seed is not None:
+            factory_args['rng_seed'] = args.rng_seed
+        factory = ngt.make_transformer_factory(args.backend, **factory_args)
         ngt.set_transformer_factory(factory)
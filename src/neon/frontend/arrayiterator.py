@@ -14,19 +14,92 @@
 # limitations under the License.
 # ******************************************************************************
 from __future__ import division
+import json
+import os
 import numpy as np
 import neon as ng
 from future.utils import viewitems
 import six
+from six.moves import queue
+import threading
 from neon.frontend import ax
 import collections
 
 
+MAPPED_HEADER = 'header.json'
+
+
+def save_mapped_arrays(path, data_arrays):
+    """
+    Writes a dataset to a directory from which load_mapped_arrays maps it back.
+
+    Each array is written raw to its own file, and a JSON header holds the keys, axes names,
+    dtypes and shapes.
+
+    Arguments:
+        path (str): Directory to write to.
+        data_arrays (dict): Map from key to a dict with the 'data' array and its 'axes' names.
+    """
+    if not os.path.isdir(path):
+        os.makedirs(path)
+    header = []
+    for i, (k, v) in enumerate(data_arrays.items()):
+        data = np.ascontiguousarray(v['data'])
+        filename = '{}.bin'.format(i)
+        data.tofile(os.path.join(path, filename))
+        header.append({'key': k, 'axes': v['axes'], 'dtype': data.dtype.str,
+                       'shape': data.shape, 'file': filename})
+    with open(os.path.join(path, MAPPED_HEADER), 'w') as f:
+        json.dump(header, f)
+
+
+def load_mapped_arrays(path):
+    """
+    Maps a dataset written by save_mapped_arrays into memory without reading it.
+
+    Arguments:
+        path (str): Directory of the dataset.
+
+    Returns:
+        dict: Map from key to a dict with the read-only 'data' memmap and its 'axes' names.
+    """
+    with open(os.path.join(path, MAPPED_HEADER)) as f:
+        header = json.load(f)
+    return {entry['key']: {'data': np.memmap(os.path.join(path, entry['file']),
+                                             dtype=np.dtype(entry['dtype']), mode='r',
+                                             shape=tuple(entry['shape'])),
+                           'axes': tuple(entry['axes'])}
+            for entry in header}
+
+
+def shard_bounds(ndata, num_shards, shard_index):
+    """
+    Returns:
+        The start and the size of shard shard_index when ndata examples are split into
+        num_shards disjoint shards of the same size.
+    """
+    if not 0 <= shard_index < num_shards:
+        raise ValueError("Shard index {} is not in [0, {})".format(shard_index, num_shards))
+    size = ndata // num_shards
+    return shard_index * size, size
+
+
+def open_array(data):
+    """
+    Returns:
+        data, or the read-only memory map of data if it is the name of a .npy file.
+    """
+    if isinstance(data, six.string_types):
+        return np.load(data, mmap_mode='r')
+    return data
+
+
 class ArrayIterator(object):
 
     def __init__(self, data_arrays, batch_size,
                  total_iterations=None, tgt_key='label',
-                 shuffle=False):
+                 shuffle=False, shuffle_block=None, prefetch=0, num_shards=1, shard_index=0,
+                 seed=None):
         """
         During initialization, the input data will be converted to backend tensor objects
         (e.g. CPUTensor or GPUTensor). If the backend uses the GPU, the data is copied over to the
@@ -34,24 +107,46 @@ class ArrayIterator(object):
 
         Args:
             data_arrays (ndarray, shape: [# examples, feature size]): Input features of the
-                dataset.
+                dataset. Arrays can be given as the names of .npy files, and the whole
+                dataset as a directory written by save_mapped_arrays. Files are memory
+                mapped, and minibatches are read from the mapped pages.
             batch_size (int): number of examples in each minibatch
             total_iterations (int): number of minibatches to cycle through on this iterator.
                                     If not provided, it will cycle through all of the data once.
             tgt_key (str): name of the target (labels) key in data_arrays
             shuffle (bool): if true, shuffles the dataset at the beginning of every epoch.
+                            The arrays are not copied, minibatches are gathered from them
+                            through a permutation of the indices.
+            shuffle_block (int): if given, the shuffle permutes blocks of shuffle_block
+                                 consecutive examples and the examples within each block, so
+                                 that each minibatch reads from few regions of the arrays.
+            prefetch (int): number of minibatches a worker thread prepares ahead of
+                            consumption. If nonzero, minibatches are copied into a ring of
+                            prefetch + 1 reused buffers, so a minibatch is only valid until
+                            the next one is requested.
+            num_shards (int): number of data-parallel workers the dataset is split between.
+            shard_index (int): index of the worker iterating over this shard. Every epoch, each
+                               worker reads a disjoint part of the same order of the dataset.
+                               The parts have the same size, so the examples that do not fit
+                               are skipped for the epoch.
+            seed (int): seed of the shuffles, which defaults to the global numpy random state
+                        when not sharded, and to 0 when sharded. The workers must use the same
+                        seed.
         """
         # Treat singletons like list so that iteration follows same syntax
         self.batch_size = batch_size
         self.axis_names = None
         self.tgt_key = tgt_key
+        if isinstance(data_arrays, six.string_types) and os.path.isdir(data_arrays):
+            data_arrays = load_mapped_arrays(data_arrays)
         if isinstance(data_arrays, dict):
-            self.data_arrays = {k: v['data'] for k, v in data_arrays.items()}
+            self.data_arrays = {k: open_array(v['data']) for k, v in data_arrays.items()}
             self.axis_names = {k: v['axes'] for k, v in data_arrays.items()}
-        elif isinstance(data_arrays, collections.Sequence):
-            self.data_arrays = {k: x for k, x in enumerate(data_arrays)}
+        elif isinstance(data_arrays, collections.Sequence) and \
+                not isinstance(data_arrays, six.string_types):
+            self.data_arrays = {k: open_array(x) for k, x in enumerate(data_arrays)}
         else:
-            self.data_arrays = {0: data_arrays}
+            self.data_arrays = {0: open_array(data_arrays)}
 
         self.keys = list(self.data_arrays.keys())
 
@@ -61,18 +156,33 @@ class ArrayIterator(object):
         # just get an arbitrary element for len
         self.ndata = len(self.data_arrays[self.keys[0]])
 
+        self.num_shards = num_shards
+        self.epoch = 0
+        self.seed = 0 if seed is None and num_shards > 1 else seed
+        self.shard_start, shard_size = shard_bounds(self.ndata, num_shards, shard_index)
+        if num_shards > 1 and not shuffle:
+            self.data_arrays = {k: v[self.shard_start:self.shard_start + shard_size]
+                                for k, v in self.data_arrays.items()}
+        self.global_ndata = self.ndata
+        self.ndata = shard_size
+
         if self.ndata < self.batch_size:
             raise ValueError('Number of examples is smaller than the batch size')
 
         self.index = 0
         self.pos = 0
 
+        self.order = None
+        self.shuffle_block = shuffle_block
         if shuffle:
             self.shuffle_data()
         self.shuffle = shuffle
 
         self.total_iterations = self.nbatches if total_iterations is None else total_iterations
 
+        self.prefetch = prefetch
+        self.worker = None
+
     @property
     def nbatches(self):
         """
@@ -104,13 +214,29 @@ class ArrayIterator(object):
         repeated evaluations on the dataset without having to wrap around
         the last uneven minibatch. Not necessary when data is divisible by batch size
         """
+        self.stop_worker()
         self.start = 0
         self.index = 0
         self.pos = 0
 
     def shuffle_data(self):
-        p = np.random.permutation(self.ndata)
-        self.data_arrays = {k: src[p] for k, src in self.data_arrays.items()}
+        """
+        Draws the order in which the examples of the next epoch are read.
+        """
+        if self.seed is None:
+            rng = np.random
+        else:
+            rng = np.random.RandomState(self.seed + self.epoch)
+        self.epoch += 1
+        ndata = self.global_ndata
+        if self.shuffle_block is None:
+            order = rng.permutation(ndata)
+        else:
+            starts = rng.permutation(np.arange(0, ndata, self.shuffle_block))
+            order = np.concatenate(
+                [start + rng.permutation(min(self.shuffle_block, ndata - start))
+                 for start in starts])
+        self.order = order[self.shard_start:self.shard_start + self.ndata]
 
     def get_at_most(self, bsz):
         """
@@ -119,13 +245,91 @@ class ArrayIterator(object):
         """
         bsz = min(bsz, self.ndata - self.pos)
         oslice = slice(self.pos, self.pos + bsz)
-        batch_bufs = {k: src[oslice] for k, src in self.data_arrays.items()}
+        if self.order is None:
+            batch_bufs = {k: src[oslice] for k, src in self.data_arrays.items()}
+        else:
+            batch_bufs = {k: src[self.order[oslice]] for k, src in self.data_arrays.items()}
+        self.advance(bsz)
+        return bsz, batch_bufs
 
+    def advance(self, bsz):
+        """
+        Moves past bsz elements, shuffling the dataset at the end of an epoch.
+        """
         self.pos = (self.pos + bsz) % self.ndata
         if self.pos == 0 and self.shuffle:
             self.shuffle_data()
 
-        return bsz, batch_bufs
+    def fill_batch(self, batch_bufs):
+        """
+        Copies the next minibatch into the arrays of batch_bufs, wrapping around at the end
+        of the dataset.
+        """
+        total = 0
+        while total < self.batch_size:
+            bsz = min(self.batch_size - total, self.ndata - self.pos)
+            oslice = slice(self.pos, self.pos + bsz)
+            for k, src in self.data_arrays.items():
+                if self.order is None:
+                    batch_bufs[k][total:total + bsz] = src[oslice]
+                else:
+                    np.take(src, self.order[oslice], axis=0, out=batch_bufs[k][total:total + bsz])
+            total += bsz
+            self.advance(bsz)
+
+    def start_worker(self):
+        """
+        Starts a thread filling the minibatches that remain in this iteration into a ring of
+        prefetch + 1 buffers.
+        """
+        free = queue.Queue()
+        for _ in range(self.prefetch + 1):
+            free.put({k: np.empty((self.batch_size,) + src.shape[1:], dtype=src.dtype)
+                      for k, src in self.data_arrays.items()})
+        self.free = free
+        self.ready = queue.Queue()
+        self.stopping = threading.Event()
+        self.consumed = None
+
+        def fill(num_batches, free, ready, stopping):
+            try:
+                for _ in range(num_batches):
+                    batch_bufs = free.get()
+                    if stopping.is_set():
+                        return
+                    self.fill_batch(batch_bufs)
+                    ready.put(batch_bufs)
+            except Exception as e:
+                ready.put(e)
+
+        self.worker = threading.Thread(target=fill,
+                                       args=(self.total_iterations - self.index,
+                                             free, self.ready, self.stopping))
+        self.worker.daemon = True
+        self.worker.start()
+
+    def stop_worker(self):
+        """
+        Stops the prefetching thread, dropping the minibatches it prepared.
+        """
+        if self.worker is not None:
+            self.stopping.set()
+            self.free.put(None)
+            self.worker.join()
+            self.worker = None
+
+    def next_prefetched(self):
+        """
+        Returns the next minibatch filled by the worker, recycling the previous one.
+        """
+        if self.consumed is not None:
+            self.free.put(self.consumed)
+        batch_bufs = self.ready.get()
+        if isinstance(batch_bufs, Exception):
+            self.worker = None
+            raise batch_bufs
+        self.consumed = batch_bufs
+        return batch_bufs
 
     def __next__(self):
         """
@@ -136,8 +340,15 @@ class ArrayIterator(object):
         """
         if self.index >= self.total_iterations:
             raise StopIteration
+        if self.prefetch and self.worker is None:
+            self.start_worker()
         self.index += 1
 
+        if self.prefetch:
+            batch_bufs = self.next_prefetched()
+            batch_bufs['iteration'] = self.index
+            return batch_bufs
+
         total, batch_bufs = self.get_at_most(self.batch_size)
         while total < self.batch_size:
             bsz, next_batch_bufs = self.get_at_most(self.batch_size - total)
@@ -159,14 +370,16 @@ class SequentialArrayIterator(object):
     def __init__(self, data_arrays, time_steps, batch_size,
                  total_iterations=None, reverse_target=False, get_prev_target=False,
                  stride=None, include_iteration=False, tgt_key='tgt_txt',
-                 shuffle=True):
+                 shuffle=True, num_shards=1, shard_index=0):
         """
         Given an input sequence, generates overlapping windows of samples
         Input: dictionary of numpy arrays
             data_arrays[key] : Numpy array of shape (S, D).
                                 S is length of sequence
                                 D is input feature dimension
+                               or the name of a .npy file, which is memory mapped
             Assumes each data_arrays[key] has the same length (S)
+            A directory written by save_mapped_arrays can be given instead of the dictionary
         Output of each iteration: Dictionary of input and output samples
             samples[key] has size (batch_size, time_steps, D)
 
@@ -184,6 +397,9 @@ class SequentialArrayIterator(object):
         shuffle: If set to True, batches in data_arrays are shuffled.
                  If False, they are taken sequentially
         get_prev_target: returns the target of the previous iteration as well as the current one
+        num_shards: number of data-parallel workers the sequence is split between
+        shard_index: index of the worker iterating over this shard, which is a contiguous part
+                     of the sequence
 
         Example:
             data_arrays['data1'] is a numpy array with shape (S, 1): [a1, a2, ..., aS]
@@ -211,7 +427,14 @@ class SequentialArrayIterator(object):
         self.index = 0
         self.stride = time_steps if stride is None else stride
 
+        if isinstance(data_arrays, six.string_types) and os.path.isdir(data_arrays):
+            data_arrays = {k: v['data'] for k, v in viewitems(load_mapped_arrays(data_arrays))}
         if isinstance(data_arrays, dict):
+            data_arrays = {k: open_array(v) for k, v in viewitems(data_arrays)}
+            if num_shards > 1:
+                start, size = shard_bounds(len(six.next(six.itervalues(data_arrays))),
+                                           num_shards, shard_index)
+                data_arrays = {k: v[start:start + size] for k, v in viewitems(data_arrays)}
             # Get the total length of the sequence
             # Assumes each value in data_arrays has the same length
             self.ndata = len(six.next(six.itervalues(data_arrays)))
@@ -271,6 +494,25 @@ class SequentialArrayIterator(object):
         self.start = 0
         self.current_iter = 0
 
+    def fill_windows(self, out, src, seq_start, seq_step):
+        """
+        Copies the windows of a minibatch into out.
+
+        The window of sample i starts at element seq_start + i * seq_step of src, wrapping
+        around at its end. When no window wraps around, the windows are a strided view of src
+        and are copied at once, else they are gathered with a single index array.
+        """
+        seq_start %= self.ndata
+        out = out.reshape((self.batch_size, self.seq_len) + src.shape[1:])
+        if seq_start + (self.batch_size - 1) * seq_step + self.seq_len <= self.ndata:
+            src = src[seq_start:]
+            out[...] = np.lib.stride_tricks.as_strided(
+                src, shape=out.shape, strides=(seq_step * src.strides[0],) + src.strides)
+        else:
+            idcs = (seq_start + seq_step * np.arange(self.batch_size)[:, np.newaxis]
+                    + np.arange(self.seq_len)) % self.ndata
+            np.take(src, idcs, axis=0, out=out)
+
     def __iter__(self):
         """
         Returns a new minibatch of data with each call.
@@ -280,17 +522,15 @@ class SequentialArrayIterator(object):
         """
 
         while self.current_iter < self.total_iterations:
-            for batch_idx in range(self.batch_size):
-                if self.shuffle:
-                    strt_idx = self.start + (self.current_iter * self.stride)
-                    seq_start = strt_idx + (batch_idx * self.nbatches * self.seq_len)
-                else:
-                    strt_idx = self.start + (self.current_iter * self.batch_size * self.stride)
-                    seq_start = strt_idx + (batch_idx * self.stride)
+            if self.shuffle:
+                strt_idx = self.start + (self.current_iter * self.stride)
+                seq_step = self.nbatches * self.seq_len
+            else:
+                strt_idx = self.start + (self.current_iter * self.batch_size * self.stride)
+                seq_step = self.stride
 
-                idcs = np.arange(seq_start, seq_start + self.seq_len) % self.ndata
-                for key in self.data_arrays.keys():
-                    self.samples[key][batch_idx] = self.data_arrays[key][idcs]
+            for key in self.data_arrays.keys():
+                self.fill_windows(self.samples[key], self.data_arrays[key], strt_idx, seq_step)
 
             self.current_iter += 1
 
@@ -303,3 +543,143 @@ class SequentialArrayIterator(object):
             if self.include_iteration is True:
                 self.samples['iteration'] = self.index
             yield self.samples
+
+
+class BucketIterator(object):
+
+    def __init__(self, data_arrays, batch_size, bucket_lengths, seq_key='review', pad_idx=0,
+                 pad_from='left', total_iterations=None, shuffle=True, seed=None):
+        """
+        Iterates over minibatches of sequences of similar lengths.
+
+        Each sequence goes to the bucket of the shortest length that holds it, or is truncated
+        to the longest one, and is padded to the length of its bucket. Each minibatch holds
+        sequences of a single bucket, so a model with one computation per bucket length
+        computes on little padding. The length of the sequences of a minibatch selects the
+        computation.
+
+        Args:
+            data_arrays (dict): Map from key to a dict with the 'data' and its 'axes' names.
+                                The data of seq_key is a list of sequences of any length.
+            batch_size (int): number of sequences in each minibatch
+            bucket_lengths (list): lengths the sequences are padded to
+            seq_key (str): key of the sequences in data_arrays
+            pad_idx (int): the index value used for padding
+            pad_from (str): either "left" or "right"
+            total_iterations (int): number of minibatches to cycle through on this iterator.
+                                    If not provided, it will cycle through all of the data once.
+            shuffle (bool): if true, shuffles the sequences of each bucket and the order of the
+                            minibatches at the beginning of every epoch.
+            seed (int): seed of the shuffles, defaults to the global numpy random state.
+        """
+        self.batch_size = batch_size
+        self.seq_key = seq_key
+        self.shuffle = shuffle
+        self.rng = np.random if seed is None else np.random.RandomState(seed)
+        self.bucket_lengths = sorted(bucket_lengths)
+        self.axis_names = {k: v['axes'] for k, v in data_arrays.items()}
+
+        sequences = data_arrays[seq_key]['data']
+        others = {k: np.asarray(v['data']) for k, v in data_arrays.items() if k != seq_key}
+        self.ndata = len(sequences)
+        lengths = np.array([len(sequence) for sequence in sequences])
+        bucket_of = np.minimum(np.searchsorted(self.bucket_lengths, lengths),
+                               len(self.bucket_lengths) - 1)
+
+        self.buckets = []
+        for bucket, length in enumerate(self.bucket_lengths):
+            indices = np.flatnonzero(bucket_of == bucket)
+            if len(indices) == 0:
+                continue
+            padded = np.full((len(indices), length), pad_idx, dtype=np.int32)
+            for row, i in zip(padded, indices):
+                trunc = sequences[i][-length:]
+                if len(trunc) == 0:
+                    continue
+                if pad_from == 'left':
+                    row[-len(trunc):] = trunc
+                else:
+                    row[:len(trunc)] = trunc
+            arrays = {k: v[indices] for k, v in others.items()}
+            arrays[seq_key] = padded
+            self.buckets.append(arrays)
+
+        self.total_iterations = self.nbatches if total_iterations is None else total_iterations
+        self.reset()
+
+    @property
+    def nbatches(self):
+        """
+        Return the number of minibatches in an epoch.
+        """
+        return sum(-((-len(arrays[self.seq_key])) // self.batch_size)
+                   for arrays in self.buckets)
+
+    def make_placeholders(self, include_iteration=False):
+        """
+        Returns:
+            dict: Map from the length of a bucket to the placeholders of its minibatches.
+        """
+        ax.N.length = self.batch_size
+        placeholders = {}
+        for arrays in self.buckets:
+            bucket_placeholders = {}
+            for k, data in arrays.items():
+                p_axes = ng.make_axes([ax.N])
+                for sz, name in zip(data.shape[1:], self.axis_names[k][1:]):
+                    p_axes += ng.make_axis(length=sz, name=name)
+                bucket_placeholders[k] = ng.placeholder(p_axes)
+            if include_iteration:
+                bucket_placeholders['iteration'] = ng.placeholder(axes=())
+            placeholders[arrays[self.seq_key].shape[1]] = bucket_placeholders
+        return placeholders
+
+    def schedule(self):
+        """
+        Returns:
+            list: The bucket and the indices of each minibatch of an epoch. The last minibatch
+                  of a bucket wraps around to its first sequences.
+        """
+        batches = []
+        for bucket, arrays in enumerate(self.buckets):
+            n = len(arrays[self.seq_key])
+            order = self.rng.permutation(n) if self.shuffle else np.arange(n)
+            nbatches = -((-n) // self.batch_size)
+            order = np.resize(order, nbatches * self.batch_size)
+            batches.extend((bucket, indices) for indices in np.split(order, nbatches))
+        if self.shuffle:
+            batches = [batches[i] for i in self.rng.permutation(len(batches))]
+        return batches
+
+    def reset(self):
+        """
+        Resets the iteration to the beginning of a new epoch.
+        """
+        self.index = 0
+        self.pos = 0
+        self.batches = self.schedule()
+
+    def __next__(self):
+        """
+        Returns a new minibatch of data with each call.
+
+        Yields:
+            dict: The next minibatch, with the sequences padded to the length of their bucket.
+        """
+        if self.index >= self.total_iterations:
+            raise StopIteration
+        if self.pos == len(self.batches):
+            self.batches = self.schedule()
+            self.pos = 0
+        bucket, indices = self.batches[self.pos]
+        self.pos += 1
+        self.index += 1
+        batch_bufs = {k: v[indices] for k, v in self.buckets[bucket].items()}
+        batch_bufs['iteration'] = self.index
+        return batch_bufs
+
+    def next(self):
+        return self.__next__()
+
+    def __iter__(self):
+        return self
@@ -0,0 +1,283 @@
+# ******************************************************************************
+# Copyright 2017-2018 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ******************************************************************************
+from __future__ import division
+import collections
+import ctypes
+import logging
+import multiprocessing
+import pickle
+import traceback
+from multiprocessing.sharedctypes import RawArray
+
+import numpy as np
+from six.moves import queue
+
+import neon as ng
+
+logger = logging.getLogger(__name__)
+
+
+class ImageAugmentation(object):
+    """
+    Random padding, cropping and flipping of a minibatch of images, followed by mean
+    subtraction, with the images laid out as (N, C, H, W).
+
+    Arguments:
+        padding (int): Number of zero pixels added on each side of the images before cropping.
+        crop_shape (tuple): (height, width) of the crops. Defaults to the size of the images
+                            before padding.
+        random_crop (bool): Crop at random positions, otherwise at the center.
+        flip (bool): Flip half of the images horizontally, at random.
+        mean (float or list): Value subtracted from the crops, or one value per channel.
+    """
+
+    def __init__(self, padding=0, crop_shape=None, random_crop=True, flip=False, mean=None):
+        self.padding = padding
+        self.crop_shape = crop_shape
+        self.random_crop = random_crop
+        self.flip = flip
+        self.mean = None if mean is None else np.asarray(mean, dtype=np.float32).reshape(-1, 1, 1)
+
+    def output_shape(self, shape):
+        """
+        Returns:
+            The shape of the augmented minibatch of images of the given shape.
+        """
+        if self.crop_shape is None:
+            return tuple(shape)
+        return tuple(shape[:2]) + tuple(self.crop_shape)
+
+    def __call__(self, images, out, rng):
+        """
+        Writes the augmented images into out.
+
+        Arguments:
+            images (ndarray): Minibatch of images.
+            out (ndarray): Minibatch of augmented images, with output_shape(images.shape).
+            rng (RandomState): Source of the crop positions and flips.
+        """
+        if self.padding:
+            pad = self.padding
+            images = np.pad(images, ((0, 0), (0, 0), (pad, pad), (pad, pad)), mode='constant')
+        n = images.shape[0]
+        height, width = out.shape[2:]
+        max_y = images.shape[2] - height
+        max_x = images.shape[3] - width
+        if self.random_crop:
+            ys = rng.randint(0, max_y + 1, size=n)
+            xs = rng.randint(0, max_x + 1, size=n)
+        else:
+            ys = np.full(n, max_y // 2, dtype=int)
+            xs = np.full(n, max_x // 2, dtype=int)
+        flips = rng.rand(n) < 0.5 if self.flip else np.zeros(n, dtype=bool)
+
+        for i in range(n):
+            crop = images[i, :, ys[i]:ys[i] + height, xs[i]:xs[i] + width]
+            out[i] = crop[..., ::-1] if flips[i] else crop
+        if self.mean is not None:
+            out -= self.mean
+
+
+def shared_array(shape, dtype):
+    """
+    Returns:
+        A RawArray large enough for an array of the given shape and dtype.
+    """
+    return RawArray(ctypes.c_char, int(np.prod(shape)) * np.dtype(dtype).itemsize)
+
+
+def augmentation_worker(augment, tasks, results, inputs, outputs, in_shape, in_dtype,
+                        out_shape, out_dtype):
+    """
+    Augments the minibatches in the slots named by tasks until it receives None.
+
+    Puts (slot, None, None) on results for each augmented slot, or (slot, exception,
+    traceback) when the augmentation raises.
+    """
+    inputs = [np.frombuffer(x, dtype=in_dtype).reshape(in_shape) for x in inputs]
+    outputs = [np.frombuffer(x, dtype=out_dtype).reshape(out_shape) for x in outputs]
+    for slot, seed in iter(tasks.get, None):
+        try:
+            augment(inputs[slot], outputs[slot], np.random.RandomState(seed))
+        except Exception as error:
+            trace = traceback.format_exc()
+            try:
+                pickle.dumps(error)
+            except Exception:
+                # the queue could not send it, and the iterator would wait forever
+                error = RuntimeError(repr(error))
+            results.put((slot, error, trace))
+        else:
+            results.put((slot, None, None))
+
+
+class AugmentedIterator(object):
+    """
+    Augments the minibatches of an iterator in a pool of worker processes.
+
+    Each minibatch read from the iterator is copied into one of a ring of shared memory slots,
+    and a worker writes its augmentation into the shared output buffer of the slot. Minibatches
+    are returned in the order of the iterator. A returned minibatch is only valid until the next
+    one is requested.
+
+    Arguments:
+        iterator: Iterator of minibatch dicts, such as an ArrayIterator.
+        augment (ImageAugmentation): The augmentation.
+        key (str): Key of the images in the minibatches.
+        num_workers (int): Number of worker processes. Defaults to the number of cores.
+        depth (int): Number of minibatches in flight. Defaults to twice num_workers.
+        dtype (dtype): Type of the augmented images.
+        seed (int): Seed of the random augmentations. The augmentation of a minibatch only
+                    depends on the seed and the position of the minibatch since the last reset.
+        poll_interval (float): Seconds between checks that the workers are still alive while
+                               waiting for a minibatch.
+
+    An exception raised by the augmentation in a worker is raised again when its minibatch is
+    requested. A worker that exits raises a RuntimeError instead of blocking the iteration.
+    """
+
+    def __init__(self, iterator, augment, key='image', num_workers=None, depth=None,
+                 dtype=np.float32, seed=0, poll_interval=1.0):
+        self.iterator = iterator
+        self.augment = augment
+        self.key = key
+        self.num_workers = multiprocessing.cpu_count() if num_workers is None else num_workers
+        self.depth = 2 * self.num_workers if depth is None else depth
+        self.seed = seed
+        self.poll_interval = poll_interval
+        self.ndata = getattr(iterator, 'ndata', None)
+
+        first = next(self.iterator)
+        self.iterator.reset()
+        self.in_shape = first[key].shape
+        self.in_dtype = first[key].dtype
+        self.out_shape = augment.output_shape(self.in_shape)
+        self.out_dtype = np.dtype(dtype)
+
+        shared_inputs = [shared_array(self.in_shape, self.in_dtype) for _ in range(self.depth)]
+        shared_outputs = [shared_array(self.out_shape, self.out_dtype)
+                          for _ in range(self.depth)]
+        self.inputs = [np.frombuffer(x, dtype=self.in_dtype).reshape(self.in_shape)
+                       for x in shared_inputs]
+        self.outputs = [np.frombuffer(x, dtype=self.out_dtype).reshape(self.out_shape)
+                        for x in shared_outputs]
+
+        self.tasks = multiprocessing.Queue()
+        self.results = multiprocessing.Queue()
+        self.workers = []
+        for _ in range(self.num_workers):
+            worker = multiprocessing.Process(
+                target=augmentation_worker,
+                args=(augment, self.tasks, self.results, shared_inputs, shared_outputs,
+                      self.in_shape, self.in_dtype, self.out_shape, self.out_dtype))
+            worker.daemon = True
+            worker.start()
+            self.workers.append(worker)
+        self.start()
+
+    def start(self):
+        self.batch_index = 0
+        self.pending = collections.deque()
+        self.others = [None] * self.depth
+        self.done = set()
+        self.consumed = None
+        self.exhausted = False
+        for slot in range(self.depth):
+            self.submit(slot)
+
+    def submit(self, slot):
+        """
+        Reads the next minibatch of the iterator into slot and hands it to the workers.
+        """
+        if self.exhausted:
+            return
+        try:
+            batch = next(self.iterator)
+        except StopIteration:
+            self.exhausted = True
+            return
+        self.inputs[slot][...] = batch[self.key]
+        # the iterator may reuse its buffers
+        self.others[slot] = {k: np.array(v) if isinstance(v, np.ndarray) else v
+                             for k, v in batch.items() if k != self.key}
+        self.tasks.put((slot, self.seed + self.batch_index))
+        self.batch_index += 1
+        self.pending.append(slot)
+
+    def __next__(self):
+        if self.consumed is not None:
+            self.submit(self.consumed)
+            self.consumed = None
+        if not self.pending:
+            raise StopIteration
+        slot = self.pending.popleft()
+        self.wait(slot)
+        self.done.remove(slot)
+        self.consumed = slot
+        batch = dict(self.others[slot])
+        batch[self.key] = self.outputs[slot]
+        return batch
+
+    def wait(self, slot):
+        """
+        Waits until the workers have augmented slot.
+        """
+        while slot not in self.done:
+            try:
+                done, error, trace = self.results.get(timeout=self.poll_interval)
+            except queue.Empty:
+                for worker in self.workers:
+                    if not worker.is_alive():
+                        raise RuntimeError("Augmentation worker exited with code {}".format(
+                            worker.exitcode))
+                continue
+            self.done.add(done)
+            if error is not None:
+                logger.error("Augmentation worker failed:\n%s", trace)
+                raise error
+
+    def next(self):
+        return self.__next__()
+
+    def __iter__(self):
+        return self
+
+    def reset(self):
+        """
+        Waits for the minibatches in flight, and restarts the iteration.
+        """
+        while self.pending:
+            self.wait(self.pending.popleft())
+        self.iterator.reset()
+        self.start()
+
+    def make_placeholders(self, *args, **kwargs):
+        placeholders = self.iterator.make_placeholders(*args, **kwargs)
+        axes = placeholders[self.key].axes
+        placeholders[self.key] = ng.placeholder(
+            [axes[0]] + [ng.make_axis(length=length, name=axis.name)
+                         for axis, length in zip(axes[1:], self.out_shape[1:])])
+        return placeholders
+
+    def close(self):
+        """
+        Stops the worker processes.
+        """
+        for _ in self.workers:
+            self.tasks.put(None)
+        for worker in self.workers:
+            worker.join()
+        self.workers = []
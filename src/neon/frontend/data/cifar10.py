@@ -15,7 +15,7 @@
 # ******************************************************************************
 import numpy as np
 import os
-from neon.util.persist import pickle_load, valid_path_append, fetch_file
+from neon.util.persist import load_data_cache, pickle_load, valid_path_append, fetch_file
 import tarfile
 
 
@@ -50,6 +50,17 @@ class CIFAR10(object):
         if not os.path.exists(filepath):
             fetch_file(self.url, self.filename, filepath, self.size)
 
+        self.train_set, self.valid_set = load_data_cache(
+            'cifar10', [filepath], lambda: self.read_batches(workdir, filepath))
+        return self.train_set, self.valid_set
+
+    def read_batches(self, workdir, filepath):
+        """
+        Extracts the batches of the dataset and reads them.
+
+        Returns:
+            tuple: Both training and test sets are returned.
+        """
         batchdir = os.path.join(workdir, 'cifar-10-batches-py')
         if not os.path.exists(os.path.join(batchdir, 'data_batch_1')):
             assert os.path.exists(filepath), "Must have cifar-10-python.tar.gz"
@@ -72,13 +83,13 @@ class CIFAR10(object):
             X_test, y_test = d['data'], d['labels']
             X_test = X_test.reshape(-1, 3, 32, 32)
 
-        self.train_set = {'image': {'data': X_train,
-                                    'axes': ('N', 'C', 'H', 'W')},
-                          'label': {'data': y_train,
-                                    'axes': ('N',)}}
-        self.valid_set = {'image': {'data': X_test,
-                                    'axes': ('N', 'C', 'H', 'W')},
-                          'label': {'data': np.array(y_test),
-                                    'axes': ('N',)}}
+        train_set = {'image': {'data': X_train,
+                               'axes': ('N', 'C', 'H', 'W')},
+                     'label': {'data': y_train,
+                               'axes': ('N',)}}
+        valid_set = {'image': {'data': X_test,
+                               'axes': ('N', 'C', 'H', 'W')},
+                     'label': {'data': np.array(y_test),
+                               'axes': ('N',)}}
 
-        return self.train_set, self.valid_set
+        return train_set, valid_set
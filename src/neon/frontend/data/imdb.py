@@ -14,6 +14,7 @@
 # limitations under the License.
 # ******************************************************************************
 from neon.util.persist import valid_path_append, fetch_file, pickle_load
+import itertools
 import os
 import numpy as np
 
@@ -31,20 +32,25 @@ def preprocess_text(X, vocab_size, oov=2, start=1, index_from=3):
         start (int): the index used as the start of a sentence, typically 1
         index_from (int): the index offset, typically 3, given having 0 (padding),
                           1 (start), 2 (OOV).
+
+    Returns:
+        List of int32 arrays, one per sentence.
     """
+    lengths = np.array([len(x) for x in X], dtype=np.int64)
+    words = np.fromiter(itertools.chain.from_iterable(X), dtype=np.int64,
+                        count=int(lengths.sum())) + index_from
 
     if start is not None:
-        X = [[start] + [w + index_from for w in x] for x in X]
-    else:
-        X = [[w + index_from for w in x] for x in X]
+        words = np.insert(words, np.cumsum(lengths) - lengths, start)
+        lengths += 1
 
     if vocab_size is None:
-        vocab_size = max([max(x) for x in X])
+        vocab_size = words.max()
 
     if oov is not None:
-        X = [[oov if w >= vocab_size else w for w in x] for x in X]
+        words[words >= vocab_size] = oov
 
-    return X
+    return np.split(words.astype(np.int32), np.cumsum(lengths)[:-1])
 
 
 def pad_sentences(sentences, pad_idx, pad_to_len=None, pad_from='left'):
@@ -98,7 +104,13 @@ class IMDB(object):
         self.shuffle = shuffle
         self.pad_idx = pad_idx
 
-    def load_data(self, test_split=0.2):
+    def load_data(self, test_split=0.2, pad=True):
+        """
+        Arguments:
+            test_split (float): fraction of the reviews in the validation set
+            pad (bool): pad the reviews to sentence_length. Otherwise the reviews are left at
+                        their length, for a BucketIterator.
+        """
         self.data_dict = {}
         self.vocab = None
         workdir, filepath = valid_path_append(self.path, '', self.filename)
@@ -109,8 +121,14 @@ class IMDB(object):
             X, y = pickle_load(f)
 
         X = preprocess_text(X, self.vocab_size)
-        X = pad_sentences(
-            X, pad_idx=self.pad_idx, pad_to_len=self.sentence_length, pad_from='left')
+        if pad:
+            X = pad_sentences(
+                X, pad_idx=self.pad_idx, pad_to_len=self.sentence_length, pad_from='left')
+        else:
+            reviews = np.empty(len(X), dtype=object)
+            for i, x in enumerate(X):
+                reviews[i] = x
+            X = reviews
 
         if self.shuffle:
             indices = np.arange(len(y))
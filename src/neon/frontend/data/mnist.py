@@ -14,7 +14,8 @@
 # limitations under the License.
 # ******************************************************************************
 import gzip
-from neon.util.persist import ensure_dirs_exist, pickle_load, valid_path_append, fetch_file
+from neon.util.persist import ensure_dirs_exist, load_data_cache, pickle_load, \
+    valid_path_append, fetch_file
 import os
 from tqdm import tqdm
 import numpy as np
@@ -48,20 +49,28 @@ class MNIST(object):
         if not os.path.exists(filepath):
             fetch_file(self.url, self.filename, filepath, self.size)
 
-        with gzip.open(filepath, 'rb') as f:
-            self.train_set, self.valid_set = pickle_load(f)
-
-        self.train_set = {'image': {'data': self.train_set[0].reshape(60000, 28, 28),
-                                    'axes': ('N', 'H', 'W')},
-                          'label': {'data': self.train_set[1],
-                                    'axes': ('N',)}}
-        self.valid_set = {'image': {'data': self.valid_set[0].reshape(10000, 28, 28),
-                                    'axes': ('N', 'H', 'W')},
-                          'label': {'data': self.valid_set[1],
-                                    'axes': ('N',)}}
-
+        self.train_set, self.valid_set = load_data_cache(
+            'mnist', [filepath], lambda: self.read_sets(filepath))
         return self.train_set, self.valid_set
 
+    def read_sets(self, filepath):
+        """
+        Unpickles the training and test sets.
+        """
+        with gzip.open(filepath, 'rb') as f:
+            train_set, valid_set = pickle_load(f)
+
+        train_set = {'image': {'data': train_set[0].reshape(60000, 28, 28),
+                               'axes': ('N', 'H', 'W')},
+                     'label': {'data': train_set[1],
+                               'axes': ('N',)}}
+        valid_set = {'image': {'data': valid_set[0].reshape(10000, 28, 28),
+                               'axes': ('N', 'H', 'W')},
+                     'label': {'data': valid_set[1],
+                               'axes': ('N',)}}
+
+        return train_set, valid_set
+
 
 def ingest_mnist(root_dir, overwrite=False):
     '''
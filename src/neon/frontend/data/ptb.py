@@ -13,7 +13,8 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 # ******************************************************************************
-from neon.util.persist import valid_path_append, fetch_file
+from neon.util.persist import load_data_cache, valid_path_append, fetch_file
+from neon.frontend.data.text import lookup, make_vocab
 import os
 import numpy as np
 
@@ -40,32 +41,51 @@ class PTB(object):
         self.use_words = use_words
 
     def load_data(self):
-        self.data_dict = {}
-        self.vocab = None
+        filepaths = {}
         for phase in ['train', 'test', 'valid']:
             filename, filesize = self.filemap[phase]['filename'], self.filemap[phase]['size']
             workdir, filepath = valid_path_append(self.path, '', filename)
             if not os.path.exists(filepath):
                 fetch_file(self.url, filename, filepath, filesize)
+            filepaths[phase] = filepath
 
-            tokens = open(filepath).read()  # add tokenization here if necessary
+        dataset = load_data_cache('ptb', [filepaths[phase] for phase in sorted(filepaths)],
+                                  lambda: self.tokenize(filepaths),
+                                  use_words=self.use_words, shift_target=self.shift_target)
+        self.vocab = dataset['vocab']
+        self.data_dict = dataset['data']
 
-            if self.use_words:
-                tokens = tokens.strip().split()
+        # vocab dicts
+        self.token_to_index = dict((t, i) for i, t in enumerate(self.vocab))
+        self.index_to_token = dict((i, t) for i, t in enumerate(self.vocab))
+
+        return self.data_dict
+
+    def tokenize(self, filepaths):
+        """
+        Maps the tokens of each phase to their indices in the vocabulary of the training set.
 
-            self.vocab = sorted(set(tokens)) if self.vocab is None else self.vocab
+        Returns:
+            dict: The vocabulary and the inputs and targets of each phase.
+        """
+        data_dict = {}
+        vocab = None
+        for phase in ['train', 'test', 'valid']:
+            tokens = open(filepaths[phase]).read()  # add tokenization here if necessary
 
-            # vocab dicts
-            self.token_to_index = dict((t, i) for i, t in enumerate(self.vocab))
-            self.index_to_token = dict((i, t) for i, t in enumerate(self.vocab))
+            if self.use_words:
+                tokens = tokens.strip().split()
 
             # map tokens to indices
-            X = np.asarray([self.token_to_index[t] for t in tokens], dtype=np.uint32)
+            if vocab is None:
+                vocab, X = make_vocab(tokens)
+            else:
+                X = lookup(tokens, vocab)
             if self.shift_target:
                 y = np.concatenate((X[1:], X[:1]))
             else:
                 y = X.copy()
 
-            self.data_dict[phase] = {'inp_txt': X, 'tgt_txt': y}
+            data_dict[phase] = {'inp_txt': X, 'tgt_txt': y}
 
-        return self.data_dict
+        return {'vocab': vocab, 'data': data_dict}
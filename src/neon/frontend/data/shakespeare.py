@@ -13,9 +13,9 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 # ******************************************************************************
-from neon.util.persist import valid_path_append, fetch_file
+from neon.util.persist import load_data_cache, valid_path_append, fetch_file
+from neon.frontend.data.text import lookup, make_vocab
 import os
-import numpy as np
 
 
 class Shakespeare(object):
@@ -42,12 +42,27 @@ class Shakespeare(object):
             self.filename = filename
 
         self.train_split = train_split
+        workdir, filepath = valid_path_append(self.path, '', self.filename)
+        if not os.path.exists(filepath):
+            fetch_file(self.url, self.filename, filepath)
+
+        dataset = load_data_cache('shakespeare', [filepath], self.digitize_splits,
+                                  train_split=train_split)
+        self.build_dicts(dataset['vocab'])
+        self.train, self.test = dataset['train'], dataset['test']
+
+    def digitize_splits(self):
+        """
+        Returns:
+            dict: The vocabulary and the digitized train and test sets.
+        """
         # Load the text and split to train and test
-        self.train, self.test = self.load_data()
+        train, test = self.load_data()
         # Digitize the train set (convert letters to integers).
-        self.train = self.digitize(text=self.train)
+        train = self.digitize(text=train)
         # Digitize the test set using train set vocab (convert letters to integers)
-        self.test = self.digitize(text=self.test)
+        test = self.digitize(text=test)
+        return {'vocab': self.vocab, 'train': train, 'test': test}
 
     def load_data(self):
         self.data_dict = {}
@@ -66,7 +81,14 @@ class Shakespeare(object):
         """
         Build a vocabulary from given text and store as the object's vocab
         """
-        self.vocab = sorted(set(text))
+        vocab, _ = make_vocab(text)
+        self.build_dicts(vocab)
+
+    def build_dicts(self, vocab):
+        """
+        Stores vocab and the dicts between its tokens and their indices
+        """
+        self.vocab = vocab
 
         # vocab dicts
         self.token_to_index = dict((t, i + 1) for i, t in enumerate(self.vocab))
@@ -86,6 +108,4 @@ class Shakespeare(object):
 
         # map tokens to indices
         # if the token is not in the vocabulary, put a zero (unknown)
-        text_dig = np.asarray([self.token_to_index[t] if t in self.vocab else 0 for t in text],
-                              dtype=np.uint32)
-        return text_dig
+        return lookup(text, self.vocab, offset=1, unknown=0)
@@ -0,0 +1,100 @@
+# ******************************************************************************
+# Copyright 2017-2018 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ******************************************************************************
+"""
+Array-based tokenization for the text datasets.
+"""
+import numpy as np
+import six
+
+
+def code_points(text):
+    """
+    Returns:
+        The array of the code points of the characters of text.
+    """
+    return np.frombuffer(six.text_type(text).encode('utf-32-le'), dtype=np.uint32)
+
+
+def chars(values):
+    """
+    Returns:
+        The list of the characters of the code points values.
+    """
+    return [six.unichr(value) for value in values]
+
+
+def make_vocab(tokens):
+    """
+    Builds the sorted vocabulary of tokens and maps them to their indices in it.
+
+    The characters of a string are counted in a table indexed by their code points. Words are
+    hashed, which is faster than sorting an array of them.
+
+    Arguments:
+        tokens: A string, whose characters are the tokens, or a list of words.
+
+    Returns:
+        The list of distinct tokens, sorted, and the array of the index of each token.
+    """
+    if isinstance(tokens, six.string_types):
+        values = code_points(tokens)
+        present = np.zeros(int(values.max()) + 1 if len(values) else 0, dtype=bool)
+        present[values] = True
+        vocab = chars(np.flatnonzero(present))
+        return vocab, lookup(tokens, vocab)
+    vocab = sorted(set(tokens))
+    token_to_index = dict((t, i) for i, t in enumerate(vocab))
+    return vocab, np.fromiter((token_to_index[t] for t in tokens), dtype=np.uint32,
+                              count=len(tokens))
+
+
+def lookup(tokens, vocab, offset=0, unknown=None):
+    """
+    Maps tokens to their index in a sorted vocabulary.
+
+    Characters are mapped with a lookup table indexed by their code points, and words with a
+    dict.
+
+    Arguments:
+        tokens: A string, whose characters are the tokens, or a list of words.
+        vocab (list): Sorted distinct tokens.
+        offset (int): Added to the indices.
+        unknown (int): The index of the tokens that are not in vocab. If None, they raise
+                       a KeyError.
+
+    Returns:
+        The array of the indices.
+    """
+    if not isinstance(tokens, six.string_types):
+        token_to_index = dict((t, i + offset) for i, t in enumerate(vocab))
+        if unknown is None:
+            return np.fromiter((token_to_index[t] for t in tokens), dtype=np.uint32,
+                               count=len(tokens))
+        return np.fromiter((token_to_index.get(t, unknown) for t in tokens), dtype=np.uint32,
+                           count=len(tokens))
+
+    values = code_points(tokens)
+    vocab_values = code_points(''.join(vocab))
+    size = int(max(values.max() if len(values) else 0, vocab_values.max()) + 1)
+    table = np.full(size, -1, dtype=np.int64)
+    table[vocab_values] = np.arange(offset, offset + len(vocab_values))
+    indices = table[values]
+    missing = indices < 0
+    if missing.any():
+        if unknown is None:
+            raise KeyError(six.unichr(values[missing][0]))
+        indices[missing] = unknown
+    return indices.astype(np.uint32)
@@ -20,7 +20,7 @@ import requests
 import zipfile
 import os
 import re
-from neon.util.persist import valid_path_append
+from neon.util.persist import load_data_cache, valid_path_append
 
 GOOGLE_DRIVE_IDS = {
     'tsp5_train.zip': '0B2fg8yPGn2TCSW1pNTJMXzFPYTg',
@@ -55,24 +55,31 @@ class TSP(object):
                     with zipfile.ZipFile(destination, 'r') as z:
                         z.extractall('./')
 
-            cities = int(re.search(r'\d+', filename).group())
-            print('Loading and preprocessing tsp{} {} data...'.format(cities, phase))
-            with open(filepath, 'r') as f:
-                X, y, y_teacher = [], [], []
-                for i, line in tqdm(enumerate(f)):
-                    inputs, outputs = line.split('output')
-                    X.append(np.array([float(j) for j in inputs.split()]).reshape([-1, 2]))
-                    y.append(np.array([int(j) - 1 for j in outputs.split()])[:-1])  # delete last
-                    # teacher forcing array as decoder's input while training
-                    y_teacher.append([X[i][j - 1] for j in y[i]])
-
-            X = np.array(X)
-            y = np.array(y)
-            y_teacher = np.array(y_teacher)
-            self.data_dict[phase] = {'inp_txt': X, 'tgt_txt': y, 'teacher_tgt': y_teacher}
+            self.data_dict[phase] = load_data_cache(
+                'tsp', [filepath], lambda: self.read_file(filepath, phase))
 
         return self.data_dict
 
+    def read_file(self, filepath, phase):
+        """
+        Parses the inputs, targets and teacher forcing targets of the file.
+        """
+        cities = int(re.search(r'\d+', os.path.basename(filepath)).group())
+        print('Loading and preprocessing tsp{} {} data...'.format(cities, phase))
+        with open(filepath, 'r') as f:
+            X, y, y_teacher = [], [], []
+            for i, line in tqdm(enumerate(f)):
+                inputs, outputs = line.split('output')
+                X.append(np.array([float(j) for j in inputs.split()]).reshape([-1, 2]))
+                y.append(np.array([int(j) - 1 for j in outputs.split()])[:-1])  # delete last
+                # teacher forcing array as decoder's input while training
+                y_teacher.append([X[i][j - 1] for j in y[i]])
+
+        X = np.array(X)
+        y = np.array(y)
+        y_teacher = np.array(y_teacher)
+        return {'inp_txt': X, 'tgt_txt': y, 'teacher_tgt': y_teacher}
+
     def download_file_from_google_drive(self, id, destination):
         """
         code based on
@@ -200,7 +200,13 @@ class Linear(Layer):
         self.W = None
 
     @SubGraph.scope_op_creation
-    def __call__(self, in_obj, reuse=True, **kwargs):
+    def __call__(self, in_obj, reuse=True, weight_scale=None, **kwargs):
+        """
+        Arguments:
+            in_obj (Op): Input op
+            weight_scale (TensorOp, optional): Scale of each output feature, multiplied into
+                the weights.
+        """
 
         if not self.initialized:
             if self.keep_axes is not None:
@@ -219,7 +225,10 @@ class Linear(Layer):
         # allowed.  To get around this, we rename the output feature axes to
         # something unique that we can undo after the dot.  This map_roles is
         # undoing this temporary axes name change.
-        return ng.map_roles(ng.dot(self.W, in_obj), self.axes_map)
+        W = self.W
+        if weight_scale is not None:
+            W = W * ng.cast_axes(weight_scale, ng.make_axes(self.axes_map.keys()))
+        return ng.map_roles(ng.dot(W, in_obj), self.axes_map)
 
 
 class LookupTable(Layer):
@@ -440,10 +449,12 @@ class ConvBase(Layer):
 
         return padding_int, manual_pad
 
-    def _conv_op(self, in_obj, channel_axes, spatial_axes):
+    def _conv_op(self, in_obj, channel_axes, spatial_axes, filters=None, bias=None):
         """
         Setup for the call to ng.convolution.
         """
+        if filters is None:
+            filters = self.W
         manual_pad = collections.OrderedDict([(ax.name, (0, 0)) for ax in in_obj.axes])
         pad_int, extra_pad = self._get_pad_int(spatial_axes)
         manual_pad.update(extra_pad)
@@ -455,14 +466,18 @@ class ConvBase(Layer):
                                            self.strides, pad_int, self.dilation)
         return ng.convolution(convparams,
                               in_obj,
-                              self.W,
-                              axes=output_axes)
+                              filters,
+                              axes=output_axes,
+                              bias=bias)
 
     @SubGraph.scope_op_creation
-    def __call__(self, in_obj, **kwargs):
+    def __call__(self, in_obj, filter_scale=None, bias=None, **kwargs):
         """
         Arguments:
             in_obj (Op): Input op
+            filter_scale (TensorOp, optional): Scale of each output channel, multiplied into the
+                filters.
+            bias (TensorOp, optional): Bias of each output channel, added by the convolution.
         """
         channel_axes = in_obj.axes.get_by_names("C")
         spatial_axes = in_obj.axes.get_by_names(*self.spatial_keys)
@@ -495,7 +510,11 @@ class ConvBase(Layer):
                     new_filter_axes=filter_axes,
                 ))
 
-        output = ng.map_roles(self._conv_op(in_obj, channel_axes, spatial_axes), axes_map)
+        filters = self.W
+        if filter_scale is not None:
+            filters = filters * ng.cast_axes(filter_scale, ng.make_axes(list(axes_map.keys())))
+        output = ng.map_roles(self._conv_op(in_obj, channel_axes, spatial_axes,
+                                            filters=filters, bias=bias), axes_map)
         return output
 
 
@@ -956,6 +975,10 @@ class Affine(Layer):
 
     @SubGraph.scope_op_creation
     def __call__(self, in_obj, **kwargs):
+        if self.batch_norm_layer is not None and self.batch_norm_layer.can_fold:
+            scale, shift = self.batch_norm_layer.folded_scale_shift()
+            return self.activation_layer(self.linear(in_obj, weight_scale=scale) + shift)
+
         l_out = self.linear(in_obj)
         # TODO: This is a bit convoluted. Need to clean it up.
         b_out = self.bias(l_out) if not self.batch_norm else l_out
@@ -1070,6 +1093,11 @@ class Convolution(SubGraph):
         Arguments:
             in_obj (Op): Input op
         """
+        if self.batch_norm is not None and self.batch_norm.can_fold:
+            scale, shift = self.batch_norm.folded_scale_shift()
+            l_out = self.conv(in_obj, filter_scale=scale, bias=shift, **kwargs)
+            return self.activation(l_out, **kwargs)
+
         l_out = self.conv(in_obj, **kwargs)
         if self.batch_norm is not None:
             l_out = self.batch_norm(l_out, **kwargs)
@@ -1185,6 +1213,7 @@ class Deconvolution(Convolution):
 
         return ng.tensor_slice(output, slices)
 
+    @SubGraph.scope_op_creation
     def __call__(self, in_obj, channel_axes="C", spatial_axes=("D", "H", "W"), **kwargs):
         """
         Compute a deconvolution over in_obj
@@ -1195,8 +1224,18 @@ class Deconvolution(Convolution):
             spatial_axes (tuple): names of expected depth, height and width axis types - defaults
                                   to "D", "H", and "W"
         """
-        output = super(Deconvolution, self).__call__(in_obj, channel_axes, spatial_axes, **kwargs)
-        return self._slice_output(output, spatial_axes, **kwargs)
+        l_out = self.conv(in_obj, **kwargs)
+        if self.batch_norm is not None:
+            # batch norm statistics cover the whole output, so it is trimmed last
+            l_out = self.activation(self.batch_norm(l_out, **kwargs), **kwargs)
+            return self._slice_output(l_out, spatial_axes, **kwargs)
+
+        # bias and activation are elementwise, so the output is trimmed first and they are
+        # only computed where it is kept
+        l_out = self._slice_output(l_out, spatial_axes, **kwargs)
+        if self.bias is not None:
+            l_out = self.bias(l_out, **kwargs)
+        return self.activation(l_out, **kwargs)
 
 
 class BatchNorm(Layer):
@@ -1274,6 +1313,25 @@ class BatchNorm(Layer):
                 bnoutput
             ])
 
+    @property
+    def can_fold(self):
+        """
+        True in inference mode once the global statistics exist. The preceding convolution or
+        linear layer can then apply batch norm through its weights and bias.
+        """
+        return Layer.inference_mode and self.initialized
+
+    @SubGraph.scope_op_creation
+    def folded_scale_shift(self):
+        """
+        Returns the scale and shift of the inference transform, which computes
+        x * scale + shift from the global statistics. Both have the axes of gamma and beta, so
+        they are per channel or per feature, and multiplying scale into the weights of the
+        preceding layer removes the elementwise passes over its output.
+        """
+        scale = self.gamma * ng.reciprocal(ng.sqrt(self.gvar + self.eps))
+        return scale, self.beta - self.gmean * scale
+
     @SubGraph.scope_op_creation
     def set_tuning_iteration(self, batch_index):
         """
@@ -1316,10 +1374,9 @@ class Dropout(Layer):
         if Layer.inference_mode:
             return self.keep * in_obj
         else:
-            if self.mask is None:
-                in_axes = in_obj.axes.sample_axes()
-                self.mask = ng.persistent_tensor(axes=in_axes).named('mask')
-            self.mask = ng.uniform(self.mask, low=0.0, high=1.0) <= self.keep
+            # the transformer generates the mask for each call, without a persistent tensor
+            in_axes = in_obj.axes.sample_axes()
+            self.mask = ng.uniform(in_axes, low=0.0, high=1.0) <= self.keep
             return self.mask * in_obj
 
 
@@ -1357,6 +1414,8 @@ class Recurrent(Layer):
                             set to False to be stateful.
         return_sequence (bool): default to be True to return the whole sequence output.
         backward (bool): default to be False to process the sequence left to right
+        use_scan (bool): default to be False to build the graph of every step. If True,
+                         the graph of a step is built once, in a scan loop.
         name (str, optional): name to refer to this layer as.
 
     Attributes:
@@ -1368,7 +1427,8 @@ class Recurrent(Layer):
     """
 
     def __init__(self, nout, init, init_inner=None, activation=None, batch_norm=False,
-                 reset_cells=True, return_sequence=True, backward=False, **kwargs):
+                 reset_cells=True, return_sequence=True, backward=False, use_scan=False,
+                 **kwargs):
         super(Recurrent, self).__init__(**kwargs)
 
         self.nout = nout
@@ -1378,6 +1438,7 @@ class Recurrent(Layer):
         self.reset_cells = reset_cells
         self.return_sequence = return_sequence
         self.backward = backward
+        self.use_scan = use_scan
         self.batch_norm = BatchNorm() if batch_norm is True else None
         self.w_in_axes = None
 
@@ -1476,27 +1537,39 @@ class Recurrent(Layer):
         if self.batch_norm is not None:
             h_ff = self.batch_norm(h_ff)
 
-        # slice the weighted inputs into time slices
-        in_s = get_steps(h_ff, self.recurrent_axis, self.backward)
+        if self.use_scan:
+            def step(inputs, states):
+                h = self._step(inputs[0], states[0])
+                return [h], [h]
 
-        # unrolling computations
-        for i in range(self.recurrent_axis.length):
-            with ng.metadata(recurrent_step=str(i)):
-                h = self._step(in_s[i], h)
-                h_list.append(h)
+            (h_stack,), (h_last,) = ng.scan(step, [h_ff], [h], self.recurrent_axis,
+                                            reverse=self.backward,
+                                            pos=self.recurrent_axis_idx)
+        else:
+            # slice the weighted inputs into time slices
+            in_s = get_steps(h_ff, self.recurrent_axis, self.backward)
+
+            # unrolling computations
+            for i in range(self.recurrent_axis.length):
+                with ng.metadata(recurrent_step=str(i)):
+                    h = self._step(in_s[i], h)
+                    h_list.append(h)
+            h_last = h_list[-1]
+            if self.return_sequence is True:
+                # only when returning a sequence, need to reverse the output
+                h_list = h_list[::-1] if self.backward else h_list
+                h_stack = ng.stack(h_list, self.recurrent_axis, pos=self.recurrent_axis_idx)
 
         if self.return_sequence is True:
-            # only when returning a sequence, need to reverse the output
-            h_list = h_list[::-1] if self.backward else h_list
-            rnn_out = ng.stack(h_list, self.recurrent_axis, pos=self.recurrent_axis_idx)
+            rnn_out = h_stack
         else:
-            rnn_out = h_list[-1]
+            rnn_out = h_last
 
         if self.reset_cells is True:
             return rnn_out
         else:
             return ng.sequential([
-                ng.assign(self.h_init, h_list[-1]),
+                ng.assign(self.h_init, h_last),
                 rnn_out
             ])
 
@@ -1624,6 +1697,11 @@ class LSTM(Recurrent):
                             set to False to be stateful.
         return_sequence (bool): default to be True to return the whole sequence output.
         backward (bool): default to be False to process the sequence left to right
+        fuse_gates (bool): default to be True to compute all the gates with a single dot
+                           of the concatenated gate weights, for the input projection and
+                           at each step, instead of one dot per gate.
+        use_scan (bool): default to be False to build the graph of every step. If True,
+                         the graph of a step is built once, in a scan loop.
         name (str, optional): name to refer to this layer as.
     Attributes:
         W_input (Tensor): weights from inputs to output units
@@ -1638,26 +1716,52 @@ class LSTM(Recurrent):
 
     def __init__(self, nout, init, init_inner=None, activation=None, gate_activation=None,
                  batch_norm=False, reset_cells=True, return_sequence=True, backward=False,
-                 **kwargs):
+                 fuse_gates=True, use_scan=False, **kwargs):
         super(LSTM, self).__init__(nout, init, init_inner=init_inner, activation=activation,
                                    reset_cells=reset_cells, return_sequence=return_sequence,
-                                   backward=backward, **kwargs)
+                                   backward=backward, use_scan=use_scan, **kwargs)
 
         if batch_norm is True:
             self.batch_norm = {k: BatchNorm() for k in self.metadata["gates"]}
         else:
             self.batch_norm = None
         self.gate_activation = gate_activation if gate_activation is not None else self.activation
+        self.fuse_gates = fuse_gates
+        self.W_recur_fused = None
+
+    def _concat_gates(self, params):
+        """
+        Concatenates the per gate params along their leading axis, in the order of the gates.
+        """
+        gates = self.metadata['gates']
+        return ng.concat_along_axis([params[k] for k in gates], params[gates[0]].axes[0])
+
+    def _split_gates(self, x):
+        """
+        Slices the value of each gate out of x, whose leading axis is the concatenation made by
+        _concat_gates.
+        """
+        gates = self.metadata['gates']
+        length = x.axes[0].length // len(gates)
+        rest = [slice(None)] * (len(x.axes) - 1)
+        return {k: ng.tensor_slice(x, [slice(i * length, (i + 1) * length)] + rest)
+                for i, k in enumerate(gates)}
 
     def _step(self, h_ff, states):
         h_state = states[0]
         c_state = states[1]
-        ifog = {
-            k: sum([ng.cast_role(h_ff[k], self.out_axes),
-                    ng.cast_role(ng.dot(self.W_recur[k], h_state), self.out_axes),
-                    self.b[k],
-                    ]) for k in self.metadata['gates']
-        }
+        if self.W_recur_fused is not None:
+            # the biases were added to h_ff with the input projection
+            h_rec = self._split_gates(ng.dot(self.W_recur_fused, h_state))
+            ifog = {k: ng.cast_role(h_ff[k] + h_rec[k], self.out_axes)
+                    for k in self.metadata['gates']}
+        else:
+            ifog = {
+                k: sum([ng.cast_role(h_ff[k], self.out_axes),
+                        ng.cast_role(ng.dot(self.W_recur[k], h_state), self.out_axes),
+                        self.b[k],
+                        ]) for k in self.metadata['gates']
+            }
         ifog_act = {k: self.activation(ifog[k]) if k is 'g'
                     else self.gate_activation(ifog[k]) for k in self.metadata['gates']}
 
@@ -1738,45 +1842,75 @@ class LSTM(Recurrent):
         # Compute feed forward weighted inputs
         # Batch norm is computed only on the weighted inputs
         # as in https://arxiv.org/abs/1510.01378
-        h_ff = dict()
-        for k in self.metadata["gates"]:
-            h_ff[k] = ng.dot(self.W_input[k], in_obj)
-            if self.batch_norm is not None:
-                h_ff[k] = self.batch_norm[k](h_ff[k])
-
+        gates = self.metadata["gates"]
+        if self.fuse_gates and len(self.out_feature_axes) == 1:
+            # one dot for the inputs of all the gates, and one per step for their states
+            self.W_recur_fused = self._concat_gates(self.W_recur)
+            h_ff = ng.dot(self._concat_gates(self.W_input), in_obj)
+            gate_axes = ng.make_axes([h_ff.axes[0]])
+            if self.batch_norm is None:
+                h_ff = self._split_gates(h_ff + ng.cast_role(self._concat_gates(self.b),
+                                                             gate_axes))
+            else:
+                h_ff = self._split_gates(h_ff)
+                h_ff = {k: self.batch_norm[k](h_ff[k])
+                        + ng.cast_role(self.b[k], ng.make_axes([h_ff[k].axes[0]]))
+                        for k in gates}
+        else:
+            self.W_recur_fused = None
+            h_ff = dict()
+            for k in gates:
+                h_ff[k] = ng.dot(self.W_input[k], in_obj)
+                if self.batch_norm is not None:
+                    h_ff[k] = self.batch_norm[k](h_ff[k])
+
+        if self.use_scan:
+            def step(inputs, states):
+                states = self._step(dict(zip(gates, inputs)), states)
+                return states, states
+
+            (h_stack, c_stack), (h_last, c_last) = ng.scan(
+                step, [h_ff[k] for k in gates], [h, c], self.recurrent_axis,
+                reverse=self.backward, pos=self.recurrent_axis_idx)
+        else:
             # slice the weighted inputs into time slices
-        h_ff = get_steps(h_ff, self.recurrent_axis, self.backward)
-
-        # recurrent computation
-        for i in range(self.recurrent_axis.length):
-            with ng.metadata(recurrent_step=str(i)):
-                [h, c] = self._step(h_ff[i], [h, c])
-                h_list.append(h)
-                c_list.append(c)
+            h_ff = get_steps(h_ff, self.recurrent_axis, self.backward)
+
+            # recurrent computation
+            for i in range(self.recurrent_axis.length):
+                with ng.metadata(recurrent_step=str(i)):
+                    [h, c] = self._step(h_ff[i], [h, c])
+                    h_list.append(h)
+                    c_list.append(c)
+            h_last = h_list[-1]
+            c_last = c_list[-1]
+            if self.return_sequence is True:
+                if self.backward:
+                    h_list = h_list[::-1]
+                    c_list = c_list[::-1]
+                h_stack = ng.stack(h_list, self.recurrent_axis, pos=self.recurrent_axis_idx)
+                if return_cell_state:
+                    c_stack = ng.stack(c_list, self.recurrent_axis,
+                                       pos=self.recurrent_axis_idx)
 
         if self.return_sequence is True:
-            if self.backward:
-                h_list = h_list[::-1]
-                c_list = c_list[::-1]
-            h_stack = ng.stack(h_list, self.recurrent_axis, pos=self.recurrent_axis_idx)
             if return_cell_state:
-                c_stack = ng.stack(c_list, self.recurrent_axis, pos=self.recurrent_axis_idx)
                 lstm_out = (h_stack, c_stack)
             else:
                 lstm_out = h_stack
         else:
             if return_cell_state:
-                lstm_out = (h_list[-1], c_list[-1])
+                lstm_out = (h_last, c_last)
             else:
-                lstm_out = h_list[-1]
+                lstm_out = h_last
 
         if self.reset_cells is True:
             return lstm_out
         else:
             return ng.sequential([
                 ng.doall([
-                    ng.assign(self.h_init, h_list[-1]),
-                    ng.assign(self.c_init, c_list[-1])
+                    ng.assign(self.h_init, h_last),
+                    ng.assign(self.c_init, c_last)
                 ]),
                 lstm_out
             ])
@@ -1818,13 +1952,15 @@ def _cells_initialize_states(cells, batch_axis, **kwargs):
 
 
 def unroll(cell, num_steps, inputs, init_states=None, reset_cells=True,
-           return_sequence=True, reverse_mode=False):
+           return_sequence=True, reverse_mode=False, use_scan=False):
     """
     Unroll the cell for num_steps steps.
 
     Arguments:
     ----------
     init_states: either None or a dictionary containing states
+    use_scan: if True, build the graph of a step once, in a scan loop over the
+        whole recurrent axis, instead of once per step
     """
     recurrent_axis = inputs.axes.recurrent_axis()
     recurrent_axis_idx = len(cell.feature_axes)
@@ -1835,22 +1971,42 @@ def unroll(cell, num_steps, inputs, init_states=None, reset_cells=True,
     else:
         states = init_states
 
-    stepped_inputs = get_steps(inputs, recurrent_axis, backward=reverse_mode)
-    stepped_outputs = []
+    if use_scan:
+        if num_steps != recurrent_axis.length:
+            raise ValueError("A scan runs over the whole recurrent axis: "
+                             "{} != {}".format(num_steps, recurrent_axis.length))
+        if states is None:
+            states = cell.initialize_states(batch_axis)
+        names = [info['state_name'] for info in cell.state_info]
+
+        def step(step_inputs, step_states):
+            output, new_states = cell(step_inputs[0], dict(zip(names, step_states)))
+            return [output], [new_states[name] for name in names]
+
+        (outputs,), final_states = ng.scan(step, [inputs], [states[name] for name in names],
+                                           recurrent_axis, reverse=reverse_mode,
+                                           pos=recurrent_axis_idx)
+        states = dict(zip(names, final_states))
+        if not return_sequence:
+            last = 0 if reverse_mode else num_steps - 1
+            outputs = ng.slice_along_axis(outputs, recurrent_axis, last)
+    else:
+        stepped_inputs = get_steps(inputs, recurrent_axis, backward=reverse_mode)
+        stepped_outputs = []
+
+        for t in range(num_steps):
+            with ng.metadata(step=str(t)):
+                output, states = cell(stepped_inputs[t], states)
+                stepped_outputs.append(output)
 
-    for t in range(num_steps):
-        with ng.metadata(step=str(t)):
-            output, states = cell(stepped_inputs[t], states)
-            stepped_outputs.append(output)
+        if reverse_mode:
+            if return_sequence:
+                stepped_outputs.reverse()
 
-    if reverse_mode:
         if return_sequence:
-            stepped_outputs.reverse()
-
-    if return_sequence:
-        outputs = ng.stack(stepped_outputs, recurrent_axis, pos=recurrent_axis_idx)
-    else:
-        outputs = stepped_outputs[-1]
+            outputs = ng.stack(stepped_outputs, recurrent_axis, pos=recurrent_axis_idx)
+        else:
+            outputs = stepped_outputs[-1]
 
     if not reset_cells:
         update_inits = ng.doall([ng.assign(initial, states[name])
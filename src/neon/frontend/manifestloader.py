@@ -0,0 +1,337 @@
+# ******************************************************************************
+# Copyright 2017-2018 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ******************************************************************************
+from __future__ import division
+import hashlib
+import logging
+import multiprocessing
+import os
+import re
+import sys
+
+import numpy as np
+from PIL import Image
+
+from neon.frontend.arrayiterator import ArrayIterator, shard_bounds
+from neon.frontend.augmentation import AugmentedIterator, ImageAugmentation
+from neon.util.persist import get_data_cache_or_nothing
+
+logger = logging.getLogger(__name__)
+
+SUPPORTED_AUGMENTATIONS = {'type', 'padding', 'crop_enable', 'center', 'flip_enable', 'scale'}
+
+
+def shard_records(records, num_shards, shard_index, seed=0):
+    """
+    Splits the records of a manifest into disjoint shards of the same size.
+
+    The records are shuffled with seed before being split, so that each shard samples the whole
+    manifest, and the records of a shard keep the order of the manifest.
+
+    Returns:
+        The records of shard shard_index.
+    """
+    order = np.random.RandomState(seed).permutation(len(records))
+    start, size = shard_bounds(len(records), num_shards, shard_index)
+    return [records[i] for i in sorted(order[start:start + size])]
+
+
+def write_manifest_shard(filename, num_shards, shard_index, seed=0):
+    """
+    Writes a manifest with the records of a shard of the manifest filename next to it.
+
+    Returns:
+        The name of the new manifest.
+    """
+    with open(filename) as f:
+        lines = [line.strip() + '\n' for line in f if line.strip()]
+    header = [line for line in lines[:1] if line.startswith('@')]
+    records = shard_records(lines[len(header):], num_shards, shard_index, seed)
+    base, ext = os.path.splitext(filename)
+    shard_filename = '{}-shard{}of{}{}'.format(base, shard_index, num_shards, ext)
+    with open(shard_filename, 'w') as f:
+        f.writelines(header + records)
+    return shard_filename
+
+
+def read_manifest(filename, root):
+    """
+    Reads the records of an aeon manifest.
+
+    The fields of a record are separated by tabs or commas, and a first line starting with '@'
+    is a header. The label of a record is either an integer or the name of a file holding it.
+
+    Arguments:
+        filename (str): The manifest.
+        root (str): Directory the file names in the manifest are relative to.
+
+    Returns:
+        The list of image file names and the array of labels.
+    """
+    with open(filename) as f:
+        lines = [line.strip() for line in f if line.strip()]
+    if lines and lines[0].startswith('@'):
+        lines = lines[1:]
+    paths, labels = [], []
+    for line in lines:
+        path, label = re.split('[\t,]', line)[:2]
+        paths.append(os.path.join(root, path))
+        label_path = os.path.join(root, label)
+        if os.path.isfile(label_path):
+            with open(label_path) as label_file:
+                label = label_file.read()
+        labels.append(int(label.strip()))
+    return paths, np.array(labels, dtype=np.int32)
+
+
+def decode_image(args):
+    """
+    Returns:
+        The image in the file path as an uint8 array of shape (C, height, width).
+    """
+    path, height, width, mode = args
+    image = Image.open(path).convert(mode)
+    if image.size != (width, height):
+        image = image.resize((width, height), Image.BILINEAR)
+    image = np.asarray(image, dtype=np.uint8)
+    if image.ndim == 2:
+        return image[np.newaxis]
+    return image.transpose(2, 0, 1)
+
+
+class DecodedImages(object):
+    """
+    The images of a manifest, decoded when a minibatch first reads them.
+
+    Offers the shape, dtype and indexing of an array of shape (N, C, height, width), so that an
+    ArrayIterator can gather minibatches from it. The images missing from a minibatch are
+    decoded in a pool of processes. With a cache_file, decoded images are kept in a memory map
+    next to it, and once every image is decoded the map is moved to cache_file. Without one,
+    nothing is kept and the images are decoded again each epoch.
+
+    Arguments:
+        paths (list): Image file names.
+        shape (tuple): Height and width the images are decoded at.
+        mode (str): PIL mode of the images, 'RGB' or 'L'.
+        num_workers (int): Number of processes decoding the images.
+        cache_file (str): Name of the .npy file holding the decoded images once complete.
+    """
+
+    def __init__(self, paths, shape, mode, num_workers, cache_file=None):
+        self.records = [(path, shape[0], shape[1], mode) for path in paths]
+        self.shape = (len(paths), 3 if mode == 'RGB' else 1) + tuple(shape)
+        self.dtype = np.dtype(np.uint8)
+        self.num_workers = num_workers
+        self.cache_file = cache_file
+        self.partial_file = None
+        self.images = None
+        self.decoded = np.zeros(len(paths), dtype=bool)
+        self.pool = None
+        self.owner = os.getpid()
+
+    def __len__(self):
+        return self.shape[0]
+
+    def __getitem__(self, index):
+        indices = np.arange(len(self))[index]
+        if self.cache_file is None:
+            return self.decode(np.atleast_1d(indices)).reshape(
+                np.shape(indices) + self.shape[1:])
+        missing = np.unique(indices[~self.decoded[indices]])
+        if len(missing):
+            self.fill(missing)
+        return self.images[index]
+
+    def decode(self, indices):
+        """
+        Returns:
+            The images at indices, decoded in the pool.
+        """
+        if self.pool is None:
+            self.pool = multiprocessing.Pool(self.num_workers)
+        records = [self.records[i] for i in indices]
+        chunksize = max(1, len(records) // (4 * self.num_workers))
+        images = np.empty((len(records),) + self.shape[1:], dtype=self.dtype)
+        for i, image in enumerate(self.pool.imap(decode_image, records, chunksize)):
+            images[i] = image
+        return images
+
+    def fill(self, indices):
+        """
+        Decodes the images at indices into the memory map, and moves the map to the cache file
+        once every image is decoded.
+        """
+        try:
+            if self.images is None:
+                self.partial_file = '{}.partial-{}'.format(self.cache_file, os.getpid())
+                self.images = np.lib.format.open_memmap(self.partial_file, mode='w+',
+                                                        dtype=self.dtype, shape=self.shape)
+            self.images[indices] = self.decode(indices)
+            self.decoded[indices] = True
+            if self.decoded.all():
+                self.images.flush()
+                self.images = None
+                os.rename(self.partial_file, self.cache_file)
+                self.partial_file = None
+                self.images = np.load(self.cache_file, mmap_mode='r')
+                self.close()
+        except BaseException:
+            self.close()
+            raise
+
+    def close(self):
+        """
+        Stops the pool, and removes the memory map if not every image was decoded.
+        """
+        # forked workers, such as those augmenting the minibatches, share the map
+        if os.getpid() != self.owner:
+            return
+        if self.pool is not None:
+            self.pool.close()
+            self.pool.join()
+            self.pool = None
+        if self.partial_file is not None:
+            self.images = None
+            self.decoded[:] = False
+            if os.path.exists(self.partial_file):
+                os.remove(self.partial_file)
+            self.partial_file = None
+
+    def __del__(self):
+        self.close()
+
+
+class ManifestDataLoader(object):
+    """
+    Loads the images and labels of an aeon manifest without the aeon module.
+
+    Takes an AeonDataLoader config and offers the same interface. The images of a minibatch
+    are decoded in a pool of processes when it is first read. If the config has a
+    cache_directory, or NGRAPH_DATA_CACHE_DIR is set, the decoded images are kept in a memory
+    map there, which is moved into the cache once the first epoch has read every image, and
+    mapped by later loaders of the same manifest as long as the manifest and the size and
+    modification time of each image are unchanged. A loader stopped before is not cached.
+    Without a cache, the images are decoded again each epoch.
+
+    The supported augmentations are padding, a fixed scale, cropping at random or at the
+    center, and flipping. Other augmentations are ignored.
+
+    For data-parallel training, each worker loads a shard of the manifest, so that no image is
+    decoded by more than one worker. The manifest is split once, with random_seed, and each
+    worker shuffles its shard.
+
+    Arguments:
+        config (dict): AeonDataLoader config.
+        num_workers (int): Number of processes decoding and augmenting the images. Defaults to
+                           the number of cores.
+        num_shards (int): Number of data-parallel workers the manifest is split between.
+        shard_index (int): Index of the worker loading this shard.
+    """
+
+    def __init__(self, config, num_workers=None, num_shards=1, shard_index=0, *args, **kwargs):
+        self.config = config
+        self.num_workers = multiprocessing.cpu_count() if num_workers is None else num_workers
+        self.batch_size = config['batch_size']
+        manifest = config['manifest_filename']
+        root = config.get('manifest_root') or os.path.dirname(manifest)
+        paths, labels = read_manifest(manifest, root)
+        if num_shards > 1:
+            records = shard_records(list(zip(paths, labels)), num_shards, shard_index,
+                                    config.get('random_seed', 0))
+            paths = [path for path, _ in records]
+            labels = np.array([label for _, label in records], dtype=np.int32)
+        self.shard = (num_shards, shard_index)
+        self.ndata = len(paths)
+        if self.ndata < self.batch_size:
+            raise ValueError('Number of examples is smaller than the batch size')
+
+        image_config, = [etl for etl in config['etl'] if etl['type'] == 'image']
+        height, width = image_config['height'], image_config['width']
+        channels = image_config.get('channels', 3)
+        augmentation = {}
+        for aug in config.get('augmentation', []):
+            if aug['type'] == 'image':
+                augmentation = aug
+        unsupported = set(augmentation) - SUPPORTED_AUGMENTATIONS
+        if unsupported:
+            logger.warning("Ignoring unsupported augmentations %s", sorted(unsupported))
+
+        # a fixed scale crops that fraction of the image, which is the same as cropping the
+        # image decoded at a larger size
+        scale = augmentation.get('scale', [1.0, 1.0])
+        if scale[0] != scale[1]:
+            logger.warning("Ignoring the scale range %s", scale)
+            scale = [1.0, 1.0]
+        decoded_shape = (int(round(height / scale[0])), int(round(width / scale[0])))
+        images = self.decode(manifest, paths, decoded_shape, 'RGB' if channels == 3 else 'L')
+
+        iteration_mode = config.get('iteration_mode', 'ONCE')
+        if iteration_mode == 'COUNT':
+            total_iterations = config['iteration_mode_count']
+        elif iteration_mode == 'INFINITE':
+            total_iterations = sys.maxsize
+        else:
+            total_iterations = None
+        self._dataloader = ArrayIterator(
+            {'image': {'data': images, 'axes': ('N', 'C', 'H', 'W')},
+             'label': {'data': labels, 'axes': ('N',)}},
+            self.batch_size, total_iterations=total_iterations,
+            shuffle=config.get('shuffle_enable', False))
+
+        padding = augmentation.get('padding', 0)
+        flip = augmentation.get('flip_enable', False)
+        if padding or flip or decoded_shape != (height, width):
+            augment = ImageAugmentation(padding=padding, crop_shape=(height, width),
+                                        random_crop=not augmentation.get('center', False),
+                                        flip=flip)
+            self._dataloader = AugmentedIterator(self._dataloader, augment,
+                                                 num_workers=self.num_workers,
+                                                 dtype=np.uint8,
+                                                 seed=config.get('random_seed', 0))
+
+    def decode(self, manifest, paths, shape, mode):
+        """
+        Returns:
+            The decoded images, mapped from the cache if they are there, or an array decoding
+            them when read.
+        """
+        cache_root = self.config.get('cache_directory') or \
+            get_data_cache_or_nothing('manifest-cache/')
+        cache_file = None
+        if cache_root:
+            key = repr((os.path.abspath(manifest), os.path.getmtime(manifest), shape, mode,
+                        self.shard,
+                        [(os.path.abspath(path), os.path.getsize(path), os.path.getmtime(path))
+                         for path in paths]))
+            cache_file = os.path.join(
+                cache_root, 'decoded-{}.npy'.format(hashlib.sha1(key.encode()).hexdigest()))
+            if os.path.exists(cache_file):
+                return np.load(cache_file, mmap_mode='r')
+        return DecodedImages(paths, shape, mode, self.num_workers, cache_file)
+
+    def __next__(self):
+        return next(self._dataloader)
+
+    def next(self):
+        return self.__next__()
+
+    def __iter__(self):
+        return self
+
+    def make_placeholders(self, include_iteration=False):
+        return self._dataloader.make_placeholders(include_iteration=include_iteration)
+
+    def reset(self):
+        self._dataloader.reset()
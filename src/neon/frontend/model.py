@@ -81,6 +81,8 @@ class Sequential(SubGraph):
     Arguments:
         layers: List of different layers in the network
         name: name to be used with selector
+        checkpoint (bool): If True, the output of each layer is a gradient checkpoint, and the
+            rest of the forward values are recomputed when computing derivatives.
 
     Example:
     .. code-block:: python
@@ -97,9 +99,10 @@ class Sequential(SubGraph):
         output = conv(x)
     """
 
-    def __init__(self, layers, name=None, **kwargs):
+    def __init__(self, layers, name=None, checkpoint=False, **kwargs):
         super(Sequential, self).__init__(name=name, **kwargs)
         self.layers = layers
+        self.checkpoint = checkpoint
 
     @SubGraph.scope_op_creation
     def __call__(self, in_obj, **kwargs):
@@ -110,6 +113,8 @@ class Sequential(SubGraph):
                 print('In', in_obj.axes)
             """
             in_obj = l(in_obj, **kwargs)
+            if self.checkpoint:
+                in_obj = ng.checkpoint(in_obj)
             """
             if hasattr(l, 'name'):
                 print('Out', in_obj.axes)
@@ -218,6 +223,8 @@ class ResidualModule(object):
         main_path: This path typically contains Conv layers
         side_path: This path implements the skip connections which can be direct mapping or
                     1x1 convs for matching dimensions
+        checkpoint (bool): If True, the output of the module is a gradient checkpoint, and the
+                    values inside the module are recomputed when computing derivatives.
     Example:
     .. code-block:: python
         layers = [
@@ -231,9 +238,10 @@ class ResidualModule(object):
     https://github.com/NervanaSystems/private-ngraph/issues/2176
     """
 
-    def __init__(self, main_path, side_path=None):
+    def __init__(self, main_path, side_path=None, checkpoint=False):
         self.main_path = main_path
         self.side_path = side_path
+        self.checkpoint = checkpoint
 
     def __call__(self, in_obj):
         # Computes the output of main path. Parallel path 1
@@ -243,6 +251,9 @@ class ResidualModule(object):
         # Check if their dimensions match
         if(mp.axes == sp.axes) and (mp.axes.lengths == sp.axes.lengths):
             # Sum both and return
-            return mp + sp
+            out = mp + sp
+            if self.checkpoint:
+                out = ng.checkpoint(out)
+            return out
         else:
             raise ValueError("Dimensions mismatch. " + str(mp.axes) + " VS " + str(sp.axes))
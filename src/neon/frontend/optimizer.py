@@ -20,6 +20,7 @@ import neon as ng
 import numbers
 from neon.frontend.common import learning_rate_policies as lrp
 from neon.frontend.graph import SubGraph
+from neon.op_graph.lookuptable import lookuptable_row_updates, lookuptable_scatter_add
 
 logger = logging.getLogger(__name__)
 
@@ -197,10 +198,19 @@ class LearningRateOptimizer(Optimizer):
         # gradients
         grads = [ng.deriv(batch_cost, v) / batch_size for v in variables]
         scale_factor = clip_gradient_norm(grads, self.gradient_clip_norm)
+        adjoints = batch_cost.forwarded.adjoints(batch_cost.one)
 
         # updates
         for variable, grad in zip(variables, grads):
-            updates = self.variable_update(variable, grad, scale_factor, self.weight_clip_value)
+            updates = None
+            if variable.forwarded.tensor in adjoints:
+                row_updates = lookuptable_row_updates(adjoints[variable.forwarded.tensor])
+                if row_updates is not None:
+                    updates = self.row_sparse_update(variable, row_updates,
+                                                     scale_factor / batch_size)
+            if updates is None:
+                updates = self.variable_update(variable, grad, scale_factor,
+                                               self.weight_clip_value)
             all_updates.append(updates)
         updates = ng.doall(all_updates)
         # grads = ng.doall(grads)
@@ -211,6 +221,24 @@ class LearningRateOptimizer(Optimizer):
         # return ng.sequential([grads, updates, 0])
         return ng.sequential([updates, 0])
 
+    def row_sparse_update(self, variable, row_updates, scale_factor):
+        """
+        Returns the update of a variable that is only read by lookup tables, touching only
+        the rows that were looked up, or None to use variable_update on the dense gradient.
+
+        Only GradientDescentMomentum without momentum, weight decay or clipping updates rows
+        sparsely. RMSProp, Adam and Adagrad keep state for every row, which RMSProp and Adam
+        decay at each step whether the row was looked up or not, so updating only the looked
+        up rows would change their results. They update lookup tables densely.
+
+        Arguments:
+            variable (AssignableTensorOp): The lookup table to update
+            row_updates (list of update_lut): The lookups whose gradients sum to that of
+                                              the variable
+            scale_factor (TensorOp): Scale of the gradient of each lookup
+        """
+        return None
+
 
 class GradientDescentMomentum(LearningRateOptimizer):
     """
@@ -305,6 +333,18 @@ class GradientDescentMomentum(LearningRateOptimizer):
         updates.append(ng.assign(variable, clip_weight_value(variable + delta, weight_clip_value)))
         return ng.sequential(updates)
 
+    def row_sparse_update(self, variable, row_updates, scale_factor):
+        # without momentum, decay or clipping, the rows that were not looked up stay the same
+        if (self.momentum_coef != 0 or self.wdecay != 0 or
+                self.gradient_clip_value is not None or self.weight_clip_value is not None):
+            return None
+        value = variable
+        for row_update in row_updates:
+            if row_update.update:
+                delta = - self.lrate * scale_factor * row_update.args[0]
+                value = lookuptable_scatter_add(value, delta, row_update)
+        return ng.assign(variable, value)
+
 
 class RMSProp(LearningRateOptimizer):
     """
@@ -338,6 +378,9 @@ class RMSProp(LearningRateOptimizer):
                                              applied, symmetric around 0. Default: no clipping
         wdecay (float, optional): Amount of weight decay (L2) penalty. Default: 0
         momentum_coef (float, optional): Coefficient of momentum. Default: 0
+
+    The state of every row of a lookup table decays at each step, so lookup tables are updated
+    densely, see LearningRateOptimizer.row_sparse_update.
     """
 
     def __init__(
@@ -420,6 +463,9 @@ class Adam(LearningRateOptimizer):
                                                Default: no clipping
         weight_clip_value (float, optional): Value to element-wise clip weights after updates are
                                              applied, symmetric around 0. Default: no clipping
+
+    The moments of every row of a lookup table decay at each step, so lookup tables are updated
+    densely, see LearningRateOptimizer.row_sparse_update.
     """
 
     def __init__(
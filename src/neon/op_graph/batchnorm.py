@@ -57,6 +57,9 @@ def batchnormcommon(inputs, gamma, beta, epsilon, axes, docstring=None):
 
 class BatchnormCommonOp(TensorOp):
 
+    # its adjoints read the mean and variance ops attached to it
+    copyable = False
+
     def __init__(self, inputs, gamma, beta, epsilon, **kwargs):
         super(BatchnormCommonOp, self).__init__(
             args=(inputs, gamma, beta), **kwargs)
@@ -98,6 +101,9 @@ class BatchnormOutputOp(TensorOp):
     def generate_adjoints(self, adjoints, delta, inputs):
         inputs.generate_add_delta(adjoints, delta)
 
+    def copy_with_new_args(self, args):
+        return type(self)(*args, axes=self.axes)
+
 
 def batchnormmean(inputs, axes, docstring=None):
     """
@@ -114,6 +120,9 @@ def batchnormmean(inputs, axes, docstring=None):
 
 class BatchnormMeanOp(TensorOp):
 
+    # it attaches itself to its input
+    copyable = False
+
     def __init__(self, inputs, **kwargs):
         super(BatchnormMeanOp, self).__init__(args=(inputs,), **kwargs)
         inputs.lmean = self
@@ -137,6 +146,9 @@ class BatchnormVarOp(TensorOp):
     def __init__(self, inputs, **kwargs):
         super(BatchnormVarOp, self).__init__(args=(inputs,), **kwargs)
 
+    def copy_with_new_args(self, args):
+        return type(self)(*args, axes=self.axes)
+
 
 def batchnormbpropcommon(inputs, gamma, beta, mean, variance,
                          delta, epsilon, axes, docstring=None):
@@ -166,6 +178,9 @@ class BatchnormBpropCommonOp(TensorOp):
             args=(inputs, gamma, beta, mean, variance, delta), **kwargs)
         self.epsilon = epsilon
 
+    def copy_with_new_args(self, args):
+        return type(self)(*args, epsilon=self.epsilon, axes=self.axes)
+
 
 def batchnormbpropdata(inputs, axes, docstring=None):
     """
@@ -185,6 +200,9 @@ class BatchnormBpropDataOp(TensorOp):
     def __init__(self, inputs, **kwargs):
         super(BatchnormBpropDataOp, self).__init__(args=(inputs,), **kwargs)
 
+    def copy_with_new_args(self, args):
+        return type(self)(*args, axes=self.axes)
+
 
 def batchnormbpropgamma(inputs, axes, docstring=None):
     """
@@ -204,6 +222,9 @@ class BatchnormBpropGammaOp(TensorOp):
     def __init__(self, inputs, **kwargs):
         super(BatchnormBpropGammaOp, self).__init__(args=(inputs,), **kwargs)
 
+    def copy_with_new_args(self, args):
+        return type(self)(*args, axes=self.axes)
+
 
 def batchnormbpropbeta(inputs, axes, docstring=None):
     """
@@ -223,6 +244,9 @@ class BatchnormBpropBetaOp(TensorOp):
     def __init__(self, inputs, **kwargs):
         super(BatchnormBpropBetaOp, self).__init__(args=(inputs,), **kwargs)
 
+    def copy_with_new_args(self, args):
+        return type(self)(*args, axes=self.axes)
+
 
 def batchnorminference(inputs, gamma, beta, mean, variance, epsilon, axes, docstring=None):
     """
@@ -249,3 +273,6 @@ class BatchnormInferenceOp(TensorOp):
         super(BatchnormInferenceOp, self).__init__(
             args=(inputs, gamma, beta, mean, variance), **kwargs)
         self.epsilon = epsilon
+
+    def copy_with_new_args(self, args):
+        return type(self)(*args, epsilon=self.epsilon, axes=self.axes)
@@ -14,22 +14,24 @@
 # limitations under the License.
 # ******************************************************************************
 from __future__ import division
-from neon.op_graph.op_graph import TensorOp
+from neon.op_graph.op_graph import TensorOp, sum as ng_sum
 
 
-def convolution(conv_params, inputs, filters, axes, docstring=None):
+def convolution(conv_params, inputs, filters, axes, bias=None, docstring=None):
     """
 
     Args:
         conv_params: Dimensions.
         inputs (TensorOp): The input tensor.
         filters (TensorOp): Filter/kernel tensor.
+        bias (TensorOp, optional): Bias added to each output channel. Its axis is the
+            output channel axis.
         docstring (String, optional): Documentation for the op.
 
     Returns:
         TensorOp: The result of the convolution.
     """
-    return ConvolutionOp(conv_params, inputs, filters, axes=axes, docstring=docstring)
+    return ConvolutionOp(conv_params, inputs, filters, bias=bias, axes=axes, docstring=docstring)
 
 
 class ConvolutionOp(TensorOp):
@@ -37,6 +39,7 @@ class ConvolutionOp(TensorOp):
     Arguments:
         inputs  : input tensor.
         filters : filter/kernel tensor.
+        bias    : optional bias, added to each output channel.
 
     Return:
     """
@@ -82,6 +85,8 @@ class ConvolutionOp(TensorOp):
         bprop_conv_op.add_control_dep(self)
         filters.generate_add_delta(adjoints, update_conv_op)
         inputs.generate_add_delta(adjoints, bprop_conv_op)
+        if bias is not None:
+            bias.generate_add_delta(adjoints, ng_sum(delta, out_axes=bias.axes))
 
     @property
     def has_side_effects(self):
@@ -14,7 +14,8 @@
 # limitations under the License.
 # ******************************************************************************
 from __future__ import division
-from neon.op_graph.op_graph import TensorOp
+from neon.op_graph.axes import make_axes
+from neon.op_graph.op_graph import Add, TensorOp
 
 
 def lookuptable(lut, idx, axes, update=True, pad_idx=None, docstring=None):
@@ -25,15 +26,18 @@ def lookuptable(lut, idx, axes, update=True, pad_idx=None, docstring=None):
 
     Args:
         lut (TensorOp): The lookup table.
-        idx (TensorOp): The indices to do the lookup.
-        axes (Axes): output axes
+        idx (TensorOp): The indices to do the lookup, with one or more axes.
+        axes (Axes): output axes, the index axes followed by the feature axis of lut
+            (or preceded by it, to look up the second axis of lut).
+        update (bool): If False, the lookup table gets no gradient.
         pad_idx (int): The int indicates the padding index
         docstring (String, optional): Documentation for the op.
 
     Returns:
         TensorOp: The result of the lookup.
     """
-    return LookupTableOp(lut, idx, axes=axes, update=True, pad_idx=pad_idx, docstring=docstring)
+    return LookupTableOp(lut, idx, axes=axes, update=update, pad_idx=pad_idx,
+                         docstring=docstring)
 
 
 def lookuptable_update(delta, lut, idx, fprop_op):
@@ -52,6 +56,42 @@ def lookuptable_update(delta, lut, idx, fprop_op):
     return update_lut(delta, lut, idx, fprop_op)
 
 
+def lookuptable_row_updates(adjoint):
+    """
+    Splits the adjoint of a lookup table into the updates of the rows read by each lookup.
+
+    Args:
+        adjoint (TensorOp): The adjoint of the lookup table.
+
+    Returns:
+        list: The update_lut ops whose sum is adjoint, or None if adjoint is anything else.
+    """
+    adjoint = adjoint.forwarded
+    if isinstance(adjoint, update_lut):
+        return [adjoint]
+    if isinstance(adjoint, Add):
+        updates = [lookuptable_row_updates(arg) for arg in adjoint.args]
+        if None not in updates:
+            return updates[0] + updates[1]
+    return None
+
+
+def lookuptable_scatter_add(lut, delta, row_update):
+    """
+    An operation to add the delta of each lookup to the row of lut it was read from,
+    without building the gradient of the whole table.
+
+    Args:
+        lut (TensorOp): The lookup table.
+        delta (TensorOp): The delta of the lookup, with the axes of the lookup.
+        row_update (update_lut): The gradient of lut for that lookup.
+
+    Returns:
+        TensorOp: lut with the rows read by the lookup updated.
+    """
+    return scatter_add_lut(lut, delta, row_update.args[1], row_update.fprop)
+
+
 class LookupTableOp(TensorOp):
 
     def __init__(self, lut, idx, axes, update=True, pad_idx=None, **kwargs):
@@ -69,10 +109,8 @@ class LookupTableOp(TensorOp):
                 'lookup table shape must be length 2, found {}'
             ).format(len(lut.shape)))
 
-        if len(idx.shape) != 1:
-            raise ValueError((
-                'index shape must be length 1, found {}'
-            ).format(len(lut.shape)))
+        if len(idx.shape) == 0:
+            raise ValueError('index must have at least one axis')
 
         # axes are the output axes, and it will indicate which axis to do the lookup
         # so one of the lut axis has to be in axes
@@ -87,7 +125,7 @@ class LookupTableOp(TensorOp):
                 out_axes=axes,
             ))
 
-        if not idx.axes[0] in axes:
+        if not all(axis in axes for axis in idx.axes):
             raise ValueError((
                 "Output axes must index axes.  "
                 "Found index axes: {idx_axes} "
@@ -104,7 +142,13 @@ class LookupTableOp(TensorOp):
         self.pad_idx = pad_idx
         self.update = update
 
-        if axes[self.lut_axis] != idx.axes[0]:
+        # the looked up rows replace the lut axis, in the order of the index axes
+        feature_axes = make_axes([lut.axes[1 - self.lut_axis]])
+        if self.lut_axis == 0:
+            lookup_axes = idx.axes + feature_axes
+        else:
+            lookup_axes = feature_axes + idx.axes
+        if tuple(axes) != tuple(lookup_axes):
             raise ValueError("Cannot transpose lut axes implicitly")
 
         super(LookupTableOp, self).__init__(args=(lut, idx),
@@ -193,3 +237,22 @@ class bprop_lut(LutDerivOp):
 
     def copy_with_new_args(self, args):
         return type(self)(args[0], args[1], self.fprop.args[1], self.fprop)
+
+
+class scatter_add_lut(LutDerivOp):
+
+    def __init__(self, lut, delta, idx, fprop, **kwargs):
+        """
+        Arguments:
+            lut  : lookup table.
+            delta : delta of the lookup
+            idx  : indices for lookup
+        """
+        super(scatter_add_lut, self).__init__(
+            args=(lut, delta, idx),
+            fprop=fprop,
+            axes=lut.axes, **kwargs
+        )
+
+    def copy_with_new_args(self, args):
+        return type(self)(args[0], args[1], args[2], self.fprop)
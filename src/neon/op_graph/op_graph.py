@@ -165,6 +165,10 @@ class Op(ScopedNameableValue):
         trainable: The value is trainable.
     """
 
+    # False for ops whose value depends on ops other than their args, such as loops, which
+    # copy_with_new_args cannot copy.
+    copyable = True
+
     # Default is to not collect Ops as they are created
     @staticmethod
     def _get_thread_ops():
@@ -1158,7 +1162,8 @@ class TensorOp(Op):
         # new ops. Some ops may be containers for other ops, so we create an
         # ordered set to ensure we don't do multiple backprops.
         processed = set()
-        for o in reversed(Op.ordered_ops([self])):
+        forward_ops = Op.ordered_ops([self])
+        for o in reversed(forward_ops):
             if o.tensor in processed:
                 continue
             if o.tensor in adjoints:
@@ -1177,6 +1182,10 @@ class TensorOp(Op):
 
                 processed.add(o.tensor)
 
+        checkpoints = checkpoint_ops(forward_ops)
+        if checkpoints is not None:
+            recompute_adjoints(forward_ops, adjoints, checkpoints)
+
         return adjoints
 
     def generate_add_delta(self, adjoints, delta):
@@ -1870,6 +1879,9 @@ class MapRolesOp(AxesCastOp):
 
         super(MapRolesOp, self).__init__(x, axes=self.axes_map.map_axes(x.axes), **kwargs)
 
+    def copy_with_new_args(self, args):
+        return type(self)(args[0], self.axes_map)
+
     def generate_adjoints(self, adjoints, delta, x):
         x.generate_add_delta(adjoints, MapRolesOp(delta, self.axes_map.invert()))
 
@@ -2827,7 +2839,7 @@ class RngOp(TensorOp):
     def __init__(self, distribution, params, x, *args, **kwargs):
         """
         Arguments:
-            x  : input tensor.
+            x  : input tensor, or the axes of a new tensor.
             distribution : either 'uniform' or 'normal'
             params: dict for specifying parameters of distribution
         Return:
@@ -2840,15 +2852,20 @@ class RngOp(TensorOp):
         self.distribution = distribution
         self.params = params
 
-        super(RngOp, self).__init__(
-            args=(x,), axes=x.axes, *args, **kwargs
-        )
+        if isinstance(x, Axes):
+            super(RngOp, self).__init__(args=(), axes=x, *args, **kwargs)
+        else:
+            super(RngOp, self).__init__(
+                args=(x,), axes=x.axes, *args, **kwargs
+            )
 
-    def generate_adjoints(self, adjoints, delta, x):
-        x.generate_add_delta(adjoints, delta)
+    def generate_adjoints(self, adjoints, delta, *args):
+        for x in args:
+            x.generate_add_delta(adjoints, delta)
 
     def copy_with_new_args(self, args):
-        return type(self)(self.distribution, self.params, *args)
+        x = args[0] if args else self.axes
+        return type(self)(self.distribution, self.params, x)
 
 
 def uniform(x, low=0.0, high=1.0):
@@ -2856,7 +2873,7 @@ def uniform(x, low=0.0, high=1.0):
     Fills x with uniform distribution between low and high.
 
     Args:
-        x (TensorOp): A tensor.
+        x (TensorOp, Axes): A tensor, or the axes of a new tensor.
         low (float): lower limit of distribution range
         high (float): upper limit of distribution range
 
@@ -2871,7 +2888,7 @@ def normal(x, loc=0.0, scale=1.0):
     Fills x with normal distribution centered around loc and scaled by scale
 
     Args:
-        x (TensorOp): A tensor.
+        x (TensorOp, Axes): A tensor, or the axes of a new tensor.
         loc (float): mean of distribution
         scale (float): standard deviation of distribution
 
@@ -3834,6 +3851,7 @@ class SoftmaxOp(ValueOp):
 
         if normalization_axes is None:
             normalization_axes = x.axes.sample_axes() - x.axes.recurrent_axis()
+        self.logits = x
         self.x = x - max(x, reduction_axes=normalization_axes)
         self.exps = exp(self.x)
         self.Z = sum(self.exps, reduction_axes=normalization_axes)
@@ -3854,7 +3872,9 @@ class SoftmaxOp(ValueOp):
         """
         z = delta * self.value_tensor
         zs = sum(z)
-        self.x.generate_add_delta(adjoints, (z - zs * self.value_tensor))
+        # softmax does not change when a constant is subtracted from x, so the adjoint of the
+        # max subtracted for stability is zero and the delta goes straight to the logits
+        self.logits.generate_add_delta(adjoints, (z - zs * self.value_tensor))
 
 
 def softmax(x, normalization_axes=None, **kwargs):
@@ -4325,6 +4345,180 @@ def deriv(dependent, independent, error=None):
     return DerivOp(dependent, independent, error).value_tensor
 
 
+def checkpoint(x):
+    """
+    Marks x as a gradient checkpoint.
+
+    When any op in the forward graph of a derivative is a checkpoint, the values the backward
+    graph needs are recomputed from the nearest checkpoints instead of being kept alive from
+    the forward computation. See recompute for the memory this saves.
+
+    Arguments:
+        x (TensorOp): The op whose value is kept.
+
+    Returns:
+        x
+    """
+    x = as_op(x)
+    x.metadata['checkpoint'] = True
+    return x
+
+
+def recompute(x, policy='sqrt'):
+    """
+    Enables recomputation in the backward graph of derivatives of ops that depend on x.
+
+    Recomputation lowers the peak memory of the neon graph, in the order its control
+    dependencies give, as estimate_memory reports it. The pybind transformer lowers the
+    results to an nGraph function without those control dependencies, and the backend may
+    merge the copies with the forward values they repeat, so the peak memory of the backend is
+    not guaranteed to drop.
+
+    Arguments:
+        x (TensorOp): An op in the forward graph, typically the cost.
+        policy (str): 'sqrt' picks a checkpoint every sqrt(n) ops, in addition to any ops
+            marked with checkpoint. 'marked' only uses the ops marked with checkpoint.
+
+    Returns:
+        x
+    """
+    if policy not in ('sqrt', 'marked'):
+        raise ValueError("Unknown recompute policy {}".format(policy))
+    x = as_op(x)
+    x.metadata['recompute'] = policy
+    return x
+
+
+def is_recomputable(op):
+    """
+    Returns:
+        True if the value of op can be computed again from its args.
+    """
+    return (op.is_tensor_op
+            and op.copyable
+            and len(op.args) > 0
+            and not op.is_state_op
+            and not op.has_side_effects
+            and not isinstance(op, (AssignableTensorOp, ValueOp, RngOp)))
+
+
+def checkpoint_ops(forward_ops):
+    """
+    Chooses the checkpoints for a forward graph.
+
+    Arguments:
+        forward_ops: The forward ops, in execution order.
+
+    Returns:
+        The OrderedSet of checkpoint ops, or None if recomputation is not enabled.
+    """
+    policy = None
+    for op in forward_ops:
+        if op.metadata.get('recompute') == 'sqrt':
+            policy = 'sqrt'
+        elif policy is None and (op.metadata.get('recompute') == 'marked'
+                                 or op.metadata.get('checkpoint')):
+            policy = 'marked'
+    if policy is None:
+        return None
+
+    checkpoints = OrderedSet(op for op in forward_ops if op.metadata.get('checkpoint'))
+    if policy == 'sqrt':
+        candidates = [op for op in forward_ops if is_recomputable(op)]
+        stride = int(round(np.sqrt(len(candidates)))) or 1
+        checkpoints.update(candidates[stride - 1::stride])
+    return checkpoints
+
+
+def recompute_adjoints(forward_ops, adjoints, checkpoints):
+    """
+    Rewrites the backward graph so that it recomputes forward values from checkpoints.
+
+    Every forward value read by a backward op is replaced with a copy computed from the nearest
+    checkpoints, so only the checkpoints need to stay live between the forward and backward
+    computations. Ops that are not copyable, and the values read by backward ops that are not
+    copyable, are kept, and act as checkpoints.
+
+    The copies needed by a backward op get control dependencies on the backward args of the
+    first backward op that needs them, so that they are computed when the backward computation
+    reaches them, and not merged back into the forward computation.
+
+    Arguments:
+        forward_ops: The forward ops, in execution order.
+        adjoints: Map from Op to its adjoint, or to the map of the adjoints of its values
+            for ops with several values, such as loops.
+        checkpoints: Forward ops whose values are kept.
+
+    Returns:
+        The number of forward ops recomputed.
+
+    Raises:
+        ValueError: If the copy of an op does not have its axes.
+    """
+    forward = set(forward_ops)
+    roots = []
+    for adjoint in adjoints.values():
+        roots.extend(adjoint.values() if isinstance(adjoint, dict) else [adjoint])
+    backward_ops = [op for op in Op.ordered_ops(roots) if op not in forward]
+    backward = set(backward_ops)
+
+    def recomputed_op(op):
+        return op in forward and op not in checkpoints and is_recomputable(op)
+
+    # Forward ops needed by the backward graph, and the forward ops they are computed from,
+    # back to the checkpoints.
+    needed = set()
+    frontier = [arg.forwarded for op in backward_ops if op.copyable for arg in op.args
+                if recomputed_op(arg.forwarded)]
+    while frontier:
+        op = frontier.pop()
+        if op in needed:
+            continue
+        needed.add(op)
+        frontier.extend(arg.forwarded for arg in op.args if recomputed_op(arg.forwarded))
+
+    def copy_with_new_args(op, args):
+        copy = op.copy_with_new_args(args)
+        if copy.axes != op.axes:
+            raise ValueError("Cannot recompute through {}, whose copy has axes {} instead of {}"
+                             .format(op, copy.axes, op.axes))
+        return copy
+
+    copies = dict()
+
+    def copied(op):
+        return copies.get(op.forwarded, op.forwarded)
+
+    for op in forward_ops:
+        if op in needed:
+            copy = copy_with_new_args(op, [copied(arg) for arg in op.args])
+            copy.metadata.update((key, value) for key, value in op.metadata.items()
+                                 if key not in ('checkpoint', 'recompute'))
+            copies[op] = copy
+
+    copy_ops = set(copies.values())
+    scheduled = set()
+    for op in backward_ops:
+        args = [arg.forwarded for arg in op.args]
+        if not op.copyable or not any(arg in copies for arg in args):
+            continue
+        new_args = [copied(arg) for arg in args]
+        gates = [arg for arg in args if arg in backward]
+        frontier = [arg for arg in new_args if arg in copy_ops]
+        while frontier:
+            copy = frontier.pop()
+            if copy in scheduled:
+                continue
+            scheduled.add(copy)
+            for gate in gates:
+                copy.add_control_dep(gate)
+            frontier.extend(arg for arg in copy.args if arg in copy_ops)
+        rewired = copy_with_new_args(op, new_args)
+        op.replace_self(rewired)
+        backward.add(rewired)
+    return len(copies)
+
+
 class CrossEntropyMultiOp(ValueOp):
     """
     Computes the cross-entropy of two distributions.
@@ -4356,8 +4550,11 @@ class CrossEntropyMultiOp(ValueOp):
             index_axes = y.axes.sample_axes() - y.axes.recurrent_axis()
             out_axes = y.axes - index_axes
         if enable_softmax_opt and isinstance(y.deriv_handler, SoftmaxOp):
-            # This depends on sum(t) being 1
+            # log-softmax NLL, log(Z) - x.t, from the shifted logits and normalizer of the
+            # softmax. This depends on sum(t) being 1
             self.y = y
+            self.t = t
+            self.logits = y.deriv_handler.logits
             self.x = y.deriv_handler.x
             self.s = -sum(self.x * t, out_axes=out_axes)
             self.value_tensor = minimum(self.s + log(y.deriv_handler.Z), safelog_cutoff)
@@ -4369,8 +4566,12 @@ class CrossEntropyMultiOp(ValueOp):
             self.value_tensor = self.value_tensor * np.float(1. / np.log(2.0))
 
     def generate_adjoints(self, adjoints, delta):
-        self.s.generate_add_delta(adjoints, delta)
-        self.x.generate_add_delta(adjoints, self.y * delta)
+        # d/dx is p - t, the max subtracted from the logits gets no adjoint, see SoftmaxOp
+        for arg, arg_delta in ((self.logits, (self.y - self.t) * delta),
+                               (self.t, -self.x * delta)):
+            if not arg_delta.axes.is_equal_set(arg.axes):
+                arg_delta = sum(arg_delta, out_axes=arg.axes)
+            arg.generate_add_delta(adjoints, arg_delta)
 
 
 def cross_entropy_multi(y, t, usebits=False, out_axes=None,
@@ -34,6 +34,9 @@ class ReluOp(TensorOp):
     def __init__(self, inputs, **kwargs):
         super(ReluOp, self).__init__(args=(inputs,), **kwargs)
 
+    def copy_with_new_args(self, args):
+        return type(self)(*args, axes=self.axes)
+
     def generate_adjoints(self, adjoints, delta, inputs):
         relu_bprop = ReluBpropOp(inputs, delta, axes=inputs.axes)
         inputs.generate_add_delta(adjoints, relu_bprop)
@@ -43,3 +46,6 @@ class ReluBpropOp(TensorOp):
 
     def __init__(self, inputs, delta, **kwargs):
         super(ReluBpropOp, self).__init__(args=(inputs, delta), **kwargs)
+
+    def copy_with_new_args(self, args):
+        return type(self)(*args, axes=self.axes)
@@ -0,0 +1,318 @@
+# ******************************************************************************
+# Copyright 2017-2018 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ******************************************************************************
+from orderedset import OrderedSet
+
+from neon.op_graph.op_graph import Op, TensorOp, TensorValueOp, as_op, axes_with_order, \
+    broadcast, constant, placeholder, slice_along_axis, stack
+
+
+def scan(step, sequences, initial_states, axis, reverse=False, pos=0):
+    """
+    Applies step to each element of sequences along axis, carrying states between elements.
+
+    The graph of step is built once, with placeholders for its arguments, instead of once per
+    element, so the size of the graph and of its derivatives does not depend on the length of
+    axis.
+
+    Arguments:
+        step: step(inputs, states) returns the lists (outputs, new_states). inputs are the
+            elements of sequences at a position of axis, states the states before it, and
+            new_states must have the axes of states.
+        sequences (list of TensorOp): Tensors with axis, which are iterated over.
+        initial_states (list of TensorOp): The states before the first step.
+        axis (Axis): The axis to iterate over.
+        reverse (bool): Iterate from the last position of axis to the first.
+        pos (int): The position of axis in the axes of the stacked outputs.
+
+    Returns:
+        The lists (outputs, final_states). Each output is stacked along axis, in the order of
+        axis whatever the direction, and final_states are the states after the last step.
+    """
+    op = ScanOp(step, sequences, initial_states, axis, reverse=reverse, pos=pos)
+    outputs = [ScanOutputOp(op, ('output', i)) for i in range(len(op.step_outputs))]
+    final_states = [ScanOutputOp(op, ('state', i)) for i in range(len(op.initial_states))]
+    return outputs, final_states
+
+
+def step_adjoints(body_ops, deltas):
+    """
+    Backpropagates through the ops of a single step only.
+
+    Unlike TensorOp.adjoints, this does not visit the graphs the step reads from, which would
+    cost as much as the whole sequence at every step.
+
+    Arguments:
+        body_ops: The ops created by the step, in creation order.
+        deltas: Pairs of an op computed by the step and its delta.
+
+    Returns:
+        Map from Op to its adjoint, including the ops the step reads from.
+    """
+    adjoints = dict()
+    for op, delta in deltas:
+        op.generate_add_delta(adjoints, delta)
+
+    processed = set()
+    for op in reversed(body_ops):
+        if op.tensor in processed or op.tensor not in adjoints:
+            continue
+        adjoint = adjoints[op.tensor]
+        if op.scale is not None:
+            adjoint = adjoint * op.scale
+        deriv_handler = op.deriv_handler
+        deriv_handler.generate_adjoints(adjoints, adjoint, *deriv_handler.args)
+        processed.add(op.tensor)
+    return adjoints
+
+
+def adjoint_of(adjoints, op):
+    """
+    Returns:
+        The adjoint of op, with the axes of op.
+    """
+    adjoint = adjoints.get(op.forwarded.tensor)
+    if adjoint is None:
+        return constant(0, axes=op.axes)
+    return broadcast(adjoint.forwarded, axes=op.axes)
+
+
+class ScanOp(TensorOp):
+    """
+    A loop over the positions of an axis, made by scan.
+
+    The values of the loop are read through ScanOutputOps. The transformer expands the loop
+    before lowering, by calling step once per position.
+
+    The derivatives of the loop are computed by a backward scan, see generate_adjoints. That
+    scan cannot be differentiated in turn, so taking second derivatives through a ScanOp
+    raises NotImplementedError.
+
+    Arguments:
+        step: The function computing a step, see scan.
+        sequences (list of TensorOp): Tensors iterated over.
+        initial_states (list of TensorOp): The states before the first step.
+        axis (Axis): The axis iterated over.
+        reverse (bool): Iterate from the last position of axis to the first.
+        pos (int): The position of axis in the axes of the stacked values.
+
+    Attributes:
+        step_inputs: Placeholders for the inputs of the step.
+        step_states: Placeholders for the states of the step.
+        step_outputs: The outputs of the step, computed from the placeholders.
+        step_results: The new states of the step, computed from the placeholders.
+        captured: Tensors computed outside the step that the step reads, such as weights.
+    """
+
+    # the step reads the captured tensors themselves, whatever the args of a copy
+    copyable = False
+
+    def __init__(self, step, sequences, initial_states, axis, reverse=False, pos=0, **kwargs):
+        sequences = [as_op(x) for x in sequences]
+        initial_states = [as_op(x) for x in initial_states]
+        self.step = step
+        self.axis = axis
+        self.reverse = reverse
+        self.pos = pos
+        self.step_inputs = [placeholder(x.axes - axis).named('scan_input') for x in sequences]
+        self.step_states = [placeholder(x.axes).named('scan_state') for x in initial_states]
+        with Op.all_ops() as body_ops:
+            outputs, results = step(self.step_inputs, self.step_states)
+        self.step_outputs = list(outputs)
+        self.step_results = list(results)
+        if len(self.step_results) != len(initial_states):
+            raise ValueError("The step returned {} states instead of {}"
+                             .format(len(self.step_results), len(initial_states)))
+        for state, result in zip(initial_states, self.step_results):
+            if not state.axes.is_equal_set(result.axes):
+                raise ValueError("The step changed the axes of a state from {} to {}"
+                                 .format(state.axes, result.axes))
+        self.captured = self.captured_ops(body_ops)
+        self.expanded = None
+        super(ScanOp, self).__init__(args=tuple(sequences) + tuple(initial_states)
+                                     + tuple(self.captured), axes=(), **kwargs)
+
+    @property
+    def sequences(self):
+        return self.args[:len(self.step_inputs)]
+
+    @property
+    def initial_states(self):
+        start = len(self.step_inputs)
+        return self.args[start:start + len(self.step_states)]
+
+    def captured_ops(self, body_ops):
+        """
+        Returns:
+            The tensors outside body_ops, other than the placeholders and constants, that
+            body_ops read.
+        """
+        body = set(body_ops) | set(self.step_inputs) | set(self.step_states)
+        captured = OrderedSet()
+        for op in body_ops:
+            if isinstance(op, TensorValueOp):
+                reads = [op.tensor]
+            else:
+                reads = [arg.forwarded for arg in op.args]
+            for read in reads:
+                if read in body or read.tensor in body or read.is_constant:
+                    continue
+                captured.add(read)
+        for op in self.step_outputs + self.step_results:
+            if op not in body and op.tensor not in body and not op.is_constant:
+                captured.add(op)
+        return list(captured)
+
+    def value_axes(self, key):
+        """
+        Returns:
+            The axes of the value read by ScanOutputOp(self, key).
+        """
+        kind, index = key
+        if kind == 'state':
+            return self.initial_states[index].axes
+        if kind == 'output':
+            axes = self.step_outputs[index].axes
+        else:
+            axes = self.initial_states[index].axes
+        return axes[:self.pos] + self.axis + axes[self.pos:]
+
+    def expand(self):
+        """
+        Calls step for every position of axis.
+
+        Returns:
+            A map from each key a ScanOutputOp can read to the list of its values at every
+            position of axis, or to the final value for the states.
+        """
+        if self.expanded is not None:
+            return self.expanded
+        length = self.axis.length
+        positions = reversed(range(length)) if self.reverse else range(length)
+        states = list(self.initial_states)
+        outputs = [[None] * length for _ in self.step_outputs]
+        entering = [[None] * length for _ in states]
+        for t in positions:
+            for values, state in zip(entering, states):
+                values[t] = state
+            step_outputs, states = self.step(
+                [slice_along_axis(x, self.axis, t) for x in self.sequences], states)
+            for values, output in zip(outputs, step_outputs):
+                values[t] = output
+        self.expanded = dict()
+        for index, values in enumerate(outputs):
+            self.expanded[('output', index)] = values
+        for index, values in enumerate(entering):
+            self.expanded[('entering', index)] = values
+        for index, state in enumerate(states):
+            self.expanded[('state', index)] = state
+        return self.expanded
+
+    def expanded_value(self, key):
+        """
+        Returns:
+            The op computing the value of ScanOutputOp(self, key) from the expanded loop.
+        """
+        value = self.expand()[key]
+        axes = self.value_axes(key)
+        if key[0] == 'state':
+            return axes_with_order(value, axes)
+        step_axes = axes - self.axis
+        return stack([axes_with_order(x, step_axes) for x in value], self.axis, pos=self.pos)
+
+    def add_output_delta(self, adjoints, key, delta):
+        """
+        Adds delta to the adjoint of the value read by ScanOutputOp(self, key).
+        """
+        deltas = adjoints.setdefault(self, dict())
+        if key in deltas:
+            deltas[key] = deltas[key] + delta
+        else:
+            deltas[key] = delta
+
+    def generate_adjoints(self, adjoints, deltas, *args):
+        """
+        Backpropagates with another scan in the opposite direction.
+
+        Each step of the backward scan computes the step again from the inputs and the
+        entering states, which are kept by the forward loop, and backpropagates through it.
+        Its states are the adjoints of the states, and the sums of the adjoints of the
+        captured tensors.
+        """
+        if any(key[0] == 'entering' for key in deltas):
+            raise NotImplementedError("Derivatives of the backward loop of a scan")
+        sequences = list(self.sequences)
+        initial_states = list(self.initial_states)
+        captured = [op for op in self.captured if not op.is_constant]
+        entering = [ScanOutputOp(self, ('entering', i)) for i in range(len(initial_states))]
+        output_deltas = [(i, deltas[('output', i)]) for i in range(len(self.step_outputs))
+                         if ('output', i) in deltas]
+        state_deltas = [deltas.get(('state', i), constant(0, axes=state.axes))
+                        for i, state in enumerate(initial_states)]
+
+        num_sequences = len(sequences)
+        num_states = len(initial_states)
+
+        def backward_step(inputs, states):
+            xs = inputs[:num_sequences]
+            entering_states = inputs[num_sequences:num_sequences + num_states]
+            output_steps = inputs[num_sequences + num_states:]
+            carried = states[:num_states]
+            sums = states[num_states:]
+            with Op.all_ops() as body_ops:
+                outputs, results = self.step(xs, entering_states)
+            step_deltas = list(zip(results, carried))
+            step_deltas.extend((outputs[i], delta)
+                               for (i, _), delta in zip(output_deltas, output_steps))
+            step_adjoint = step_adjoints(body_ops, step_deltas)
+            return ([adjoint_of(step_adjoint, x) for x in xs],
+                    [adjoint_of(step_adjoint, state) for state in entering_states]
+                    + [total + adjoint_of(step_adjoint, op)
+                       for total, op in zip(sums, captured)])
+
+        sequence_deltas, final_deltas = scan(
+            backward_step,
+            sequences + entering + [delta for _, delta in output_deltas],
+            state_deltas + [constant(0, axes=op.axes) for op in captured],
+            self.axis, reverse=not self.reverse, pos=self.pos)
+
+        for x, delta in zip(args, sequence_deltas):
+            x.generate_add_delta(adjoints, delta)
+        for x, delta in zip(args[num_sequences:], final_deltas[:num_states]):
+            x.generate_add_delta(adjoints, delta)
+        for op, delta in zip(captured, final_deltas[num_states:]):
+            op.generate_add_delta(adjoints, delta)
+
+
+class ScanOutputOp(TensorOp):
+    """
+    A value computed by a ScanOp.
+
+    Arguments:
+        scan (ScanOp): The loop.
+        key: ('output', i) for the stacked output i of the step, ('state', i) for the final
+            value of state i, or ('entering', i) for the stacked values of state i before
+            each step.
+    """
+
+    def __init__(self, scan, key, **kwargs):
+        super(ScanOutputOp, self).__init__(args=(scan,), axes=scan.value_axes(key), **kwargs)
+        self.key = key
+
+    def copy_with_new_args(self, args):
+        return type(self)(args[0], self.key)
+
+    def generate_adjoints(self, adjoints, delta, scan):
+        scan.add_output_delta(adjoints, self.key, delta)
@@ -24,6 +24,7 @@ from builtins import object
 from future.utils import with_metaclass
 
 from neon.op_graph.op_graph import Op, computation
+from neon.transformers.passes.passmanager import PassManager
 from neon.util.names import NameableValue
 from orderedset import OrderedSet
 
@@ -297,11 +298,13 @@ class Transformer(with_metaclass(Transformer_ABC_Meta, object)):
         initialized (bool): True when variables have been initialized/restored.
         fusion (bool): True when fusion was enabled.
         device_buffers (set): Set of handles for storage allocations.
+        pass_manager (PassManager): Runs the registered graph passes and records their cost.
     """
 
     def __init__(self, **kwargs):
         super(Transformer, self).__init__(**kwargs)
         self.graph_passes = []
+        self.pass_manager = PassManager()
         self.byte_alignment = 4
 
     @abc.abstractproperty
@@ -375,20 +378,6 @@ class Transformer(with_metaclass(Transformer_ABC_Meta, object)):
         """
         raise NotImplementedError("Layout methods not implemented in this transformer")
 
-    def get_layout_cost_function(self, op):
-        """
-        Returns a UnaryLayoutConstraint which computes the cost of an op given an
-        assigned data layout for that op.
-
-        Arguments:
-            op: graph op to get cost function for
-
-        Returns:
-            An object that inherits from UnaryLayoutConstraint and can be used to
-            calculate the layout assignment cost.
-        """
-        raise NotImplementedError("Layout methods not implemented in this transformer")
-
     def get_layout_change_cost_function(self, op, arg):
         """
         Returns a BinaryLayoutConstraint which computes the cost of a layout change
@@ -467,6 +456,14 @@ class Transformer(with_metaclass(Transformer_ABC_Meta, object)):
         else:
             self.graph_passes.append(graph_pass)
 
+    def pass_report(self):
+        """
+        Returns:
+            A printable table with the wall time, op counts and replacements of every
+            graph pass run so far.
+        """
+        return self.pass_manager.report()
+
     def close(self):
         pass
 
@@ -492,9 +489,7 @@ class ComputationGraphTransformer(Transformer):
         self.initialized = False
 
     def run_registered_graph_passes(self, ops, **kwargs):
-        for graph_pass in self.graph_passes:
-            graph_pass.wrapped_do_pass(ops=ops, **kwargs)
-        return ops
+        return self.pass_manager.run_passes(self.graph_passes, ops, **kwargs)
 
     def initialize_allocations(self):
         """
@@ -0,0 +1,173 @@
+# ******************************************************************************
+# Copyright 2017-2018 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ******************************************************************************
+from collections import defaultdict
+
+from neon.op_graph.axes import make_axes, slice_axis
+from neon.op_graph.op_graph import Op, Add, BroadcastOp, ExpandDims, MapRolesOp, ReorderAxes, \
+    TensorSliceOp
+from neon.op_graph.convolution import ConvDerivOp, ConvolutionOp, DeconvolutionOp
+from neon.op_graph.relu import ReluOp, ReluBpropOp
+from neon.transformers.passes.passes import PeepholeGraphPass
+from neon.util.generics import generic_method
+
+
+def broadcast_source(op):
+    """
+    Returns:
+        The tensor op broadcasts or reorders, or op itself.
+    """
+    while isinstance(op, (BroadcastOp, ExpandDims, ReorderAxes)):
+        op = op.args[0]
+    return op
+
+
+class ConvolutionFusion(PeepholeGraphPass):
+    """
+    Rewrites the bias and ReLU following a convolution into the form the backend fuses into a
+    single convolution node.
+
+    Add(conv, broadcast(bias)) becomes ConvolutionOp(inputs, filters, bias), whose lowering
+    emits the bias add next to the convolution. The derivatives of conv then wait for the
+    fused convolution, so conv itself is dropped from the graph.
+
+    ReluBpropOp(x, delta) reads the output of ReluOp(x) instead of x when both are computed,
+    since they are positive at the same elements. The ReluOp is then the only consumer of the
+    convolution, so the backend can fuse convolution, bias and ReLU when training as well.
+
+    A TensorSliceOp trimming the spatial axes of a deconvolution becomes a deconvolution with
+    more padding, which only computes the part of the output that is kept.
+    """
+
+    def __init__(self, **kwargs):
+        super(ConvolutionFusion, self).__init__(**kwargs)
+        self.users = defaultdict(set)
+        self.dependents = defaultdict(set)
+        self.relus = dict()
+
+    def cache_key(self):
+        return ()
+
+    def do_pass(self, ops, **kwargs):
+        self.users = defaultdict(set)
+        self.dependents = defaultdict(set)
+        self.relus = dict()
+        for op in Op.ordered_ops(ops):
+            for arg in op.args:
+                self.users[arg.forwarded].add(op)
+            for dep in op.control_deps:
+                self.dependents[dep.forwarded].add(op)
+        super(ConvolutionFusion, self).do_pass(ops=ops, **kwargs)
+
+    def fused_bias(self, op, x, bias):
+        """
+        Returns the convolution with bias that computes op = x + bias, or None.
+        """
+        conv = x.args[0] if isinstance(x, MapRolesOp) else x
+        if not isinstance(conv, ConvolutionOp) or len(conv.args) != 2:
+            return None
+        if len(self.users[conv]) != 1 or len(self.users[x]) != 1:
+            return None
+        bias = broadcast_source(bias)
+        channel_axis = x.axes[1]
+        if len(bias.axes) != 1 or bias.axes[0] != channel_axis:
+            return None
+
+        inputs, filters = conv.args
+        fused_conv = ConvolutionOp(conv.conv_params, inputs, filters, bias, axes=conv.axes)
+        fused_conv.metadata.update(conv.metadata)
+        fused = fused_conv
+        if isinstance(x, MapRolesOp):
+            fused = MapRolesOp(fused, x.axes_map)
+        if fused.axes != op.axes:
+            return None
+        self.move_dependents(conv, fused_conv)
+        return fused
+
+    def move_dependents(self, conv, fused):
+        """
+        Makes the ops that wait for conv, such as its derivatives, wait for the fused
+        convolution instead, so that conv is no longer computed.
+        """
+        fused.has_side_effects = conv.has_side_effects
+        for op in self.dependents[conv]:
+            op.remove_control_dep(conv)
+            op.add_control_dep(fused)
+            if isinstance(op, ConvDerivOp) and op.fprop.forwarded is conv:
+                op.fprop = fused
+
+    def cropped_deconv(self, op, x):
+        """
+        Returns the deconvolution that computes the slice op of x, or None.
+        """
+        deconv = x.args[0] if isinstance(x, MapRolesOp) else x
+        if not isinstance(deconv, DeconvolutionOp) or deconv.has_side_effects:
+            # the derivatives of a deconvolution being trained read its full output
+            return None
+        if len(self.users[deconv]) != 1 or len(self.users[x]) != 1:
+            return None
+
+        conv_params = dict(deconv.conv_params)
+        spatial_names = 'dhw'[-(len(deconv.axes) - 2):]
+        axes = []
+        for index, (axis, s) in enumerate(zip(deconv.axes, op.slices)):
+            if s == slice(None, None, None):
+                axes.append(axis)
+                continue
+            if index < 2 or not isinstance(s, slice) or s.step not in (None, 1):
+                return None
+            start, stop, _ = s.indices(axis.length)
+            name = spatial_names[index - 2]
+            pad = conv_params['pad_' + name]
+            conv_params['pad_{}_below'.format(name)] = \
+                conv_params.get('pad_{}_below'.format(name), pad) + start
+            conv_params['pad_{}_above'.format(name)] = \
+                conv_params.get('pad_{}_above'.format(name), pad) + axis.length - stop
+            axes.append(slice_axis(axis, s))
+
+        cropped = DeconvolutionOp(conv_params, *deconv.args, axes=make_axes(axes))
+        cropped.metadata.update(deconv.metadata)
+        if isinstance(x, MapRolesOp):
+            cropped = MapRolesOp(cropped, x.axes_map)
+        if cropped.axes != op.axes:
+            return None
+        return cropped
+
+    @generic_method(dispatch_base_type=Op)
+    def visit(self, op, *args):
+        pass
+
+    @visit.on_type(Add)
+    def visit(self, op, x, y):
+        fused = self.fused_bias(op, x, y) or self.fused_bias(op, y, x)
+        if fused is not None:
+            self.replace_op(op, fused)
+
+    @visit.on_type(ReluOp)
+    def visit(self, op, inputs):
+        if op.axes == inputs.axes:
+            self.relus[inputs] = op
+
+    @visit.on_type(ReluBpropOp)
+    def visit(self, op, inputs, delta):
+        relu = self.relus.get(inputs)
+        if relu is not None:
+            self.replace_op(op, ReluBpropOp(relu, delta, axes=op.axes))
+
+    @visit.on_type(TensorSliceOp)
+    def visit(self, op, x):
+        cropped = self.cropped_deconv(op, x)
+        if cropped is not None:
+            self.replace_op(op, cropped)
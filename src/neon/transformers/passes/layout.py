@@ -0,0 +1,443 @@
+# ******************************************************************************
+# Copyright 2017-2018 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ******************************************************************************
+from collections import defaultdict
+
+import numpy as np
+
+from orderedset import OrderedSet
+
+from neon.op_graph.axes import make_axes
+from neon.op_graph.op_graph import Op, DotOp, ElementWiseOp, MapRolesOp, ReorderAxes, \
+    ReductionOp, StopGradient, TensorOp, axes_with_order, dot
+from neon.op_graph.relu import ReluOp, ReluBpropOp
+from neon.transformers.passes.passes import GraphBuildingPass
+from neon.util.generics import generic_method
+
+
+def tensor_bytes(op):
+    """
+    Returns:
+        The number of bytes in the value of op.
+    """
+    return int(np.prod(op.axes.lengths)) * op.dtype.itemsize
+
+
+def dot_input_axes(x, y):
+    """
+    Axes orders the backend dot needs for its inputs.
+
+    The backend dot reduces the trailing axes of its first input with the leading axes of its
+    second input.
+
+    Arguments:
+        x: First argument of the dot.
+        y: Second argument of the dot.
+
+    Returns:
+        A tuple of the axes x and y must be reordered to.
+    """
+    reduction_axes = x.axes & y.axes
+    return (x.axes - reduction_axes) + reduction_axes, reduction_axes + (y.axes - reduction_axes)
+
+
+class LayoutAssignment(object):
+    """
+    A possible layout for the value of an op.
+
+    Arguments:
+        op: The op.
+        axes: The axes order of the value computed by the backend.
+    """
+
+    def __init__(self, op, axes, **kwargs):
+        super(LayoutAssignment, self).__init__(**kwargs)
+        self.op = op
+        self.axes = make_axes(axes)
+
+    def arg_axes(self, n):
+        """
+        Returns:
+            The axes order the op needs for its nth arg when computed in this layout, or None
+            if any order will do.
+        """
+        arg = self.op.args[n].forwarded
+        if self.axes == self.op.axes:
+            return arg.axes
+        # the arg axes are permuted like the axes of the op
+        order = [self.op.axes.index(axis) for axis in self.axes]
+        return make_axes([arg.axes[i] for i in order])
+
+    def __repr__(self):
+        return '{}({}, {})'.format(type(self).__name__, self.op.name, self.axes)
+
+
+class ReorderLayout(LayoutAssignment):
+    """
+    Layout of a ReorderAxes, which reads its arg for free when it is already in the order
+    of the ReorderAxes.
+    """
+
+    def __init__(self, op, **kwargs):
+        super(ReorderLayout, self).__init__(op, op.axes, **kwargs)
+
+    def arg_axes(self, n):
+        return self.axes
+
+
+class ReductionLayout(LayoutAssignment):
+    """
+    Layout of a reduction to at most one axis, which reads its arg in any order.
+    """
+
+    def __init__(self, op, **kwargs):
+        super(ReductionLayout, self).__init__(op, op.axes, **kwargs)
+
+    def arg_axes(self, n):
+        return None
+
+
+class DotLayout(LayoutAssignment):
+    """
+    Layout of a DotOp, which can be computed as dot(x, y) or as dot(y, x).
+
+    Arguments:
+        op (DotOp): The dot.
+        swapped (bool): Compute dot(y, x), whose axes are y_out_axes + x_out_axes.
+
+    Attributes:
+        input_axes: The axes orders the backend needs for x and y.
+    """
+
+    def __init__(self, op, swapped=False, **kwargs):
+        x, y = (arg.forwarded for arg in op.args)
+        if swapped:
+            y_axes, x_axes = dot_input_axes(y, x)
+            axes = op.y_out_axes + op.x_out_axes
+        else:
+            x_axes, y_axes = dot_input_axes(x, y)
+            axes = op.axes
+        super(DotLayout, self).__init__(op, axes, **kwargs)
+        self.swapped = swapped
+        self.input_axes = (x_axes, y_axes)
+
+    def arg_axes(self, n):
+        return self.input_axes[n]
+
+    def __repr__(self):
+        return 'DotLayout({}, swapped={})'.format(self.op.name, self.swapped)
+
+
+class BinaryLayoutConstraint(object):
+    """
+    Cost of an op reading an arg, given the layouts assigned to both.
+    """
+
+    def get_cost(self, arg_layout, op_layout):
+        """
+        Arguments:
+            arg_layout (LayoutAssignment): The layout assigned to the arg.
+            op_layout (LayoutAssignment): The layout assigned to the op.
+
+        Returns:
+            The cost, in bytes moved.
+        """
+        raise NotImplementedError()
+
+
+class TransposeConstraint(BinaryLayoutConstraint):
+    """
+    Bytes transposed for op to read arg: the whole arg, for each use of it by op, when the
+    layout of arg is not the order the layout of op needs.
+
+    Arguments:
+        op: The op reading arg.
+        arg: The arg.
+    """
+
+    def __init__(self, op, arg, **kwargs):
+        super(TransposeConstraint, self).__init__(**kwargs)
+        self.op = op
+        self.arg = arg
+        self.positions = [n for n, op_arg in enumerate(op.args) if op_arg.forwarded is arg]
+
+    def get_cost(self, arg_layout, op_layout):
+        needed = [op_layout.arg_axes(n) for n in self.positions]
+        return sum(tensor_bytes(self.arg) for axes in needed
+                   if axes is not None and axes != arg_layout.axes)
+
+
+def is_layout_transparent(op):
+    """
+    Returns:
+        True if op can be computed in any axes order, from args in the same order.
+    """
+    if not isinstance(op, (ElementWiseOp, ReluOp, ReluBpropOp, MapRolesOp)) or \
+            isinstance(op, StopGradient):
+        return False
+    if len(op.axes) < 2:
+        return False
+    args = [arg.forwarded for arg in op.args]
+    if isinstance(op, MapRolesOp):
+        return True
+    return all(arg.axes == op.axes for arg in args)
+
+
+def copy_with_layout(op, args, axes):
+    """
+    Returns:
+        A copy of the layout transparent op, reading args and computed in the order axes.
+    """
+    if isinstance(op, (ReluOp, ReluBpropOp)):
+        return type(op)(*args, axes=axes)
+    return op.copy_with_new_args(args)
+
+
+def get_layouts(op):
+    """
+    Returns:
+        The possible layouts of op, default first, or an empty list if op has no tensor value.
+    """
+    if not isinstance(op, TensorOp):
+        return []
+    if isinstance(op, DotOp):
+        return [DotLayout(op), DotLayout(op, swapped=True)]
+    if isinstance(op, ReorderAxes):
+        return [ReorderLayout(op)]
+    if isinstance(op, ReductionOp) and len(op.axes) <= 1:
+        return [ReductionLayout(op)]
+    if is_layout_transparent(op):
+        # the reversed order is the one a swapped two dimensional dot produces and reads
+        return [LayoutAssignment(op, op.axes),
+                LayoutAssignment(op, reversed(list(op.axes)))]
+    return [LayoutAssignment(op, op.axes)]
+
+
+def get_layout_change_cost_function(op, arg):
+    """
+    Returns:
+        The BinaryLayoutConstraint for op reading arg.
+    """
+    return TransposeConstraint(op, arg)
+
+
+class DotLayoutPass(GraphBuildingPass):
+    """
+    Assigns layouts to the ops of the graph to minimize the bytes transposed.
+
+    Each DotOp can be computed as dot(x, y) or as dot(y, x), and each elementwise op, ReLU
+    and role cast of two or more axes in its axes order or the reverse. Every other op has
+    its own axes order. An op pays for a transpose of each arg whose layout is not the order
+    it needs, and the results of the computation need their own axes order.
+
+    The layouts start at the default and are improved by moves until none lowers the total
+    cost. A move changes the layout of one op, and then propagates: each neighbour, arg or
+    user, whose own cost is lowered by changing its layout in turn is changed too. So a dot
+    computed as dot(y, x) carries its order through the elementwise ops after it to the next
+    dot, instead of being transposed back in between. The costs are given by the layout
+    hooks of the transformer.
+
+    An op assigned a layout other than its default is rebuilt in that layout. Its users
+    that have a choice of layout read the rebuilt op, and the others read it through a
+    ReorderAxes back to its axes. ReorderAxes of ReorderAxes are folded, so a ReorderAxes
+    to the order of the layout reads the rebuilt op directly.
+
+    Arguments:
+        transformer: Transformer providing get_layouts and get_layout_change_cost_function.
+    """
+
+    def __init__(self, transformer, **kwargs):
+        super(DotLayoutPass, self).__init__(**kwargs)
+        self.transformer = transformer
+        self.layouts = dict()
+        self.assignment = dict()
+        self.constraints = dict()
+        self.users = defaultdict(list)
+        self.results = set()
+        self.laid_out = dict()
+
+    def do_pass(self, ops, **kwargs):
+        ops = list(ops)
+        self.results = set(op.forwarded for op in ops)
+        graph = Op.ordered_ops(self.results)
+        self.layouts = dict()
+        for op in graph:
+            layouts = self.transformer.get_layouts(op)
+            if layouts:
+                self.layouts[op] = layouts
+        self.assignment = {op: layouts[0] for op, layouts in self.layouts.items()}
+        self.constraints = dict()
+        self.users = defaultdict(list)
+        for op in self.layouts:
+            for arg in self.layout_args(op):
+                self.users[arg].append(op)
+                self.constraints[op, arg] = \
+                    self.transformer.get_layout_change_cost_function(op, arg)
+        self.assign_layouts([op for op in self.layouts if len(self.layouts[op]) > 1])
+        self.laid_out = dict()
+        super(DotLayoutPass, self).do_pass(ops=ops, **kwargs)
+
+    def layout_args(self, op):
+        """
+        Returns:
+            The distinct args of op that have layouts.
+        """
+        return OrderedSet(arg.forwarded for arg in op.args if arg.forwarded in self.layouts)
+
+    def read_cost(self, op):
+        """
+        Returns:
+            The bytes transposed for op to read its args, and to return it if it is a result.
+        """
+        layout = self.assignment[op]
+        cost = sum(self.constraints[op, arg].get_cost(self.assignment[arg], layout)
+                   for arg in self.layout_args(op))
+        if op in self.results and layout.axes != op.axes:
+            cost += tensor_bytes(op)
+        return cost
+
+    def local_cost(self, op, layout):
+        """
+        Returns:
+            The bytes transposed around op, for its args and its users, in layout.
+        """
+        current = self.assignment[op]
+        self.assignment[op] = layout
+        cost = self.read_cost(op) + sum(
+            self.constraints[user, op].get_cost(layout, self.assignment[user])
+            for user in self.users[op])
+        self.assignment[op] = current
+        return cost
+
+    def total_cost(self, ops):
+        """
+        Returns:
+            The bytes transposed around ops.
+        """
+        affected = set(ops)
+        for op in ops:
+            affected.update(self.users[op])
+        return sum(self.read_cost(op) for op in affected)
+
+    def propagate(self, op, layout):
+        """
+        Assigns layout to op, then changes the layout of each neighbour whose own cost it
+        lowers, and so on.
+
+        Returns:
+            A dict from the changed ops to their previous layouts.
+        """
+        previous = {op: self.assignment[op]}
+        self.assignment[op] = layout
+        frontier = [op]
+        while frontier:
+            op = frontier.pop()
+            for neighbour in list(self.layout_args(op)) + self.users[op]:
+                layouts = self.layouts[neighbour]
+                if neighbour in previous or len(layouts) < 2:
+                    continue
+                current = self.assignment[neighbour]
+                best = min(layouts, key=lambda l: self.local_cost(neighbour, l))
+                if self.local_cost(neighbour, best) < self.local_cost(neighbour, current):
+                    previous[neighbour] = current
+                    self.assignment[neighbour] = best
+                    frontier.append(neighbour)
+        return previous
+
+    def assign_layouts(self, ops):
+        """
+        Improves the layouts of ops by moves until none lowers the cost.
+        """
+        improved = True
+        while improved:
+            improved = False
+            for op in ops:
+                for layout in self.layouts[op]:
+                    if layout is self.assignment[op]:
+                        continue
+                    previous = self.propagate(op, layout)
+                    cost = self.total_cost(previous)
+                    changed = {changed_op: self.assignment[changed_op]
+                               for changed_op in previous}
+                    self.assignment.update(previous)
+                    if cost < self.total_cost(previous):
+                        self.assignment.update(changed)
+                        improved = True
+
+    def laid_out_arg(self, arg, axes):
+        """
+        Returns:
+            arg, as rebuilt in its layout, in the order axes.
+        """
+        arg = self.laid_out.get(arg, arg)
+        return axes_with_order(arg, axes)
+
+    @generic_method(dispatch_base_type=Op)
+    def visit(self, op, *args):
+        pass
+
+    @visit.on_type(DotOp)
+    def visit(self, op, x, y):
+        layout = self.assignment.get(op)
+        if layout is None:
+            return
+        if not layout.swapped and x not in self.laid_out and y not in self.laid_out:
+            return
+        x, y = (self.laid_out_arg(arg, axes) for arg, axes in zip((x, y), layout.input_axes))
+        if layout.swapped:
+            self.laid_out[op] = dot(y, x)
+            self.replace_op(op, axes_with_order(self.laid_out[op], op.axes))
+        else:
+            self.replace_op(op, dot(x, y))
+
+    @visit.on_type(ElementWiseOp)
+    def visit(self, op, *args):
+        self.visit_transparent(op, args)
+
+    @visit.on_type(ReluOp)
+    def visit(self, op, *args):
+        self.visit_transparent(op, args)
+
+    @visit.on_type(ReluBpropOp)
+    def visit(self, op, *args):
+        self.visit_transparent(op, args)
+
+    @visit.on_type(MapRolesOp)
+    def visit(self, op, *args):
+        self.visit_transparent(op, args)
+
+    def visit_transparent(self, op, args):
+        layout = self.assignment.get(op)
+        if layout is None or len(self.layouts[op]) < 2:
+            return
+        if layout.axes == op.axes and not any(arg in self.laid_out for arg in args):
+            return
+        args = [self.laid_out_arg(arg, layout.arg_axes(n)) for n, arg in enumerate(args)]
+        new_op = copy_with_layout(op, args, layout.axes)
+        if layout.axes == op.axes:
+            self.replace_op(op, new_op)
+        else:
+            self.laid_out[op] = new_op
+            self.replace_op(op, axes_with_order(new_op, op.axes))
+
+    @visit.on_type(ReductionOp)
+    def visit(self, op, x):
+        if x in self.laid_out and isinstance(self.assignment.get(op), ReductionLayout):
+            self.replace_op(op, op.copy_with_new_args([self.laid_out[x]]))
+
+    @visit.on_type(ReorderAxes)
+    def visit(self, op, x):
+        if isinstance(x, ReorderAxes):
+            self.replace_op(op, axes_with_order(x.args[0], op.axes))
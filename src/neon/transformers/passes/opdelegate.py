@@ -15,7 +15,8 @@
 # ******************************************************************************
 import abc
 from future.utils import with_metaclass
-from collections import Iterable
+from collections import Iterable, defaultdict
+from orderedset import OrderedSet
 
 from neon.op_graph.op_graph import SequentialOp, TensorValueOp, Op
 
@@ -31,6 +32,7 @@ class OpAccessor(with_metaclass(abc.ABCMeta, object)):
     def __init__(self, **kwargs):
         self.replacement_list = []
         self.replacements = dict()
+        self.replacement_count = 0
 
     @abc.abstractmethod
     def op_arg(self, op, n):
@@ -124,6 +126,7 @@ class OpAccessor(with_metaclass(abc.ABCMeta, object)):
         for op, replacement in self.replacement_list:
             self.perform_replace_op(op, replacement)
             self.replacements[op] = replacement
+        self.replacement_count += len(self.replacement_list)
         return len(self.replacement_list) > 0
 
     def get_replacement(self, op):
@@ -197,19 +200,86 @@ class OpGraphOpAccessor(OpAccessor):
         return None
 
     def run_pass(self, process_op, ops, **kwargs):
+        """
+        Runs process_op on ops until no more replacements are made.
+
+        The first batch visits every op in execution order. Later batches only revisit the
+        consumers of the ops replaced in the previous batch and the ops added by the
+        replacements, so a pass converges in time proportional to the work it does rather
+        than to the number of batches times the size of the graph.
+        """
         assert isinstance(ops, Iterable), "Ops passed into do_pass must be an iterable"
-        has_work = True
-        while has_work:
+        ops = Op.ordered_ops(op.forwarded for op in ops)
+        known_ops = set(ops)
+        users = defaultdict(OrderedSet)
+        while ops:
             self.begin_batch()
 
-            # pass through the ops in an execution order collecting things to do
-            ops = Op.ordered_ops(op.forwarded for op in ops)
             for op in ops:
+                if op.forward is not None:
+                    continue
                 op.update_forwards()
+                for dep in op.all_deps:
+                    users[dep].add(op)
                 process_op(op)
 
-            has_work = self.end_batch()
-            ops = list(op.forwarded for op in ops)
+            replacement_list = self.replacement_list
+            if not self.end_batch():
+                break
+
+            # Only the consumers of replaced ops and the new ops need another visit
+            dirty_ops = OrderedSet()
+            for op, replacement in replacement_list:
+                dirty_ops.update(users.pop(op, ()))
+                dirty_ops.update(self._new_ops(replacement.forwarded, known_ops))
+            ops = self._ordered_subset(dirty_ops)
+
+    @staticmethod
+    def _new_ops(root, known_ops):
+        """
+        Returns the ops reachable from root that have not been seen before, adding them to
+        known_ops.
+        """
+        new_ops = []
+        frontier = [root]
+        while frontier:
+            op = frontier.pop()
+            if op in known_ops:
+                continue
+            known_ops.add(op)
+            new_ops.append(op)
+            frontier.extend(dep.forwarded for dep in op.all_deps)
+        return new_ops
+
+    @staticmethod
+    def _ordered_subset(ops):
+        """
+        Topologically sorts ops, only following dependencies that are themselves in ops.
+        """
+        ops = OrderedSet(op.forwarded for op in ops if op.forwarded is op)
+        ordered_ops = []
+        done = set()
+        pending = set()
+        for root in ops:
+            stack = [(root, False)]
+            while stack:
+                op, expanded = stack.pop()
+                if op in done:
+                    continue
+                if expanded:
+                    pending.discard(op)
+                    done.add(op)
+                    ordered_ops.append(op)
+                    continue
+                if op in pending:
+                    raise ValueError("Graph not a DAG")
+                pending.add(op)
+                stack.append((op, True))
+                for dep in op.all_deps:
+                    dep = dep.forwarded
+                    if dep in ops and dep not in done:
+                        stack.append((dep, False))
+        return ordered_ops
 
     def perform_replace_op(self, op, replacement):
         op.forwarded.replace_self(replacement.forwarded)
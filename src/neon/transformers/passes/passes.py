@@ -15,10 +15,12 @@
 # ******************************************************************************
 import abc
 import itertools
+from collections import OrderedDict
 
 from future.utils import with_metaclass
 
 from neon.op_graph.axes import make_axis
+from neon.op_graph.op_graph import Op
 from neon.transformers.passes.opdelegate import DelegateOpAccessor
 from neon.util.generics import generic_method
 
@@ -34,6 +36,17 @@ class GraphPass(with_metaclass(abc.ABCMeta, DelegateOpAccessor)):
     def do_pass(self, **kwargs):
         pass
 
+    def cache_key(self):
+        """
+        Lets the PassManager skip this pass on graphs that a pass of the same type and cache
+        key has already processed.
+
+        Returns:
+            A hashable value covering the configuration of the pass, or None if the pass must
+            run every time, e.g. because it builds state outside of the graph.
+        """
+        return None
+
 
 class ProcessOpGraphPass(GraphPass):
 
@@ -58,6 +71,26 @@ class GraphBuildingPass(ProcessOpGraphPass):
     def process_op(self, op):
         self.visit(op, *self.op_args(op))
 
+    def unhandled_op_types(self, ops):
+        """
+        Finds the ops that only the default method of visit would handle.
+
+        Arguments:
+            ops: Ops whose graph the pass would visit.
+
+        Returns:
+            An OrderedDict from the name of each such op class, in execution order, to the
+            number of its ops.
+        """
+        type_methods = type(self).visit.type_methods
+        default = type_methods.methods[type_methods.dispatch_base_type][0]
+        counts = OrderedDict()
+        for op in Op.ordered_ops(op.forwarded for op in ops):
+            if op.forward is None and type_methods.get_handler(type(op)) is default:
+                name = type(op).__name__
+                counts[name] = counts.get(name, 0) + 1
+        return counts
+
 
 class PeepholeGraphPass(GraphBuildingPass):
     """
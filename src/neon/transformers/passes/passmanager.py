@@ -0,0 +1,159 @@
+# ******************************************************************************
+# Copyright 2017-2018 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ******************************************************************************
+import collections
+import hashlib
+import logging
+import os
+from timeit import default_timer
+
+from neon.op_graph.op_graph import Op
+from neon.util.trace_events import TraceEventTracker, is_tracing_enabled
+
+logger = logging.getLogger(__name__)
+
+
+PassRecord = collections.namedtuple('PassRecord', ['name', 'time', 'ops_before', 'ops_after',
+                                                   'replacements', 'skipped'])
+
+
+def graph_fingerprint(ops):
+    """
+    Computes a fingerprint of the subgraph reachable from ops.
+
+    The fingerprint covers the identity of every op and of its dependencies, so it changes
+    whenever an op is replaced or rewired.
+
+    Arguments:
+        ops: Root ops of the subgraph.
+
+    Returns:
+        A tuple of (fingerprint string, number of ops in the subgraph).
+    """
+    digest = hashlib.sha1()
+    ordered_ops = Op.ordered_ops(ops)
+    for op in ordered_ops:
+        digest.update(op.uuid.bytes)
+        for dep in op.all_deps:
+            digest.update(dep.forwarded.uuid.bytes)
+    return digest.hexdigest(), len(ordered_ops)
+
+
+class PassManager(object):
+    """
+    Runs graph passes, recording wall time, op counts and replacements for each pass.
+
+    A pass whose cache_key() is not None is skipped on a subgraph whose fingerprint a pass of
+    the same type and cache key has already processed, since running it again on an unchanged
+    graph would not do anything. Only those passes pay for fingerprinting the graph; the other
+    passes, such as the ones that build backend state, always run.
+
+    Arguments:
+        enable_cache (bool): Skip cacheable passes on subgraphs they have already processed.
+        name (str): Name used for the trace event file.
+
+    Attributes:
+        records (list of PassRecord): One record per pass run, in execution order.
+        tracker (TraceEventTracker): Trace events for every pass run.
+    """
+
+    def __init__(self, enable_cache=True, name='graph_passes', **kwargs):
+        super(PassManager, self).__init__(**kwargs)
+        self.enable_cache = enable_cache
+        self.records = []
+        self.processed = collections.defaultdict(set)
+        self.tracker = TraceEventTracker(name)
+
+    def run_passes(self, graph_passes, ops, **kwargs):
+        """
+        Runs each of graph_passes on ops in order.
+
+        Arguments:
+            graph_passes: The passes to run.
+            ops: Root ops of the graph.
+            **kwargs: Args passed on to each pass.
+
+        Returns:
+            ops
+        """
+        for graph_pass in graph_passes:
+            self.run_pass(graph_pass, ops, **kwargs)
+        if is_tracing_enabled():
+            self.tracker.serialize_to_file()
+        return ops
+
+    def run_pass(self, graph_pass, ops, **kwargs):
+        """
+        Runs graph_pass on ops, unless it has already processed this subgraph.
+
+        Arguments:
+            graph_pass: The pass to run.
+            ops: Root ops of the graph.
+            **kwargs: Args passed on to the pass.
+
+        Returns:
+            The PassRecord for this run.
+        """
+        name = type(graph_pass).__name__
+        cache_key = graph_pass.cache_key() if self.enable_cache else None
+        if cache_key is not None:
+            cache_key = (type(graph_pass), cache_key)
+            fingerprint, ops_before = graph_fingerprint(ops)
+            if fingerprint in self.processed[cache_key]:
+                logger.debug("Skipping %s on already processed graph %s", name, fingerprint)
+                record = PassRecord(name, 0.0, ops_before, ops_before, 0, True)
+                self.records.append(record)
+                return record
+        else:
+            ops_before = len(Op.ordered_ops(ops))
+
+        op_accessor = kwargs.get('op_accessor') or getattr(graph_pass, 'op_accessor', None)
+        replacements_before = getattr(op_accessor, 'replacement_count', 0)
+
+        start = default_timer()
+        graph_pass.wrapped_do_pass(ops=ops, **kwargs)
+        elapsed = default_timer() - start
+
+        replacements = getattr(op_accessor, 'replacement_count', 0) - replacements_before
+        if cache_key is not None:
+            fingerprint, ops_after = graph_fingerprint(ops)
+            self.processed[cache_key].add(fingerprint)
+        else:
+            ops_after = len(Op.ordered_ops(ops))
+
+        record = PassRecord(name, elapsed, ops_before, ops_after, replacements, False)
+        self.records.append(record)
+        self.tracker.add_operation('graph_pass', name, os.getpid(), 0,
+                                   start * 1e6, elapsed * 1e6,
+                                   dict(ops_before=ops_before,
+                                        ops_after=ops_after,
+                                        replacements=replacements))
+        logger.debug("%s took %.6fs, ops %d -> %d, %d replacements",
+                     name, elapsed, ops_before, ops_after, replacements)
+        return record
+
+    def report(self):
+        """
+        Returns:
+            A printable table with one row per pass run, followed by the total time.
+        """
+        lines = ['{:<40} {:>10} {:>11} {:>10} {:>13}'.format(
+            'Pass', 'Time (s)', 'Ops before', 'Ops after', 'Replacements')]
+        for record in self.records:
+            time = 'skipped' if record.skipped else '{:.6f}'.format(record.time)
+            lines.append('{:<40} {:>10} {:>11} {:>10} {:>13}'.format(
+                record.name, time, record.ops_before, record.ops_after, record.replacements))
+        lines.append('Total time: {:.6f}s'.format(sum(record.time for record in self.records)))
+        return '\n'.join(lines)
@@ -17,18 +17,23 @@
 from __future__ import division
 from neon.transformers.passes.passes import PeepholeGraphPass
 from neon.util.generics import generic_method
-from neon.op_graph.op_graph import Op, Add, AssignableTensorOp, AssignOp, AxesCastOp, \
-    BroadcastOp, ContiguousOp, Divide, DotOp, Equal, ExpandDims, ExpOp, Flatten, Greater, \
-    GreaterEqual, Less, LogOp, MapRolesOp, Max, Maximum, Minimum, Multiply, NegativeOp, \
-    NotEqual, OneHotOp, ParallelOp, Prod, ReciprocalOp, ReductionOp, ReorderAxes, \
-    SequentialOp, SqrtOp, SquareOp, Subtract, Sum, TensorSliceOp, TensorSizeOp, TensorValueOp, \
-    Unflatten, Fill
+from neon.op_graph.op_graph import Op, AbsoluteOp, Add, Argmax, Argmin, AssignableTensorOp, \
+    AssignOp, AxesCastOp, BroadcastOp, ContiguousOp, CosOp, Divide, DotOp, Equal, ExpandDims, \
+    ExpOp, Flatten, FloorDivide, Greater, GreaterEqual, Less, LessEqual, LogOp, MapRolesOp, Max, \
+    Maximum, Min, Minimum, Mod, Multiply, NegativeOp, NotEqual, OneHotOp, ParallelOp, Power, \
+    Prod, ReciprocalOp, ReductionOp, ReorderAxes, RngOp, SequentialOp, SigmoidAtomicOp, SignOp, \
+    SinOp, SqrtOp, SquareOp, Subtract, Sum, TanhOp, TensorSliceOp, TensorSizeOp, \
+    TensorValueOp, Unflatten, Fill
 from neon.op_graph.batchnorm import BatchnormCommonOp, BatchnormBpropCommonOp, \
     BatchnormOutputOp, BatchnormMeanOp, BatchnormVarOp, \
     BatchnormBpropDataOp, BatchnormBpropGammaOp, BatchnormBpropBetaOp
 from neon.op_graph.relu import ReluOp, ReluBpropOp
 from neon.op_graph.pooling import PoolingOp, BpropPoolOp
-from neon.op_graph.convolution import ConvolutionOp, bprop_conv, update_conv
+from neon.op_graph.convolution import ConvolutionOp, DeconvolutionOp, DeconvDerivOp, \
+    bprop_conv, update_conv
+from neon.op_graph.lookuptable import LookupTableOp, scatter_add_lut, update_lut
+from neon.transformers.passes.layout import dot_input_axes
+from neon.util.philox import MANTISSA_BITS, UINT32, philox_rounds, stream_key
 import numpy as np
 
 from ngraph.impl import Type
@@ -39,32 +44,43 @@ from ngraph.impl import Strides
 from ngraph.impl import CoordinateDiff
 from ngraph.impl import Coordinate
 from ngraph.impl.op import Parameter
+from ngraph.impl.op import Abs as PyngAbs
 from ngraph.impl.op import AvgPool as PyngAvgPool
 from ngraph.impl.op import AvgPoolBackprop as PyngAvgPoolBackprop
 from ngraph.impl.op import Broadcast as PyngBroadcast
 from ngraph.impl.op import Constant
 from ngraph.impl.op import Convert as PyngConvert
 from ngraph.impl.op import Convolution as PyngConvolution
+from ngraph.impl.op import Cos as PyngCos
 from ngraph.impl.op import ConvolutionBackpropData as PyngConvolutionBackpropData
 from ngraph.impl.op import ConvolutionBackpropFilters as PyngConvolutionBackpropFilters
 from ngraph.impl.op import Dot as PyngDot
 from ngraph.impl.op import Equal as PyngEqual
 from ngraph.impl.op import Exp as PyngExp
+from ngraph.impl.op import Floor as PyngFloor
+from ngraph.impl.op import Gather as PyngGather
 from ngraph.impl.op import Greater as PyngGreater
 from ngraph.impl.op import GreaterEq as PyngGreaterEq
 from ngraph.impl.op import Less as PyngLess
+from ngraph.impl.op import LessEq as PyngLessEq
 from ngraph.impl.op import Log as PyngLog
 from ngraph.impl.op import Maximum as PyngMaximum
 from ngraph.impl.op import MaxPool as PyngMaxPool
 from ngraph.impl.op import MaxPoolBackprop as PyngMaxPoolBackprop
+from ngraph.impl.op import Min as PyngMin
 from ngraph.impl.op import Minimum as PyngMinimum
 from ngraph.impl.op import Negative as PyngNegative
 from ngraph.impl.op import NotEqual as PyngNotEqual
 from ngraph.impl.op import OneHot as PyngOneHot
+from ngraph.impl.op import Power as PyngPower
 from ngraph.impl.op import Reshape as PyngReshape
+from ngraph.impl.op import ScatterAdd as PyngScatterAdd
+from ngraph.impl.op import Sign as PyngSign
+from ngraph.impl.op import Sin as PyngSin
 from ngraph.impl.op import Slice as PyngSlice
 from ngraph.impl.op import Sqrt as PyngSqrt
 from ngraph.impl.op import Sum as PyngSum
+from ngraph.impl.op import Tanh as PyngTanh
 from ngraph.impl.op import BatchNorm as PyngBatchNorm
 from ngraph.impl.op import BatchNormBackprop as PyngBatchNormBackprop
 from ngraph.impl.op import GetOutputElement as PyngGetOutputElement
@@ -74,6 +90,18 @@ from ngraph.impl.op import Relu as PyngRelu
 from ngraph.impl.op import ReluBackprop as PyngReluBackprop
 
 
+def element_type(dtype):
+    """
+    Returns the backend element type of values of the numpy dtype.
+    """
+    element_types = {np.dtype(np.float32): Type.f32, np.dtype(np.float64): Type.f64,
+                     np.dtype(np.int8): Type.i8, np.dtype(np.int16): Type.i16,
+                     np.dtype(np.int32): Type.i32, np.dtype(np.int64): Type.i64,
+                     np.dtype(np.uint8): Type.u8, np.dtype(np.uint16): Type.u16,
+                     np.dtype(np.uint32): Type.u32, np.dtype(np.uint64): Type.u64}
+    return element_types[np.dtype(dtype)]
+
+
 class PybindScopePass:
     """
     Graph pass mark Variable version scope
@@ -227,6 +255,162 @@ class PybindWrapperGenerator(PeepholeGraphPass):
 
         return reshape_axis_order
 
+    def conv_window(self, conv_params, spatial_dims):
+        """
+        Returns the strides, dilations, padding below, padding above and data dilations of a
+        convolution over spatial_dims spatial axes. conv_params may give asymmetric padding
+        with pad_<axis>_below and pad_<axis>_above.
+        """
+        names = 'dhw'[-spatial_dims:]
+        padding_below = [conv_params.get('pad_{}_below'.format(name), conv_params['pad_' + name])
+                         for name in names]
+        padding_above = [conv_params.get('pad_{}_above'.format(name), conv_params['pad_' + name])
+                         for name in names]
+        return (Strides([conv_params['str_' + name] for name in names]),
+                Strides([conv_params['dil_' + name] for name in names]),
+                CoordinateDiff(padding_below),
+                CoordinateDiff(padding_above),
+                Strides([1] * spatial_dims))
+
+    def deconv_filters_order(self, deconv, filters):
+        """
+        Returns the axis order that puts deconvolution filters in the (C, K, spatial) order of
+        the equivalent forward convolution, where C is the input channel axis of the
+        deconvolution and K its output channel axis.
+        """
+        channel_index = filters.axes.index(deconv.channel_axes)
+        return [channel_index] + [index for index in range(len(filters.axes))
+                                  if index != channel_index]
+
+    def deconv_filters(self, deconv, filters):
+        """
+        Returns the deconvolution filters in the order of the equivalent forward convolution.
+        """
+        axes_order = self.deconv_filters_order(deconv, filters)
+        ngraph_filters = self.computation.lookup_cpp_op(filters)
+        if axes_order == list(range(len(axes_order))):
+            return ngraph_filters
+        return PyngReshape(ngraph_filters,
+                           AxisVector(axes_order),
+                           Shape(self.get_shape_from_axes_order(axes_order,
+                                                                filters.axes.lengths)))
+
+    def lut_rows(self, op, delta, idx):
+        """
+        Returns the lookup indices of op as i32 and the delta of each lookup as rows of a
+        (V, F) table, in (index axes, F) order, with the rows read from pad_idx zeroed.
+        """
+        row_axes = idx.axes + op.axes[1 - op.lut_axis]
+        ngraph_idx = self.computation.lookup_cpp_op(idx)
+        ngraph_rows = self.computation.lookup_cpp_op(delta)
+        if delta.axes != row_axes:
+            ngraph_rows = PyngReshape(
+                ngraph_rows,
+                AxisVector(self.get_axes_order_from_axes_name(delta.axes.names,
+                                                              row_axes.names)),
+                Shape(list(row_axes.lengths)))
+        if op.pad_idx is not None:
+            idx_shape = list(idx.axes.lengths)
+            not_pad = PyngNotEqual(ngraph_idx,
+                                   self.broadcast_constant(float(op.pad_idx), Type.f32,
+                                                           idx_shape))
+            ngraph_rows = ngraph_rows * PyngBroadcast(PyngConvert(not_pad, Type.f32),
+                                                      Shape(list(row_axes.lengths)),
+                                                      AxisSet({len(idx_shape)}))
+        return PyngConvert(ngraph_idx, Type.i32), ngraph_rows
+
+    def lut_scatter_add(self, op, ngraph_lut, delta, idx):
+        """
+        Returns the table ngraph_lut with the delta of each lookup of op added to the row it
+        was read from. The scatter adds rows of a (V, F) table, so a (F, V) table is
+        transposed around it.
+        """
+        ngraph_idx, ngraph_rows = self.lut_rows(op, delta, idx)
+        if op.lut_axis == 0:
+            return PyngScatterAdd(ngraph_lut, ngraph_idx, ngraph_rows)
+        feature_length, vocab_length = op.axes.lengths
+        ngraph_lut = PyngReshape(ngraph_lut, AxisVector([1, 0]),
+                                 Shape([vocab_length, feature_length]))
+        return PyngReshape(PyngScatterAdd(ngraph_lut, ngraph_idx, ngraph_rows),
+                           AxisVector([1, 0]),
+                           Shape([feature_length, vocab_length]))
+
+    def broadcast_constant(self, value, element_type, shape):
+        """
+        Returns a tensor of the given shape filled with value.
+        """
+        return PyngBroadcast(Constant(element_type, Shape([]), [value]),
+                             Shape(shape),
+                             AxisSet(set(range(len(shape)))))
+
+    def element_index(self, shape):
+        """
+        Returns the row-major index of each element of a tensor of the given shape, as the sum
+        of the index along each axis times its stride.
+        """
+        index = self.broadcast_constant(0, Type.u32, shape)
+        stride = 1
+        for axis in reversed(range(len(shape))):
+            positions = Constant(Type.u32, Shape([shape[axis]]),
+                                 [i * stride for i in range(shape[axis])])
+            index = index + PyngBroadcast(positions, Shape(shape),
+                                          AxisSet(set(range(len(shape))) - {axis}))
+            stride *= shape[axis]
+        return index
+
+    def philox_words(self, op, key):
+        """
+        Returns the four random words of each element of op, computed by the Philox rounds
+        from the counter (element index, rng step of the computation, 0).
+        """
+        shape = list(op.axes.lengths)
+        all_axes = AxisSet(set(range(len(shape))))
+        # the backend has no bitwise ops, so the words are split into nibbles along a new
+        # axis and the exclusive or of three nibbles is read from a table
+        nibble_shape = shape + [8]
+        nibble_axis = AxisSet({len(shape)})
+        nibble_values = PyngBroadcast(Constant(Type.u32, Shape([8]), [16 ** i for i in range(8)]),
+                                      Shape(nibble_shape), all_axes)
+        sixteen = self.broadcast_constant(16, Type.u32, nibble_shape)
+        xor_table = Constant(Type.u32, Shape([16 ** 3]),
+                             [x ^ y ^ k for x in range(16) for y in range(16) for k in range(16)])
+
+        def nibbles(x):
+            x = PyngBroadcast(x, Shape(nibble_shape), nibble_axis) / nibble_values
+            return x - (x / sixteen) * sixteen
+
+        def xor(x, y, k):
+            k_nibbles = PyngBroadcast(Constant(Type.u32, Shape([8]),
+                                               [(k >> (4 * i)) & 15 for i in range(8)]),
+                                      Shape(nibble_shape), all_axes)
+            table_index = (nibbles(x) * sixteen + nibbles(y)) * sixteen + k_nibbles
+            xored = PyngGather(xor_table, PyngConvert(table_index, Type.i32), 0)
+            return PyngSum(xored * nibble_values, nibble_axis)
+
+        def mulhilo(m, x):
+            product = self.broadcast_constant(m, Type.u64, shape) * PyngConvert(x, Type.u64)
+            word_range = self.broadcast_constant(UINT32, Type.u64, shape)
+            hi = product / word_range
+            return PyngConvert(hi, Type.u32), PyngConvert(product - hi * word_range, Type.u32)
+
+        def step_word(i):
+            word = PyngSlice(self.computation.rng_step_op(), Coordinate([i]), Coordinate([i + 1]),
+                             Strides([1]))
+            return PyngBroadcast(PyngReshape(word, AxisVector([0]), Shape([])),
+                                 Shape(shape), all_axes)
+
+        counter = (self.element_index(shape), step_word(0), step_word(1),
+                   self.broadcast_constant(0, Type.u32, shape))
+        return philox_rounds(counter, key, mulhilo, xor)
+
+    def unit_float(self, x, shape):
+        """
+        Returns the top MANTISSA_BITS of the words x as values in [0, 1).
+        """
+        shift = self.broadcast_constant(1 << (32 - MANTISSA_BITS), Type.u32, shape)
+        scale = self.broadcast_constant(2.0 ** -MANTISSA_BITS, Type.f32, shape)
+        return PyngConvert(x / shift, Type.f32) * scale
+
     def binary_op(self, op, x, y, is_logical=False):
 
         def pyng_binary_op(op, x, y):
@@ -244,6 +428,8 @@ class PybindWrapperGenerator(PeepholeGraphPass):
                 return PyngGreaterEq(x, y)
             elif isinstance(op, Less):
                 return PyngLess(x, y)
+            elif isinstance(op, LessEqual):
+                return PyngLessEq(x, y)
             elif isinstance(op, Equal):
                 return PyngEqual(x, y)
             elif isinstance(op, NotEqual):
@@ -252,6 +438,13 @@ class PybindWrapperGenerator(PeepholeGraphPass):
                 return PyngMaximum(x, y)
             elif isinstance(op, Minimum):
                 return PyngMinimum(x, y)
+            elif isinstance(op, Power):
+                return PyngPower(x, y)
+            elif isinstance(op, FloorDivide):
+                return PyngFloor(x / y)
+            elif isinstance(op, Mod):
+                # numpy mod, which has the sign of y
+                return x - y * PyngFloor(x / y)
 
         self.computation.set_op_rank(op)
         ngraph_cpp_op = pyng_binary_op(op, self.computation.lookup_cpp_op(x),
@@ -274,11 +467,68 @@ class PybindWrapperGenerator(PeepholeGraphPass):
                 return PyngSqrt(x)
             elif isinstance(op, NegativeOp):
                 return PyngNegative(x)
+            elif isinstance(op, TanhOp):
+                return PyngTanh(x)
+            elif isinstance(op, SinOp):
+                return PyngSin(x)
+            elif isinstance(op, CosOp):
+                return PyngCos(x)
+            elif isinstance(op, AbsoluteOp):
+                return PyngAbs(x)
+            elif isinstance(op, SignOp):
+                return PyngSign(x)
+            elif isinstance(op, SigmoidAtomicOp):
+                one = self.broadcast_constant(1.0, Type.f32, list(op.axes.lengths))
+                return one / (one + PyngExp(PyngNegative(x)))
 
         self.computation.set_op_rank(op)
         ngraph_cpp_op = pyng_unary_op(op, self.computation.lookup_cpp_op(x))
         self.computation.register_cpp_op(op, ngraph_cpp_op)
 
+    def reduction_axis_set(self, op):
+        """
+        Returns the AxisSet of the input axes reduced by op.
+        """
+        np_axis = self.np_reduction_axis(op)
+        if not isinstance(np_axis, tuple):
+            np_axis = (np_axis,)
+        return AxisSet(set(np_axis))
+
+    def index_reduction(self, op, x, reduction):
+        """
+        Returns the index, in row-major order over the reduction axes, of the first element of
+        x equal to the reduction of x, computed as the minimum of the indices of those elements
+        in the index dtype of op.
+        """
+        np_axis = sorted(self.reduction_axis_set(op))
+        input_shape = list(x.axes.lengths)
+        reduction_shape = [input_shape[axis] for axis in np_axis]
+        reduction_size = int(np.prod(reduction_shape))
+        kept_axes = AxisSet(set(range(len(input_shape))) - set(np_axis))
+        index_type = element_type(op.dtype)
+
+        ngraph_input = self.computation.lookup_cpp_op(x)
+        reduced = PyngBroadcast(reduction(ngraph_input, AxisSet(set(np_axis))),
+                                Shape(input_shape),
+                                AxisSet(set(np_axis)))
+        is_reduced = PyngConvert(PyngEqual(ngraph_input, reduced), index_type)
+        index = PyngBroadcast(Constant(index_type, Shape(reduction_shape),
+                                       list(range(reduction_size))),
+                              Shape(input_shape),
+                              kept_axes)
+        one = self.broadcast_constant(1, index_type, input_shape)
+        past_end = self.broadcast_constant(reduction_size, index_type, input_shape)
+        candidates = index * is_reduced + past_end * (one - is_reduced)
+        return PyngMin(candidates, AxisSet(set(np_axis)))
+
+    def do_pass(self, ops, **kwargs):
+        # report every op class without a lowering before building any of the function
+        unhandled = self.unhandled_op_types(ops)
+        if unhandled:
+            raise RuntimeError("No lowering for ops: " + ", ".join(
+                "{} ({})".format(name, count) for name, count in unhandled.items()))
+        super(PybindWrapperGenerator, self).do_pass(ops=ops, **kwargs)
+
     @generic_method(dispatch_base_type=Op)
     def visit(self, op, *args):
         self.computation.set_op_rank(op)
@@ -375,34 +625,24 @@ class PybindWrapperGenerator(PeepholeGraphPass):
         # determine the reduction_axes count
         reduction_axes_count, reduction_axes = self.get_reduction_axis(op)
 
-        reshape_input_needed = False
+        # transpose only the inputs which are not already in the order the dot needs;
+        # DotLayoutPass has picked the operand order of this dot that needs the fewest
+        # transposed bytes
+        input1_axes, input2_axes = dot_input_axes(input1, input2)
+        input1_axes_order = self.get_axes_order_from_axes_name(
+            input1.axes.names, input1_axes.names)
+        input1_axes_shape = list(input1_axes.lengths)
+        input2_axes_order = self.get_axes_order_from_axes_name(
+            input2.axes.names, input2_axes.names)
+        input2_axes_shape = list(input2_axes.lengths)
+        reshape_input1_needed = input1.axes != input1_axes
+        reshape_input2_needed = input2.axes != input2_axes
         reshape_output_needed = False
 
-        # check if the input1/input2 needs to be Transposed and if yes, Transpose
-        if (len(input1.axes.names) != 0 and len(input2.axes.names) != 0) \
-                and (input1.axes.names[-1] != input2.axes.names[0]):
-            reshape_input_needed = True
-            input1_axes = list((op.x_out_axes + op.reduction_axes).names)
-            input2_axes = list((op.reduction_axes + op.y_out_axes).names)
-            input1_axes_order = self.get_axes_order_from_axes_name(
-                input1.axes.names, input1_axes)
-            input1_axes_shape = self.get_shape_from_axes_order(
-                input1_axes_order,
-                input1.axes.lengths)
-            input2_axes_order = self.get_axes_order_from_axes_name(
-                input2.axes.names, input2_axes)
-            input2_axes_shape = self.get_shape_from_axes_order(
-                input2_axes_order,
-                input2.axes.lengths)
-        else:
-            input1_axes_shape = list(input1.axes.lengths)
-            input1_axes_order = list(range(0, len(input1.axes)))
-            input2_axes_shape = list(input2.axes.lengths)
-            input2_axes_order = list(range(0, len(input2.axes)))
-
         # flatten reduction_axes
         if reduction_axes_count > 1:
-            reshape_input_needed = True
+            reshape_input1_needed = True
+            reshape_input2_needed = True
             input1_axes_shape = input1_axes_shape[:-reduction_axes_count] + \
                 [np.prod(input1_axes_shape[-reduction_axes_count:])]
             input2_axes_shape = [np.prod(input2_axes_shape[:reduction_axes_count])] + \
@@ -412,27 +652,27 @@ class PybindWrapperGenerator(PeepholeGraphPass):
         # check if other axes need to be flatten to force 2D dot
         if reduction_axes_count == 1:
             if len(op.x_out_axes) > 1:
-                reshape_input_needed = True
+                reshape_input1_needed = True
                 reshape_output_needed = True
                 input1_axes_shape = [np.prod(input1_axes_shape[:-1])] + input1_axes_shape[-1:]
             if len(op.y_out_axes) > 1:
-                reshape_input_needed = True
+                reshape_input2_needed = True
                 reshape_output_needed = True
                 input2_axes_shape = input2_axes_shape[:1] + [np.prod(input2_axes_shape[1:])]
 
         # reshape input
-        if reshape_input_needed:
+        input1_op = self.computation.lookup_cpp_op(input1)
+        if reshape_input1_needed:
             input1_op = PyngReshape(
-                self.computation.lookup_cpp_op(input1),
+                input1_op,
                 AxisVector(input1_axes_order),
                 Shape(input1_axes_shape))
+        input2_op = self.computation.lookup_cpp_op(input2)
+        if reshape_input2_needed:
             input2_op = PyngReshape(
-                self.computation.lookup_cpp_op(input2),
+                input2_op,
                 AxisVector(input2_axes_order),
                 Shape(input2_axes_shape))
-        else:
-            input1_op = self.computation.lookup_cpp_op(input1)
-            input2_op = self.computation.lookup_cpp_op(input2)
 
         ngraph_op = PyngDot(input1_op, input2_op,
                             reduction_axes_count)
@@ -473,6 +713,22 @@ class PybindWrapperGenerator(PeepholeGraphPass):
     def visit(self, op, x, y):
         self.binary_op(op, x, y, is_logical=True)
 
+    @visit.on_type(LessEqual)
+    def visit(self, op, x, y):
+        self.binary_op(op, x, y, is_logical=True)
+
+    @visit.on_type(Power)
+    def visit(self, op, x, y):
+        self.binary_op(op, x, y)
+
+    @visit.on_type(FloorDivide)
+    def visit(self, op, x, y):
+        self.binary_op(op, x, y)
+
+    @visit.on_type(Mod)
+    def visit(self, op, x, y):
+        self.binary_op(op, x, y)
+
     @visit.on_type(Sum)
     def visit(self, op, input):
         self.computation.set_op_rank(op)
@@ -530,6 +786,30 @@ class PybindWrapperGenerator(PeepholeGraphPass):
     def visit(self, op, x):
         self.unary_op(op, x)
 
+    @visit.on_type(TanhOp)
+    def visit(self, op, x):
+        self.unary_op(op, x)
+
+    @visit.on_type(SigmoidAtomicOp)
+    def visit(self, op, x):
+        self.unary_op(op, x)
+
+    @visit.on_type(SinOp)
+    def visit(self, op, x):
+        self.unary_op(op, x)
+
+    @visit.on_type(CosOp)
+    def visit(self, op, x):
+        self.unary_op(op, x)
+
+    @visit.on_type(AbsoluteOp)
+    def visit(self, op, x):
+        self.unary_op(op, x)
+
+    @visit.on_type(SignOp)
+    def visit(self, op, x):
+        self.unary_op(op, x)
+
     @visit.on_type(Prod)
     def visit(self, op, input):
         self.computation.set_op_rank(op)
@@ -580,6 +860,22 @@ class PybindWrapperGenerator(PeepholeGraphPass):
         ngraph_input = self.computation.lookup_cpp_op(input)
         self.computation.register_cpp_op(op, PyngMax(ngraph_input, AxisSet(set(axis_set))))
 
+    @visit.on_type(Min)
+    def visit(self, op, input):
+        self.computation.set_op_rank(op)
+        ngraph_input = self.computation.lookup_cpp_op(input)
+        self.computation.register_cpp_op(op, PyngMin(ngraph_input, self.reduction_axis_set(op)))
+
+    @visit.on_type(Argmax)
+    def visit(self, op, input):
+        self.computation.set_op_rank(op)
+        self.computation.register_typed_cpp_op(op, self.index_reduction(op, input, PyngMax))
+
+    @visit.on_type(Argmin)
+    def visit(self, op, input):
+        self.computation.set_op_rank(op)
+        self.computation.register_typed_cpp_op(op, self.index_reduction(op, input, PyngMin))
+
     @visit.on_type(SequentialOp)
     def visit(self, op):
         self.computation.set_op_rank(op)
@@ -663,11 +959,9 @@ class PybindWrapperGenerator(PeepholeGraphPass):
         # op.conv_params
         # op.channel_axes
         # op.spatial_axes
-        if len(args) == 2:
-            inputs = args[0]
-            filters = args[1]
-        else:
-            raise RuntimeError("Not Implemented: Convolution with bias")
+        inputs = args[0]
+        filters = args[1]
+        bias = args[2] if len(args) == 3 else None
 
         """
         {'K': 16, 'T': 1, 'R': 5, 'S': 5, 'str_d': 1, 'pad_d': 0, 'dil_d': 1,
@@ -688,6 +982,12 @@ class PybindWrapperGenerator(PeepholeGraphPass):
             CoordinateDiff([op.conv_params['pad_h'], op.conv_params['pad_w']]),
             Strides([1, 1]))
         ngraph_conv.name = op.name.replace('/', '_') + "_Convolution"
+        if bias is not None:
+            # bias add in the pattern the backend fuses into the convolution
+            broadcast_axes = {0} | set(range(2, len(op.axes)))
+            ngraph_conv = ngraph_conv + PyngBroadcast(self.computation.lookup_cpp_op(bias),
+                                                      Shape(list(op.axes.lengths)),
+                                                      AxisSet(broadcast_axes))
         self.computation.register_cpp_op(op, ngraph_conv, set_name=False)
 
     """
@@ -772,6 +1072,22 @@ class PybindWrapperGenerator(PeepholeGraphPass):
         data = args[1]
         filters = op.fprop.args[1]
         conv_params = op.fprop.conv_params
+        fprop = op.fprop.forwarded
+        if isinstance(fprop, DeconvolutionOp):
+            # the deconvolution is the transpose of a convolution from its delta (data) to
+            # its inputs (delta), whose filters are in (C, K, spatial) order
+            axes_order = self.deconv_filters_order(fprop, filters)
+            ngraph_update_conv = PyngConvolutionBackpropFilters(
+                self.computation.lookup_cpp_op(data),
+                Shape(self.get_shape_from_axes_order(axes_order, filters.axes.lengths)),
+                self.computation.lookup_cpp_op(delta),
+                *self.conv_window(conv_params, len(data.axes) - 2))
+            inverse_order = [axes_order.index(index) for index in range(len(axes_order))]
+            ngraph_update_conv = PyngReshape(ngraph_update_conv,
+                                             AxisVector(inverse_order),
+                                             Shape(list(filters.axes.lengths)))
+            self.computation.register_cpp_op(op, ngraph_update_conv)
+            return
         """
         print(delta.axes)
         print(filters.axes)
@@ -1086,3 +1402,98 @@ class PybindWrapperGenerator(PeepholeGraphPass):
         ngraph_delta = self.computation.lookup_cpp_op(delta)
         ngraph_relu_bprop = PyngReluBackprop(ngraph_inputs, ngraph_delta)
         self.computation.register_cpp_op(op, ngraph_relu_bprop)
+
+    """
+    The lookup is a dot with the one-hot encoding of the indices, so it is computed as a
+    gather by the backend dot:
+    lut (V, F): onehot(idx) (N, V) . lut (V, F) -> (N, F)
+    lut (F, V): lut (F, V) . onehot(idx) (V, N) -> (F, N)
+    """
+    @visit.on_type(LookupTableOp)
+    def visit(self, op, lut, idx):
+        self.computation.set_op_rank(op)
+        ngraph_lookup = PyngGather(self.computation.lookup_cpp_op(lut),
+                                   PyngConvert(self.computation.lookup_cpp_op(idx), Type.i32),
+                                   op.lut_axis)
+        self.computation.register_cpp_op(op, ngraph_lookup)
+
+    """
+    The lut gradient scatter-adds the delta of each lookup into the row it was read from.
+    The row of pad_idx, or the whole table when it is not updated, gets no gradient.
+    """
+    @visit.on_type(update_lut)
+    def visit(self, op, delta, idx):
+        self.computation.set_op_rank(op)
+        ngraph_zeros = self.broadcast_constant(0.0, Type.f32, list(op.axes.lengths))
+        if not op.update:
+            self.computation.register_cpp_op(op, ngraph_zeros)
+            return
+        self.computation.register_cpp_op(op, self.lut_scatter_add(op, ngraph_zeros, delta, idx))
+
+    """
+    The row-sparse update of a lookup table scatter-adds the delta of each lookup into the
+    table itself, so only the rows that were looked up are read and written.
+    """
+    @visit.on_type(scatter_add_lut)
+    def visit(self, op, lut, delta, idx):
+        self.computation.set_op_rank(op)
+        self.computation.register_cpp_op(
+            op, self.lut_scatter_add(op, self.computation.lookup_cpp_op(lut), delta, idx))
+
+    """
+    A deconvolution is the data backprop of the convolution from its output to its input,
+    with the filters of that convolution in (C, K, spatial) order.
+    """
+    @visit.on_type(DeconvolutionOp)
+    def visit(self, op, inputs, filters):
+        self.computation.set_op_rank(op)
+        ngraph_deconv = PyngConvolutionBackpropData(
+            Shape(list(op.axes.lengths)),
+            self.deconv_filters(op, filters),
+            self.computation.lookup_cpp_op(inputs),
+            *self.conv_window(op.conv_params, len(op.axes) - 2))
+        ngraph_deconv.name = op.name.replace('/', '_') + "_ConvolutionBackpropData"
+        self.computation.register_cpp_op(op, ngraph_deconv, set_name=False)
+
+    """
+    The backprop of a deconvolution to its inputs is the forward convolution.
+    """
+    @visit.on_type(DeconvDerivOp)
+    def visit(self, op, delta, filters):
+        self.computation.set_op_rank(op)
+        fprop = op.fprop.forwarded
+        if not isinstance(fprop, DeconvolutionOp):
+            raise RuntimeError("Not Implemented: DeconvDerivOp of " + type(fprop).__name__)
+        ngraph_conv = PyngConvolution(
+            self.computation.lookup_cpp_op(delta),
+            self.deconv_filters(fprop, filters),
+            *self.conv_window(fprop.conv_params, len(delta.axes) - 2))
+        ngraph_conv.name = op.name.replace('/', '_') + "_Convolution"
+        self.computation.register_cpp_op(op, ngraph_conv, set_name=False)
+
+    @visit.on_type(RngOp)
+    def visit(self, op, *args):
+        self.computation.set_op_rank(op)
+        shape = list(op.axes.lengths)
+        # every RngOp of the transformer draws from its own stream, numbered in the order the
+        # computations and their graphs are built so that runs with the same seed match
+        key = stream_key(self.transformer.rng_seed, self.transformer.rng_streams)
+        self.transformer.rng_streams += 1
+        if not self.transformer.device_rng:
+            self.computation.register_cpp_op(op, self.computation.host_rng_op(op, key))
+            return
+        x0, x1, _, _ = self.philox_words(op, key)
+
+        def scalar(value):
+            return self.broadcast_constant(value, Type.f32, shape)
+
+        if op.distribution == 'uniform':
+            low, high = op.params['low'], op.params['high']
+            ngraph_op = scalar(low) + scalar(high - low) * self.unit_float(x0, shape)
+        else:
+            # Box-Muller transform
+            u0 = self.unit_float(x0, shape) + scalar(2.0 ** -MANTISSA_BITS)
+            radius = PyngSqrt(scalar(-2.0) * PyngLog(u0))
+            z = radius * PyngCos(scalar(2.0 * np.pi) * self.unit_float(x1, shape))
+            ngraph_op = scalar(op.params['loc']) + scalar(op.params['scale']) * z
+        self.computation.register_cpp_op(op, ngraph_op)
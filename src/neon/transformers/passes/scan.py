@@ -0,0 +1,36 @@
+# ******************************************************************************
+# Copyright 2017-2018 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ******************************************************************************
+from neon.op_graph.op_graph import Op
+from neon.op_graph.scan import ScanOutputOp
+from neon.transformers.passes.passes import GraphBuildingPass
+from neon.util.generics import generic_method
+
+
+class ScanExpansion(GraphBuildingPass):
+    """
+    Replaces the values of each ScanOp with the ops of its steps, for backends without loops.
+
+    The steps are only added to the graph here, after the derivatives have been taken on the
+    loop, and the backward loops are expanded like the forward ones.
+    """
+
+    @generic_method(dispatch_base_type=Op)
+    def visit(self, op, *args):
+        pass
+
+    @visit.on_type(ScanOutputOp)
+    def visit(self, op, scan):
+        self.replace_op(op, scan.expanded_value(op.key))
@@ -24,11 +24,16 @@ from neon.op_graph.op_graph import Op, AssignableTensorOp, TensorValueOp, Sequen
 from neon.op_graph.batchnorm import BatchnormCommonOp, BatchnormBpropCommonOp
 from orderedset import OrderedSet
 from neon.transformers.passes.pybindwrapperpass \
-    import PybindWrapperGenerator, PybindScopePass
+    import PybindWrapperGenerator, PybindScopePass, element_type
+from neon.transformers.passes import layout
+from neon.transformers.passes.fusion import ConvolutionFusion
+from neon.transformers.passes.scan import ScanExpansion
+from neon.util.philox import step_words
 from ngraph.impl import util
 from ngraph.impl import Type, Function, NodeVector, Shape
 from ngraph.impl.runtime import Manager
 from ngraph.impl.op import Parameter
+from ngraph.impl.op import Convert as PyngConvert
 
 
 class PybindComputation(Computation):
@@ -65,6 +70,7 @@ class PybindComputation(Computation):
 
         # Neon -> Ngraph lookup
         self.ngraph_cpp_ops = dict()
+        self.typed_cpp_ops = dict()
         self.variables_cpp_op = dict()
 
         # Other variables and structures
@@ -76,6 +82,17 @@ class PybindComputation(Computation):
         self.parcount = 0
 
         self.function_count = 0
+
+        # Random number generation: the step counts calls and is the only rng state fed to
+        # the function, the random values are generated inside it from the step
+        self.rng_step = 0
+        self.rng_step_parameter = None
+        self.rng_step_tensor_view = None
+        # unless the transformer generates them in the function, the random values are drawn
+        # on the host for each call and fed to one parameter per RngOp
+        self.host_rng_list = []
+        self.host_rng_tensor_view_list = []
+
         self.build_opgraph()
         self.build_function()
         self.build_callframe()
@@ -127,7 +144,20 @@ class PybindComputation(Computation):
                 print("In: " + var.name)
                 print(self.transformer.neon_variable_buffer[var])
         """
-        self.cf.call(self.param_primary_tensor_view_list + self.variable_primary_tensor_view_list,
+        rng_tensor_view_list = []
+        if self.rng_step_tensor_view is not None:
+            step = np.array(step_words(self.rng_step), dtype=np.uint32)
+            self.rng_step_tensor_view.write(util.numpy_to_c(step), 0, step.nbytes)
+            rng_tensor_view_list.append(self.rng_step_tensor_view)
+            self.rng_step += 1
+        for (op, rng, _), tensor_view in zip(self.host_rng_list,
+                                             self.host_rng_tensor_view_list):
+            values = self.host_random_values(op, rng)
+            tensor_view.write(util.numpy_to_c(values), 0, values.nbytes)
+            rng_tensor_view_list.append(tensor_view)
+
+        self.cf.call(self.param_primary_tensor_view_list + self.variable_primary_tensor_view_list
+                     + rng_tensor_view_list,
                      self.result_primary_tensor_view_list + self.update_primary_tensor_view_list)
 
         # now read the values from the computed result
@@ -237,6 +267,43 @@ class PybindComputation(Computation):
                     raise RuntimeError("Shape mismatch", op.name, neon_shape, ngraph_shape)
         self.ngraph_cpp_ops[tensor_op] = cpp_op
 
+    def register_typed_cpp_op(self, op, cpp_op):
+        """
+        Registers cpp_op, computed in the element type of the dtype of op, as the value of op
+        returned by the computation. Other ops read it converted to f32, like every other value.
+        """
+        self.register_cpp_op(op, PyngConvert(cpp_op, Type.f32))
+        self.typed_cpp_ops[op.tensor] = cpp_op
+
+    def rng_step_op(self):
+        """
+        Returns the parameter holding the number of times the computation was called, as two
+        words, low word first.
+        """
+        if self.rng_step_parameter is None:
+            self.rng_step_parameter = Parameter(Type.u32, Shape([2]))
+        return self.rng_step_parameter
+
+    def host_rng_op(self, op, key):
+        """
+        Returns a parameter fed with the values of the RngOp op, drawn on the host at each call
+        from a numpy generator seeded with key.
+        """
+        parameter = Parameter(Type.f32, Shape(list(op.axes.lengths)))
+        self.host_rng_list.append((op, np.random.RandomState(list(key)), parameter))
+        return parameter
+
+    def host_random_values(self, op, rng):
+        """
+        Returns the next values of the RngOp op drawn from rng, as float32.
+        """
+        shape = op.axes.lengths
+        if op.distribution == 'uniform':
+            values = rng.uniform(op.params['low'], op.params['high'], shape)
+        else:
+            values = rng.normal(op.params['loc'], op.params['scale'], shape)
+        return np.ascontiguousarray(values, dtype=np.float32)
+
     def set_op_rank(self, op):
         if isinstance(op, TensorValueOp):
             self.op_rank[op] = self.rank
@@ -263,6 +330,8 @@ class PybindComputation(Computation):
         """
         computation = self.computation_op
         self.transformer.graph_passes = []
+        self.transformer.graph_passes += [ConvolutionFusion()]
+        self.transformer.graph_passes += [layout.DotLayoutPass(self.transformer)]
         self.transformer.graph_passes += [PybindWrapperGenerator(self.transformer, self)]
         self.custom_passes = []
         self.custom_passes += [PybindScopePass(self)]
@@ -271,6 +340,9 @@ class PybindComputation(Computation):
             computation_op_list.update(list(computation.returns))
         elif isinstance(computation.returns, Op):
             computation_op_list.update(list([computation.returns]))
+        # scans are expanded first, so that the scopes cover the ops of their steps
+        ScanExpansion().wrapped_do_pass(ops=computation_op_list)
+        computation_op_list = OrderedSet(op.forwarded for op in computation_op_list)
         for custom_pass in self.custom_passes:
             custom_pass(computation_op_list)
         self.transformer.run_registered_graph_passes(computation_op_list)
@@ -293,7 +365,10 @@ class PybindComputation(Computation):
             # print("Result: " + node.name)
             if isinstance(node.tensor, AssignOp):
                 node = node.args[1]
-            ngraph_op = self.lookup_cpp_op(node)
+            if node.tensor in self.typed_cpp_ops:
+                ngraph_op = self.typed_cpp_ops[node.tensor]
+            else:
+                ngraph_op = self.lookup_cpp_op(node)
             # print("Return " + str(ngraph_op))
             self.result_nodes_list.append(ngraph_op)
 
@@ -339,10 +414,15 @@ class PybindComputation(Computation):
                 if variable.initial_value is not None:
                     np.copyto(var_buffer, variable.initial_value)
 
+        rng_parameter_list = []
+        if self.rng_step_parameter is not None:
+            rng_parameter_list.append(self.rng_step_parameter)
+        rng_parameter_list.extend(parameter for _, _, parameter in self.host_rng_list)
+
         # TODO - what's the role of the string argument? for now just passing 'test'
         self.function = Function(NodeVector(
             self.result_nodes_list + self.update_nodes_list),
-            self.parameter_list + self.variable_list,
+            self.parameter_list + self.variable_list + rng_parameter_list,
             self.transformer.get_function_name())
 
     def build_callframe(self):
@@ -360,12 +440,15 @@ class PybindComputation(Computation):
             if isinstance(node.tensor, AssignOp):
                 node = node.args[1]
             shape = list(node.tensor.axes.lengths)
+            # results computed in another element type are returned in their dtype
+            dtype = np.float32
+            if node.tensor in self.typed_cpp_ops:
+                dtype = node.tensor.dtype
             self.result_primary_tensor_view_list.append(
                 self.backend.make_primary_tensor_view(
-                    self.element_type, Shape(shape)))
+                    element_type(dtype), Shape(shape)))
             # Allocate return buffer
-            # TODO - need to define dtype of numpy array's for results based on result.dtype
-            result_arr = np.zeros(shape, dtype=np.float32)
+            result_arr = np.zeros(shape, dtype=dtype)
             self.neon_return_buffer[org_node] = result_arr
 
         # prepare tensor_views for placeholders
@@ -383,6 +466,14 @@ class PybindComputation(Computation):
                     self.backend.make_primary_tensor_view(
                         self.element_type, Shape(shape)))
 
+        # prepare the tensor_view for the rng step
+        if self.rng_step_parameter is not None:
+            self.rng_step_tensor_view = self.backend.make_primary_tensor_view(
+                Type.u32, Shape([2]))
+        for op, _, _ in self.host_rng_list:
+            self.host_rng_tensor_view_list.append(
+                self.backend.make_primary_tensor_view(Type.f32, Shape(list(op.axes.lengths))))
+
         # prepare tensor_views for weights
         for node in self.neon_update_list:
             shape = list(node.axes.lengths)
@@ -398,9 +489,7 @@ class FunctionTransformer(Transformer):
         self.computations = OrderedSet()
 
     def run_registered_graph_passes(self, ops, **kwargs):
-        for graph_pass in self.graph_passes:
-            graph_pass.wrapped_do_pass(ops=ops, **kwargs)
-        return ops
+        return self.pass_manager.run_passes(self.graph_passes, ops, **kwargs)
 
     def host_to_device(self, computation, parameters, args):
         pass
@@ -453,18 +542,32 @@ class FunctionTransformer(Transformer):
     def state_initializations(self, states):
         pass
 
+    def get_layouts(self, op):
+        return layout.get_layouts(op)
+
+    def get_layout_change_cost_function(self, op, arg):
+        return layout.get_layout_change_cost_function(op, arg)
+
 
 class PybindTransformer(FunctionTransformer):
     """
     Transformer for executing graphs to call the pybind wrapper of the ngraph c++.
 
+    Arguments:
+        rng_seed (int, optional): Seed of the random numbers generated by RngOps.
+        device_rng (bool): Generate the values of RngOps inside the compiled functions, with
+            Philox4x32-10. Defaults to False, which draws them on the host with numpy and feeds
+            them to the functions at each call. The backends have no bitwise integer ops, so
+            the device generator emulates them with many elementwise passes per value and is
+            slower, see examples/benchmarks/rng.py.
+
     """
     """
     transformer_name = "pybind_translator"
     """
     function_count = 1
 
-    def __init__(self, **kwargs):
+    def __init__(self, rng_seed=None, device_rng=False, **kwargs):
         """
         if "backend" in kwargs:
             self.ngraph_backend = kwargs.pop("backend")
@@ -474,6 +577,14 @@ class PybindTransformer(FunctionTransformer):
         """
         super(PybindTransformer, self).__init__(**kwargs)
         self.neon_variable_buffer = dict()
+        # seed of the random numbers generated by computations, drawn from numpy when
+        # not given so that np.random.seed still makes runs reproducible
+        if rng_seed is None:
+            rng_seed = np.random.randint(1 << 31)
+        self.rng_seed = rng_seed
+        # number of random streams drawn by the computations of this transformer
+        self.rng_streams = 0
+        self.device_rng = device_rng
 
     def make_computation(self, computation):
         """
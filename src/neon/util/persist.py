@@ -14,9 +14,13 @@
 # limitations under the License.
 # ******************************************************************************
 from __future__ import print_function
+import hashlib
+import json
 import os
 import posixpath
+import shutil
 import sys
+import numpy as np
 import requests
 from tqdm import tqdm
 
@@ -29,6 +33,9 @@ else:
 
 pickle = the_pickle
 
+DATA_CACHE_VERSION = 1
+"""Version of the preprocessed datasets cache, to increase when a loader changes its output."""
+
 
 def ensure_dirs_exist(path):
     """
@@ -133,3 +140,98 @@ def fetch_file(url, sourcefile, destfile, totalsz=None):
         for data in tqdm(req.iter_content(chunksz), total=nchunks, unit="MB"):
             f.write(data)
     print("Download Complete")
+
+
+def load_data_cache(name, sources, build, **params):
+    """
+    Returns the preprocessed dataset built by build, from the data cache when it is there.
+
+    On the first load, the dataset is written under get_data_cache_or_nothing(), with every
+    array in a .npy file and the rest of the structure in a JSON header. Every load, the first
+    included, memory maps the arrays copy-on-write, so they can be changed in memory without
+    changing the cache. The cache is found by DATA_CACHE_VERSION, name, params, and the paths,
+    sizes and modification times of the sources. Nothing is cached when NGRAPH_DATA_CACHE_DIR
+    is not set.
+
+    Arguments:
+        name (str): Name of the dataset.
+        sources (list): Files the dataset is built from.
+        build: Function returning the dataset, a structure of dicts with string keys, lists and
+               tuples, whose leaves are numpy arrays or JSON values.
+        **params: Other arguments the dataset depends on.
+
+    Returns:
+        The dataset. Its arrays are copy-on-write memory maps when the cache is used.
+    """
+    cache_root = get_data_cache_or_nothing('datasets/')
+    if cache_root == '':
+        return build()
+
+    key = repr((DATA_CACHE_VERSION, name, sorted(params.items()),
+                [(os.path.abspath(source), os.path.getsize(source), os.path.getmtime(source))
+                 for source in sources]))
+    cache_dir = os.path.join(cache_root, '{}-v{}-{}'.format(
+        name, DATA_CACHE_VERSION, hashlib.sha1(key.encode('utf-8')).hexdigest()[:16]))
+    header_file = os.path.join(cache_dir, 'header.json')
+    if os.path.exists(header_file):
+        with open(header_file) as f:
+            return decode_cached(json.load(f), cache_dir)
+
+    data = build()
+    partial_dir = '{}.partial-{}'.format(cache_dir, os.getpid())
+    try:
+        os.makedirs(partial_dir)
+        header = encode_cached(data, partial_dir, [0])
+        with open(os.path.join(partial_dir, 'header.json'), 'w') as f:
+            json.dump(header, f)
+        try:
+            os.rename(partial_dir, cache_dir)
+        except OSError:
+            # written by another process in the meantime
+            pass
+    finally:
+        if os.path.exists(partial_dir):
+            shutil.rmtree(partial_dir)
+    return decode_cached(header, cache_dir)
+
+
+def encode_cached(data, path, count):
+    """
+    Saves the arrays of data in path.
+
+    Returns:
+        The JSON header describing data.
+    """
+    if isinstance(data, np.ndarray):
+        filename = '{}.npy'.format(count[0])
+        count[0] += 1
+        np.save(os.path.join(path, filename), data, allow_pickle=data.dtype.hasobject)
+        return {'__array__': filename, 'mmap': not data.dtype.hasobject}
+    if isinstance(data, tuple):
+        return {'__tuple__': [encode_cached(x, path, count) for x in data]}
+    if isinstance(data, list):
+        return [encode_cached(x, path, count) for x in data]
+    if isinstance(data, dict):
+        return {k: encode_cached(v, path, count) for k, v in data.items()}
+    if isinstance(data, np.generic):
+        return data.item()
+    return data
+
+
+def decode_cached(header, path):
+    """
+    Returns:
+        The data described by the JSON header, with the arrays mapped from path.
+    """
+    if isinstance(header, dict):
+        if '__array__' in header:
+            filename = os.path.join(path, header['__array__'])
+            if header['mmap']:
+                return np.load(filename, mmap_mode='c')
+            return np.load(filename, allow_pickle=True)
+        if '__tuple__' in header:
+            return tuple(decode_cached(x, path) for x in header['__tuple__'])
+        return {k: decode_cached(v, path) for k, v in header.items()}
+    if isinstance(header, list):
+        return [decode_cached(x, path) for x in header]
+    return header
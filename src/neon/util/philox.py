@@ -0,0 +1,163 @@
+# ******************************************************************************
+# Copyright 2017-2018 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ******************************************************************************
+"""
+Counter-based random numbers from Philox4x32-10.
+
+Each random value is a function of a key and a counter only, so a compiled function can
+generate any element of a random tensor from the element index and a step count, without
+carrying generator state between elements or calls.
+
+The rounds are written against mulhilo and xor callables so the same generator can be
+emitted as backend ops or evaluated with numpy. See Salmon et al., "Parallel random numbers:
+as easy as 1, 2, 3", SC 2011.
+"""
+import numpy as np
+
+PHILOX_M = (0xD2511F53, 0xCD9E8D57)
+PHILOX_W = (0x9E3779B9, 0xBB67AE85)
+PHILOX_ROUNDS = 10
+UINT32 = 1 << 32
+MANTISSA_BITS = 24
+
+
+def round_keys(key, rounds=PHILOX_ROUNDS):
+    """
+    Returns:
+        The two words of the key used in each round of the bijection.
+    """
+    return [tuple((k + r * w) % UINT32 for k, w in zip(key, PHILOX_W)) for r in range(rounds)]
+
+
+def philox_rounds(counter, key, mulhilo, xor, rounds=PHILOX_ROUNDS):
+    """
+    Applies the Philox4x32 bijection to a counter.
+
+    Arguments:
+        counter: The four words of the counter, unsigned 32 bit.
+        key: The two words of the key, as ints.
+        mulhilo: mulhilo(m, x) returns the high and low 32 bit words of the product m * x,
+            where m is an int.
+        xor: xor(x, y, k) returns the exclusive or of the words x and y and the int k.
+        rounds (int): Number of rounds.
+
+    Returns:
+        The four random words.
+    """
+    x0, x1, x2, x3 = counter
+    for k0, k1 in round_keys(key, rounds):
+        hi0, lo0 = mulhilo(PHILOX_M[0], x0)
+        hi1, lo1 = mulhilo(PHILOX_M[1], x2)
+        x0, x1, x2, x3 = xor(hi1, x1, k0), lo1, xor(hi0, x3, k1), lo0
+    return x0, x1, x2, x3
+
+
+def stream_key(seed, stream):
+    """
+    Returns:
+        The key of a stream of random numbers derived from seed.
+    """
+    return seed % UINT32, stream % UINT32
+
+
+def step_words(step):
+    """
+    Returns:
+        The two words of the counter holding the step, low word first.
+    """
+    return step % UINT32, (step // UINT32) % UINT32
+
+
+def numpy_mulhilo(m, x):
+    product = np.uint64(m) * np.asarray(x, dtype=np.uint64)
+    return (product >> np.uint64(32)).astype(np.uint32), product.astype(np.uint32)
+
+
+def numpy_xor(x, y, k):
+    return np.asarray(x, dtype=np.uint32) ^ np.asarray(y, dtype=np.uint32) ^ np.uint32(k)
+
+
+def philox(counter, key, rounds=PHILOX_ROUNDS):
+    """
+    Philox4x32 with numpy.
+
+    Arguments:
+        counter: The four words of the counter, ints or arrays.
+        key: The two words of the key.
+        rounds (int): Number of rounds.
+
+    Returns:
+        The four random words, as uint32 arrays.
+    """
+    counter = [np.asarray(x, dtype=np.uint32) for x in counter]
+    return philox_rounds(counter, key, numpy_mulhilo, numpy_xor, rounds)
+
+
+def philox_uniform(shape, key, step, low=0.0, high=1.0):
+    """
+    Reference values of uniform random numbers generated on the device.
+
+    Element i of the result is computed from the counter (i, step low word, step high word,
+    0), i being its index in row-major order.
+
+    Arguments:
+        shape (tuple): Shape of the result.
+        key (tuple): Key of the stream, from stream_key.
+        step (int): Number of times the stream has been drawn from.
+        low (float): Lower limit of the distribution range.
+        high (float): Upper limit of the distribution range.
+
+    Returns:
+        A float32 array of values in [low, high).
+    """
+    x0, _, _, _ = numpy_words(shape, key, step)
+    u = unit_float(x0)
+    return (low + (high - low) * u).astype(np.float32).reshape(shape)
+
+
+def philox_normal(shape, key, step, loc=0.0, scale=1.0):
+    """
+    Reference values of normal random numbers generated on the device.
+
+    The first two random words of each element are turned into a normal value by the
+    Box-Muller transform.
+
+    Arguments:
+        shape (tuple): Shape of the result.
+        key (tuple): Key of the stream, from stream_key.
+        step (int): Number of times the stream has been drawn from.
+        loc (float): Mean of the distribution.
+        scale (float): Standard deviation of the distribution.
+
+    Returns:
+        A float32 array.
+    """
+    x0, x1, _, _ = numpy_words(shape, key, step)
+    radius = np.sqrt(np.float32(-2.0) * np.log(unit_float(x0) + np.float32(2.0 ** -MANTISSA_BITS)))
+    z = radius * np.cos(np.float32(2.0 * np.pi) * unit_float(x1))
+    return (loc + scale * z).astype(np.float32).reshape(shape)
+
+
+def numpy_words(shape, key, step):
+    step_lo, step_hi = step_words(step)
+    return philox((np.arange(int(np.prod(shape))), step_lo, step_hi, 0), key)
+
+
+def unit_float(x):
+    """
+    Returns:
+        The top MANTISSA_BITS of the words x as float32 values in [0, 1).
+    """
+    return (x >> (32 - MANTISSA_BITS)).astype(np.float32) * np.float32(2.0 ** -MANTISSA_BITS)
@@ -0,0 +1,177 @@
+# ******************************************************************************
+# Copyright 2017-2018 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ******************************************************************************
+import numpy as np
+
+from neon.frontend import ArrayIterator, BucketIterator, SequentialArrayIterator
+from neon.frontend.arrayiterator import load_mapped_arrays, save_mapped_arrays
+
+
+def make_data(ndata=10):
+    return {'image': {'data': np.arange(ndata * 3, dtype=np.float32).reshape(ndata, 3),
+                      'axes': ('N', 'F')},
+            'label': {'data': np.arange(ndata), 'axes': ('N',)}}
+
+
+def collect(iterator):
+    return [{k: np.array(v) for k, v in batch.items()} for batch in iterator]
+
+
+def assert_same_batches(batches, expected):
+    assert len(batches) == len(expected)
+    for batch, expected_batch in zip(batches, expected):
+        assert batch['iteration'] == expected_batch['iteration']
+        for k in ('image', 'label'):
+            np.testing.assert_array_equal(batch[k], expected_batch[k])
+
+
+def test_prefetch_matches_iteration():
+    expected = collect(ArrayIterator(make_data(), 4, total_iterations=7))
+    iterator = ArrayIterator(make_data(), 4, total_iterations=7, prefetch=2)
+    batches = collect(iterator)
+    assert_same_batches(batches, expected)
+    # the batches wrap around the end of the dataset
+    np.testing.assert_array_equal(batches[2]['label'], [8, 9, 0, 1])
+
+    iterator.reset()
+    assert_same_batches(collect(iterator), expected)
+
+
+def test_prefetch_reuses_buffers():
+    iterator = ArrayIterator(make_data(), 4, total_iterations=6, prefetch=1)
+    labels = [id(batch['label']) for batch in iterator]
+    assert len(set(labels)) == 2
+
+
+def test_prefetch_reset_during_iteration():
+    iterator = ArrayIterator(make_data(), 4, prefetch=2)
+    next(iterator)
+    iterator.reset()
+    np.testing.assert_array_equal(next(iterator)['label'], [0, 1, 2, 3])
+    iterator.reset()
+
+
+def test_shuffle_gathers_without_copying():
+    data = make_data(12)
+    image = data['image']['data'].copy()
+    iterator = ArrayIterator(data, 4, total_iterations=6, shuffle=True, shuffle_block=3)
+    assert iterator.data_arrays['image'] is data['image']['data']
+
+    for prefetch in (0, 2):
+        iterator = ArrayIterator(data, 4, total_iterations=6, shuffle=True, shuffle_block=3,
+                                 prefetch=prefetch)
+        batches = collect(iterator)
+        labels = np.concatenate([batch['label'] for batch in batches]).reshape(2, 12)
+        for epoch in labels:
+            assert sorted(epoch) == list(range(12))
+            # each block of three examples is read consecutively
+            assert sorted(epoch[:3] // 3) == [epoch[0] // 3] * 3
+        for batch in batches:
+            np.testing.assert_array_equal(batch['image'], image[batch['label']])
+    np.testing.assert_array_equal(data['image']['data'], image)
+
+
+def test_mapped_arrays(tmpdir):
+    path = str(tmpdir.join('dataset'))
+    save_mapped_arrays(path, make_data())
+    mapped = load_mapped_arrays(path)
+    assert isinstance(mapped['image']['data'], np.memmap)
+    assert mapped['image']['axes'] == ('N', 'F')
+
+    expected = collect(ArrayIterator(make_data(), 4, total_iterations=7))
+    assert_same_batches(collect(ArrayIterator(path, 4, total_iterations=7)), expected)
+    assert_same_batches(collect(ArrayIterator(path, 4, total_iterations=7, prefetch=2)),
+                        expected)
+
+
+def test_npy_arrays(tmpdir):
+    data = make_data()
+    for k, v in data.items():
+        np.save(str(tmpdir.join(k + '.npy')), v['data'])
+    mapped = {k: {'data': str(tmpdir.join(k + '.npy')), 'axes': v['axes']}
+              for k, v in data.items()}
+    iterator = ArrayIterator(mapped, 4, total_iterations=7, shuffle=True)
+    assert isinstance(iterator.data_arrays['image'], np.memmap)
+    for batch in iterator:
+        np.testing.assert_array_equal(batch['image'], data['image']['data'][batch['label']])
+
+    sequence = np.arange(40)
+    np.save(str(tmpdir.join('sequence.npy')), sequence)
+    iterator = SequentialArrayIterator({'inp_txt': str(tmpdir.join('sequence.npy')),
+                                        'tgt_txt': sequence + 1},
+                                       time_steps=5, batch_size=2, shuffle=False)
+    for batch in iterator:
+        np.testing.assert_array_equal(batch['inp_txt'] + 1, batch['tgt_txt'])
+
+
+def test_sequential_windows():
+    data = {'inp_txt': np.arange(48), 'tgt_txt': np.arange(96).reshape(48, 2)}
+    for shuffle in (False, True):
+        iterator = SequentialArrayIterator(data, time_steps=4, batch_size=3, stride=2,
+                                           total_iterations=12, shuffle=shuffle)
+        for i, batch in enumerate(iterator):
+            for b in range(3):
+                if shuffle:
+                    start = i * 2 + b * iterator.nbatches * 4
+                else:
+                    start = (i * 3 + b) * 2
+                idcs = np.arange(start, start + 4) % 48
+                np.testing.assert_array_equal(batch['inp_txt'][b], data['inp_txt'][idcs])
+                np.testing.assert_array_equal(batch['tgt_txt'][b], data['tgt_txt'][idcs])
+
+
+def test_shards():
+    data = make_data(11)
+    for shuffle in (False, True):
+        shards = [ArrayIterator(data, 5, total_iterations=2, shuffle=shuffle, num_shards=2,
+                                shard_index=i) for i in range(2)]
+        epochs = [[np.array(batch['label']) for batch in shard] for shard in shards]
+        for epoch in range(2):
+            labels = np.concatenate([shard_epochs[epoch] for shard_epochs in epochs])
+            if shuffle:
+                order = np.random.RandomState(epoch).permutation(11)[:10]
+            else:
+                order = np.arange(10)
+            np.testing.assert_array_equal(labels, order)
+
+    iterator = SequentialArrayIterator({'inp_txt': np.arange(40), 'tgt_txt': np.arange(40)},
+                                       time_steps=5, batch_size=2, shuffle=False,
+                                       num_shards=2, shard_index=1)
+    assert next(iter(iterator))['inp_txt'][0][0] == 20
+
+
+def test_bucket_iterator():
+    sequences = [list(range(1, length + 1)) for length in range(1, 21)]
+    data = {'review': {'data': sequences, 'axes': ('N', 'REC')},
+            'label': {'data': np.arange(20), 'axes': ('N',)}}
+    iterator = BucketIterator(data, 3, [5, 10, 15], total_iterations=20, seed=0)
+    # five, five and ten sequences in the buckets
+    assert iterator.nbatches == 2 + 2 + 4
+    placeholders = iterator.make_placeholders()
+    assert sorted(placeholders) == [5, 10, 15]
+    assert placeholders[10]['review'].axes.lengths == (3, 10)
+
+    epoch = []
+    for batch in iterator:
+        length = batch['review'].shape[1]
+        for review, label in zip(batch['review'], batch['label']):
+            sequence = sequences[label][-length:]
+            assert length == min(n for n in (5, 10, 15) if n >= len(sequence))
+            np.testing.assert_array_equal(review[length - len(sequence):], sequence)
+            assert not review[:length - len(sequence)].any()
+        epoch.extend(batch['label'])
+        if len(epoch) == 3 * iterator.nbatches:
+            assert set(epoch) == set(range(20))
+            epoch = []
@@ -0,0 +1,95 @@
+# ******************************************************************************
+# Copyright 2017-2018 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ******************************************************************************
+import os
+
+import numpy as np
+import pytest
+
+from neon.frontend import ArrayIterator, AugmentedIterator, ImageAugmentation
+
+
+class FailingAugmentation(ImageAugmentation):
+    def __call__(self, images, out, rng):
+        raise ValueError('cannot augment')
+
+
+class ExitingAugmentation(ImageAugmentation):
+    def __call__(self, images, out, rng):
+        os._exit(3)
+
+
+def make_images(ndata=10):
+    images = np.arange(ndata * 3 * 4 * 4, dtype=np.uint8).reshape(ndata, 3, 4, 4)
+    return {'image': {'data': images, 'axes': ('N', 'C', 'H', 'W')},
+            'label': {'data': np.arange(ndata), 'axes': ('N',)}}
+
+
+def test_image_augmentation():
+    images = make_images()['image']['data']
+    augment = ImageAugmentation(padding=1, flip=True, mean=[1, 2, 3])
+    out = np.empty(images.shape, dtype=np.float32)
+    augment(images, out, np.random.RandomState(0))
+
+    padded = np.pad(images, ((0, 0), (0, 0), (1, 1), (1, 1)), mode='constant')
+    mean = np.array([1, 2, 3], dtype=np.float32).reshape(3, 1, 1)
+    for image, crop in zip(padded, out):
+        windows = [image[:, y:y + 4, x:x + 4] for y in range(3) for x in range(3)]
+        windows += [window[..., ::-1] for window in windows]
+        assert any(np.array_equal(crop + mean, window) for window in windows)
+
+
+def test_augmented_iterator():
+    augment = ImageAugmentation(crop_shape=(2, 3), flip=True)
+    iterator = AugmentedIterator(ArrayIterator(make_images(), 4, total_iterations=5), augment,
+                                 num_workers=2, depth=3, seed=7)
+    try:
+        placeholders = iterator.make_placeholders()
+        assert placeholders['image'].axes.lengths == (4, 3, 2, 3)
+
+        for _ in range(2):
+            batches = [{k: np.array(v) for k, v in batch.items()} for batch in iterator]
+            expected = list(ArrayIterator(make_images(), 4, total_iterations=5))
+            assert len(batches) == len(expected)
+            for i, (batch, source) in enumerate(zip(batches, expected)):
+                out = np.empty((4, 3, 2, 3), dtype=np.float32)
+                augment(source['image'], out, np.random.RandomState(7 + i))
+                np.testing.assert_array_equal(batch['image'], out)
+                np.testing.assert_array_equal(batch['label'], source['label'])
+                assert batch['iteration'] == source['iteration']
+            iterator.reset()
+    finally:
+        iterator.close()
+
+
+def test_worker_exception_is_raised():
+    iterator = AugmentedIterator(ArrayIterator(make_images(), 4, total_iterations=2),
+                                 FailingAugmentation(), num_workers=1, depth=1)
+    try:
+        with pytest.raises(ValueError):
+            next(iterator)
+    finally:
+        iterator.close()
+
+
+def test_worker_exit_is_raised():
+    iterator = AugmentedIterator(ArrayIterator(make_images(), 4, total_iterations=2),
+                                 ExitingAugmentation(), num_workers=1, depth=1,
+                                 poll_interval=0.05)
+    try:
+        with pytest.raises(RuntimeError):
+            next(iterator)
+    finally:
+        iterator.close()
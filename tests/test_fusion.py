@@ -0,0 +1,88 @@
+# ******************************************************************************
+# Copyright 2017-2018 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ******************************************************************************
+import neon as ng
+from neon.op_graph.convolution import ConvDerivOp, ConvolutionOp, DeconvolutionOp
+from neon.op_graph.op_graph import Op
+from neon.op_graph.relu import ReluBpropOp
+from neon.transformers.passes.fusion import ConvolutionFusion
+
+
+def make_conv():
+    N = ng.make_axis(length=2, name='N')
+    C = ng.make_axis(length=3, name='C')
+    K = ng.make_axis(length=4, name='K')
+    H = ng.make_axis(length=5, name='H')
+    W = ng.make_axis(length=5, name='W')
+    R = ng.make_axis(length=3, name='R')
+    S = ng.make_axis(length=3, name='S')
+    H_out = ng.make_axis(length=3, name='H')
+    W_out = ng.make_axis(length=3, name='W')
+
+    inputs = ng.placeholder([N, C, H, W])
+    filters = ng.variable([K, C, R, S], initial_value=0)
+    conv_params = dict(str_h=1, str_w=1, dil_h=1, dil_w=1, pad_h=0, pad_w=0)
+    return conv_params, inputs, filters, ng.make_axes([N, K, H_out, W_out])
+
+
+def make_conv_bias_relu():
+    conv_params, inputs, filters, axes = make_conv()
+    bias = ng.variable([axes[1]], initial_value=0)
+    conv = ng.convolution(conv_params, inputs, filters, axes=axes)
+    output = ng.relu(conv + bias, axes=conv.axes)
+    cost = ng.sum(output, out_axes=())
+    return output, [ng.deriv(cost, filters), ng.deriv(cost, bias)]
+
+
+def test_fuse_bias_and_relu_bprop():
+    output, grads = make_conv_bias_relu()
+    ConvolutionFusion().wrapped_do_pass(ops=[output] + grads)
+
+    fused = output.args[0]
+    assert isinstance(fused, ConvolutionOp)
+    assert len(fused.args) == 3
+    convs = [op for op in Op.ordered_ops([output] + grads) if isinstance(op, ConvolutionOp)]
+    assert convs == [fused]
+    conv_derivs = [op for op in Op.ordered_ops(grads) if isinstance(op, ConvDerivOp)]
+    assert conv_derivs
+    assert all(op.fprop is fused and fused in op.control_deps for op in conv_derivs)
+
+    relu_bprops = [op for op in Op.ordered_ops(grads) if isinstance(op, ReluBpropOp)]
+    assert len(relu_bprops) == 1
+    assert relu_bprops[0].args[0] is output
+
+
+def test_conv_bias_adjoint():
+    conv_params, inputs, filters, axes = make_conv()
+    bias = ng.variable([axes[1]], initial_value=0)
+    conv = ng.convolution(conv_params, inputs, filters, axes=axes, bias=bias)
+    grad = ng.deriv(ng.sum(conv, out_axes=()), bias)
+    assert grad.axes == bias.axes
+
+
+def test_fold_slice_into_deconv_padding():
+    conv_params, outputs, filters, axes = make_conv()
+    deconv_filters = ng.variable([axes[1], outputs.axes[1]] + list(filters.axes[2:]),
+                                 initial_value=0)
+    inputs = ng.placeholder(axes)
+    deconv = ng.deconvolution(conv_params, inputs, deconv_filters, axes=outputs.axes)
+    output = ng.exp(ng.tensor_slice(deconv, [slice(None), slice(None), slice(1, 4), slice(0, 4)]))
+    ConvolutionFusion().wrapped_do_pass(ops=[output])
+
+    cropped = output.args[0]
+    assert isinstance(cropped, DeconvolutionOp)
+    assert cropped.axes.lengths == (2, 3, 3, 4)
+    assert (cropped.conv_params['pad_h_below'], cropped.conv_params['pad_h_above']) == (1, 1)
+    assert (cropped.conv_params['pad_w_below'], cropped.conv_params['pad_w_above']) == (0, 1)
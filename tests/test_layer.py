@@ -0,0 +1,97 @@
+# ******************************************************************************
+# Copyright 2017-2018 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ******************************************************************************
+import neon as ng
+from neon.frontend import Affine, Convolution, GaussianInit, Layer, Logistic, LSTM, Rectlin, \
+    Tanh
+from neon.frontend.layer import RNNCell, unroll
+from neon.op_graph.convolution import ConvolutionOp
+from neon.op_graph.op_graph import Op, DotOp, IndexOp, Multiply
+
+
+def output_ops(output, op_type):
+    return [op for op in Op.ordered_ops([output]) if isinstance(op, op_type)]
+
+
+def computed_over(output, axes):
+    """
+    Ops other than the convolution or dot computing a tensor with the given axes.
+    """
+    return [op for op in Op.ordered_ops([output])
+            if op.args and op.axes.is_equal_set(axes)
+            and not isinstance(op, (IndexOp, ConvolutionOp, DotOp))]
+
+
+def test_fold_batch_norm_into_convolution():
+    N = ng.make_axis(length=2, name='N')
+    C = ng.make_axis(length=3, name='C')
+    H = ng.make_axis(length=8, name='H')
+    W = ng.make_axis(length=8, name='W')
+    x = ng.placeholder([N, C, H, W])
+    conv = Convolution((3, 3, 4), filter_init=GaussianInit(), batch_norm=True)
+    conv(x)
+    with Layer.inference_mode_on():
+        output = conv(x)
+
+    convs = output_ops(output, ConvolutionOp)
+    assert len(convs) == 1
+    assert len(convs[0].args) == 3
+    assert computed_over(output, output.axes) == []
+
+
+def test_fold_batch_norm_into_affine():
+    F = ng.make_axis(length=5, name='F')
+    N = ng.make_axis(length=2, name='N')
+    x = ng.placeholder([F, N])
+    affine = Affine(weight_init=GaussianInit(), nout=6, batch_norm=True, activation=Rectlin())
+    affine(x)
+    with Layer.inference_mode_on():
+        output = affine(x)
+
+    dot = output_ops(output, DotOp)[0]
+    assert isinstance(dot.args[0], Multiply)
+    # the shift and the activation are the only elementwise ops left over the activations
+    leftover = computed_over(output, output.axes)
+    assert sorted(type(op).__name__ for op in leftover) == ['Add', 'ReluOp']
+
+
+def make_sequence():
+    F = ng.make_axis(length=5, name='F')
+    T = ng.make_axis(length=4, name='REC')
+    N = ng.make_axis(length=2, name='N')
+    return ng.placeholder([F, T, N])
+
+
+def test_lstm_fused_gates():
+    x = make_sequence()
+    lstm = LSTM(6, GaussianInit(), activation=Tanh(), gate_activation=Logistic())
+    output = lstm(x)
+    # one dot for the input projection of the whole sequence and one per step
+    dots = output_ops(output, DotOp)
+    assert len(dots) == 1 + 4
+    assert len([dot for dot in dots if dot.axes.recurrent_axis() is not None]) == 1
+    grad = ng.deriv(ng.sum(output, out_axes=()), lstm.W_recur['f'])
+    assert grad.axes == lstm.W_recur['f'].axes
+
+    unfused = LSTM(6, GaussianInit(), activation=Tanh(), gate_activation=Logistic(),
+                   fuse_gates=False)
+    assert len(output_ops(unfused(x), DotOp)) == 4 * (1 + 4)
+
+
+def test_unroll_rnn_cell():
+    output = unroll(RNNCell(6, GaussianInit(), activation=Tanh()), 4, make_sequence())
+    assert output.axes.lengths == (6, 4, 2)
+    # the input and recurrent dots of each step
+    assert len(output_ops(output, DotOp)) == 2 * 4
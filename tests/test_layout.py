@@ -0,0 +1,115 @@
+# ******************************************************************************
+# Copyright 2017-2018 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ******************************************************************************
+import neon as ng
+from neon.frontend import Affine, ConstantInit, GaussianInit, Sequential
+from neon.op_graph.op_graph import Op, DotOp, ReorderAxes
+from neon.transformers.passes import layout
+
+
+class LayoutHooks(object):
+    get_layouts = staticmethod(layout.get_layouts)
+    get_layout_change_cost_function = staticmethod(layout.get_layout_change_cost_function)
+
+
+def make_dot(batch_size):
+    F_in = ng.make_axis(length=256, name='F_in')
+    F_out = ng.make_axis(length=256, name='F_out')
+    N = ng.make_axis(length=batch_size, name='N')
+    W = ng.variable([F_out, F_in], initial_value=0)
+    delta = ng.placeholder([F_out, N])
+    # backprop to the input of a linear layer: W needs a transpose for dot(W, delta)
+    return ng.dot(W, delta)
+
+
+def transposes(ops):
+    """
+    Counts the transposes the backend does for ops, and the bytes they move.
+    """
+    count, nbytes = 0, 0
+    for op in Op.ordered_ops(ops):
+        if isinstance(op, DotOp):
+            for arg, axes in zip(op.args, layout.dot_input_axes(*op.args)):
+                if arg.axes != axes:
+                    count += 1
+                    nbytes += layout.tensor_bytes(arg)
+        elif isinstance(op, ReorderAxes) and op.axes != op.args[0].axes:
+            count += 1
+            nbytes += layout.tensor_bytes(op)
+    return count, nbytes
+
+
+def test_swap_small_batch():
+    op = make_dot(2)
+    W, delta = op.args
+    default, swapped = layout.get_layouts(op)
+    constraint = layout.get_layout_change_cost_function(op, W)
+    assert constraint.get_cost(layout.get_layouts(W)[0], swapped) < \
+        constraint.get_cost(layout.get_layouts(W)[0], default)
+
+    result = ng.exp(op)
+    layout.DotLayoutPass(LayoutHooks()).wrapped_do_pass(ops=[result])
+
+    result = result.forwarded
+    assert result.axes == op.axes
+    # delta and the result are transposed instead of W
+    count, nbytes = transposes([result])
+    assert count == 2
+    assert nbytes < layout.tensor_bytes(W)
+    swapped = [dot for dot in Op.ordered_ops([result]) if isinstance(dot, DotOp)]
+    assert len(swapped) == 1
+    assert swapped[0].args[0].args[0].tensor is delta.tensor
+
+
+def test_keep_large_batch():
+    op = make_dot(1024)
+    result = ng.exp(op)
+    layout.DotLayoutPass(LayoutHooks()).wrapped_do_pass(ops=[result])
+
+    assert result.args[0] is op
+
+
+def test_fold_consumer_reorder():
+    op = make_dot(1024)
+    result = ng.axes_with_order(op, op.y_out_axes + op.x_out_axes)
+    layout.DotLayoutPass(LayoutHooks()).wrapped_do_pass(ops=[result])
+
+    swapped = result.forwarded
+    assert isinstance(swapped, DotOp)
+    assert swapped.axes == result.axes
+
+
+def make_affine_stack(batch_size):
+    F = ng.make_axis(length=256, name='F')
+    N = ng.make_axis(length=batch_size, name='N')
+    x = ng.placeholder([F, N])
+    layers = Sequential([Affine(nout=nout, weight_init=GaussianInit(), bias_init=ConstantInit())
+                         for nout in (512, 256, 512, 64)])
+    out = layers(x)
+    cost = ng.sum(out * out, out_axes=())
+    return ng.deriv(cost, x)
+
+
+def test_affine_stack_propagates_layout():
+    # every dot backpropagating to the input of a layer transposes its weights; computing
+    # them all swapped transposes the small deltas only at the ends of the stack
+    before = transposes([make_affine_stack(4)])
+    grad = make_affine_stack(4)
+    layout.DotLayoutPass(LayoutHooks()).wrapped_do_pass(ops=[grad])
+    after = transposes([grad.forwarded])
+
+    assert before[0] == 4
+    assert after[0] == 2
+    assert after[1] * 100 < before[1]
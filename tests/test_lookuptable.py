@@ -0,0 +1,68 @@
+# ******************************************************************************
+# Copyright 2017-2018 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ******************************************************************************
+import pytest
+
+import neon as ng
+from neon.frontend import Adam, GradientDescentMomentum, RMSProp
+from neon.op_graph.lookuptable import scatter_add_lut, update_lut
+from neon.op_graph.op_graph import Op
+
+
+@pytest.fixture
+def axes():
+    return (ng.make_axis(length=10, name='V'), ng.make_axis(length=4, name='F'),
+            ng.make_axis(length=3, name='N'), ng.make_axis(length=2, name='T'))
+
+
+def test_multi_axis_index(axes):
+    V, F, N, T = axes
+    lut = ng.variable([V, F], initial_value=0.)
+    idx = ng.placeholder([N, T])
+    assert ng.lookuptable(lut, idx, [N, T, F]).lut_axis == 0
+    assert ng.lookuptable(ng.variable([F, V], initial_value=0.), idx, [F, N, T]).lut_axis == 1
+    with pytest.raises(ValueError):
+        ng.lookuptable(lut, idx, [T, N, F])
+    with pytest.raises(ValueError):
+        ng.lookuptable(lut, idx, [N, F, T])
+
+
+def updated_ops(axes, optimizer=None):
+    V, F, N, T = axes
+    lut = ng.variable([V, F], initial_value=0.)
+    idx = ng.placeholder([N, T])
+    lookups = ng.lookuptable(lut, idx, [N, T, F]) + ng.lookuptable(lut, idx, [N, T, F])
+    cost = ng.sum(lookups * lookups, out_axes=())
+    if optimizer is None:
+        optimizer = GradientDescentMomentum(0.1)
+    return Op.ordered_ops([optimizer(cost)])
+
+
+def test_row_sparse_update(axes):
+    ops = updated_ops(axes)
+    assert len([op for op in ops if isinstance(op, scatter_add_lut)]) == 2
+    assert not any(isinstance(op, update_lut) for op in ops)
+
+
+@pytest.mark.parametrize('optimizer', [
+    lambda: GradientDescentMomentum(0.1, momentum_coef=0.9),
+    # their state decays for every row at each step
+    lambda: RMSProp(),
+    lambda: Adam(),
+])
+def test_dense_update(axes, optimizer):
+    ops = updated_ops(axes, optimizer())
+    assert not any(isinstance(op, scatter_add_lut) for op in ops)
+    assert any(isinstance(op, update_lut) for op in ops)
@@ -0,0 +1,143 @@
+# ******************************************************************************
+# Copyright 2017-2018 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ******************************************************************************
+import os
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from neon.frontend import ManifestDataLoader
+from neon.frontend.manifestloader import read_manifest, write_manifest_shard
+
+
+def write_dataset(tmpdir, ndata=6):
+    images = np.random.RandomState(0).randint(0, 256, size=(ndata, 8, 8, 3)).astype(np.uint8)
+    records = [('@FILE', 'STRING')]
+    for idx, image in enumerate(images):
+        fname = str(tmpdir.join('{}.png'.format(idx)))
+        Image.fromarray(image).save(fname, format='PNG')
+        records.append((os.path.basename(fname), idx % 3))
+    manifest = str(tmpdir.join('train-index.csv'))
+    np.savetxt(manifest, records, fmt='%s\t%s')
+    return manifest, images.transpose(0, 3, 1, 2), np.arange(ndata) % 3
+
+
+def make_config(manifest, cache_directory=''):
+    return {'manifest_filename': manifest,
+            'manifest_root': os.path.dirname(manifest),
+            'batch_size': 4,
+            'cache_directory': cache_directory,
+            'etl': [{'type': 'image', 'height': 8, 'width': 8},
+                    {'type': 'label', 'binary': False}],
+            'iteration_mode': 'ONCE'}
+
+
+def test_manifest_loader(tmpdir):
+    manifest, images, labels = write_dataset(tmpdir)
+    cache = tmpdir.mkdir('cache')
+    for _ in range(2):
+        loader = ManifestDataLoader(make_config(manifest, str(cache)), num_workers=2)
+        assert loader.ndata == 6
+        placeholders = loader.make_placeholders()
+        assert placeholders['image'].axes.lengths == (4, 3, 8, 8)
+
+        batches = list(loader)
+        assert len(batches) == 2
+        order = np.arange(8) % 6
+        np.testing.assert_array_equal(np.concatenate([b['image'] for b in batches]),
+                                      images[order])
+        np.testing.assert_array_equal(np.concatenate([b['label'] for b in batches]),
+                                      labels[order])
+        assert len(cache.listdir()) == 1
+
+
+def test_manifest_cache_tracks_images(tmpdir):
+    manifest, images, labels = write_dataset(tmpdir)
+    cache = tmpdir.mkdir('cache')
+    list(ManifestDataLoader(make_config(manifest, str(cache)), num_workers=1))
+    changed = images[0, :, ::-1]
+    Image.fromarray(changed.transpose(1, 2, 0)).save(str(tmpdir.join('0.png')), format='PNG')
+    os.utime(str(tmpdir.join('0.png')), (0, 0))
+    loader = ManifestDataLoader(make_config(manifest, str(cache)), num_workers=1)
+    batches = list(loader)
+    assert len(cache.listdir()) == 2
+    np.testing.assert_array_equal(batches[0]['image'][0], changed)
+
+
+def test_manifest_cache_failed_decode(tmpdir):
+    manifest, images, labels = write_dataset(tmpdir)
+    cache = tmpdir.mkdir('cache')
+    tmpdir.join('5.png').write('not an image')
+    loader = ManifestDataLoader(make_config(manifest, str(cache)), num_workers=1)
+    next(loader)
+    with pytest.raises(IOError):
+        next(loader)
+    assert cache.listdir() == []
+
+
+def test_manifest_decodes_minibatches(tmpdir):
+    manifest, images, labels = write_dataset(tmpdir)
+    cache = tmpdir.mkdir('cache')
+    loader = ManifestDataLoader(make_config(manifest, str(cache)), num_workers=1)
+    assert cache.listdir() == []
+
+    batch = next(loader)
+    np.testing.assert_array_equal(batch['image'], images[:4])
+    decoded = loader._dataloader.data_arrays['image'].decoded
+    np.testing.assert_array_equal(decoded, [True] * 4 + [False] * 2)
+    assert [f.basename.startswith('decoded-') and '.partial-' in f.basename
+            for f in cache.listdir()] == [True]
+
+    batch = next(loader)
+    np.testing.assert_array_equal(batch['image'], images[[4, 5, 0, 1]])
+    assert [f.ext for f in cache.listdir()] == ['.npy']
+
+
+def test_manifest_decodes_without_cache(tmpdir):
+    manifest, images, labels = write_dataset(tmpdir)
+    loader = ManifestDataLoader(make_config(manifest), num_workers=1)
+    for _ in range(2):
+        batches = list(loader)
+        loader.reset()
+        np.testing.assert_array_equal(np.concatenate([b['image'] for b in batches]),
+                                      images[np.arange(8) % 6])
+
+
+def test_manifest_loader_augmentation(tmpdir):
+    manifest, images, labels = write_dataset(tmpdir)
+    config = make_config(manifest)
+    config['augmentation'] = [{'type': 'image', 'padding': 2, 'flip_enable': True}]
+    config['iteration_mode'] = 'COUNT'
+    config['iteration_mode_count'] = 5
+    loader = ManifestDataLoader(config, num_workers=1)
+    batches = list(loader)
+    assert len(batches) == 5
+    assert batches[0]['image'].shape == (4, 3, 8, 8)
+    assert batches[0]['image'].dtype == np.uint8
+
+
+def test_manifest_shards(tmpdir):
+    manifest, images, labels = write_dataset(tmpdir, ndata=9)
+    shards = [write_manifest_shard(manifest, 2, i, seed=3) for i in range(2)]
+    records = [read_manifest(shard, str(tmpdir))[0] for shard in shards]
+    assert [len(shard_records) for shard_records in records] == [4, 4]
+    assert not set(records[0]) & set(records[1])
+
+    config = make_config(manifest)
+    config['random_seed'] = 3
+    loader = ManifestDataLoader(config, num_workers=1, num_shards=2, shard_index=1)
+    assert loader.ndata == 4
+    assert [path for path, _ in zip(*read_manifest(shards[1], str(tmpdir)))] == records[1]
@@ -0,0 +1,56 @@
+# ******************************************************************************
+# Copyright 2017-2018 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ******************************************************************************
+import neon as ng
+from neon.analysis import estimate_memory
+from neon.op_graph.op_graph import Op
+from neon.util.names import name_scope
+
+
+def test_chain_peak():
+    N = ng.make_axis(length=8, name='N')
+    F = ng.make_axis(length=4, name='F')
+    x = ng.placeholder([F, N])
+    with name_scope('first'):
+        a = ng.exp(x)
+    with name_scope('second'):
+        b = ng.log(a)
+    with name_scope('third'):
+        c = ng.negative(b)
+
+    estimate = estimate_memory([c])
+    tensor_bytes = 8 * 4 * 4
+
+    # Each op only needs its input and output live
+    assert estimate.peak_bytes == 2 * tensor_bytes
+    assert estimate.persistent_bytes == tensor_bytes
+    assert dict(estimate.top_scopes()) == {'first': tensor_bytes, 'second': tensor_bytes}
+
+    assert estimate_memory([c], batch_size=32).peak_bytes == 4 * 2 * tensor_bytes
+
+
+def test_fan_out_peak():
+    N = ng.make_axis(length=8, name='N')
+    x = ng.placeholder([N])
+    a = ng.exp(x)
+    b = ng.log(x)
+    c = a + b
+
+    estimate = estimate_memory([c])
+    ordered_ops = Op.ordered_ops([c])
+    assert len(estimate.live_sets) == len(ordered_ops)
+    # a and b are both live when c is computed
+    assert estimate.peak_bytes == 3 * 8 * 4
+    assert estimate.peak_op is c
@@ -16,6 +16,7 @@
 import pytest
 
 import neon as ng
+from neon.op_graph.op_graph import Op, Equal, Subtract
 
 
 @pytest.fixture()
@@ -115,3 +116,18 @@ def test_tensor_slice():
     assert x[:5].axes.full_lengths == (5, 20, 5)
     assert x[:, 2:7].axes.full_lengths == (10, 5, 5)
     assert x[:5, :, :-1].axes.full_lengths == (5, 20, 4)
+
+
+def test_softmax_cross_entropy_gradient():
+    C = ng.make_axis(length=10, name='C')
+    N = ng.make_axis(length=4, name='N')
+    W = ng.variable([C], initial_value=0)
+    logits = ng.placeholder([C, N]) * W
+    targets = ng.placeholder([C, N])
+    probs = ng.softmax(logits, normalization_axes=[C])
+    cost = ng.sum(ng.cross_entropy_multi(probs, targets), out_axes=())
+
+    grad_ops = set(Op.ordered_ops([ng.deriv(cost, W)])) - set(Op.ordered_ops([cost]))
+    # the adjoint of the logits is (p - t) * delta, without the adjoint of the softmax max
+    assert not any(isinstance(op, Equal) for op in grad_ops)
+    assert any(isinstance(op, Subtract) and op.args[0] is probs for op in grad_ops)
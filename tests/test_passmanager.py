@@ -0,0 +1,115 @@
+# ******************************************************************************
+# Copyright 2017-2018 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ******************************************************************************
+import neon as ng
+from neon.op_graph.op_graph import Op, NegativeOp
+from neon.transformers.passes.passes import PeepholeGraphPass
+from neon.transformers.passes import passmanager
+from neon.transformers.passes.passmanager import PassManager
+from neon.util.generics import generic_method
+
+
+class DoubleNegationPass(PeepholeGraphPass):
+    """
+    Replaces -(-x) with x.
+    """
+
+    def cache_key(self):
+        return ()
+
+    @generic_method(dispatch_base_type=Op)
+    def visit(self, op, *args):
+        pass
+
+    @visit.on_type(NegativeOp)
+    def visit(self, op, x):
+        if isinstance(x, NegativeOp):
+            self.replace_op(op, x.args[0])
+
+
+def make_graph():
+    N = ng.make_axis(length=4)
+    x = ng.placeholder([N])
+    return [ng.exp(-(-x))]
+
+
+def test_pass_record():
+    ops = make_graph()
+    manager = PassManager()
+    record = manager.run_pass(DoubleNegationPass(), ops)
+
+    assert not record.skipped
+    assert record.name == 'DoubleNegationPass'
+    assert record.replacements == 1
+    assert record.ops_after == record.ops_before - 2
+    assert len(manager.tracker.events) == 1
+    assert manager.tracker.events[0]['args']['replacements'] == 1
+    assert 'DoubleNegationPass' in manager.report()
+
+
+def test_skip_processed_graph():
+    ops = make_graph()
+    manager = PassManager()
+    # passes are created anew for every computation, so the cache is keyed by their type
+    manager.run_passes([DoubleNegationPass(), DoubleNegationPass()], ops)
+
+    assert [record.skipped for record in manager.records] == [False, True]
+
+    manager = PassManager(enable_cache=False)
+    manager.run_passes([DoubleNegationPass(), DoubleNegationPass()], ops)
+
+    assert [record.skipped for record in manager.records] == [False, False]
+
+
+def test_uncacheable_pass_always_runs(monkeypatch):
+    class UncacheablePass(DoubleNegationPass):
+        def cache_key(self):
+            return None
+
+    fingerprints = []
+    monkeypatch.setattr(passmanager, 'graph_fingerprint',
+                        lambda ops: fingerprints.append(ops))
+    ops = make_graph()
+    manager = PassManager()
+    manager.run_passes([UncacheablePass(), UncacheablePass()], ops)
+
+    assert [record.skipped for record in manager.records] == [False, False]
+    assert [record.replacements for record in manager.records] == [1, 0]
+    assert fingerprints == []
+
+
+def test_only_consumers_revisited():
+    N = ng.make_axis(length=4)
+    x = ng.placeholder([N])
+    y = ng.placeholder([N])
+    folded = ng.exp(-(-x))
+    untouched = y
+    for _ in range(10):
+        untouched = ng.exp(untouched)
+    ops = [folded, untouched]
+    num_ops = len(Op.ordered_ops(ops))
+
+    visited = []
+
+    class RecordingPass(DoubleNegationPass):
+        def process_op(self, op):
+            visited.append(op)
+            super(RecordingPass, self).process_op(op)
+
+    RecordingPass().wrapped_do_pass(ops=ops)
+
+    assert folded.args[0].tensor is x
+    assert visited.count(folded) == 2
+    assert len(visited) == num_ops + 1
@@ -0,0 +1,94 @@
+# ******************************************************************************
+# Copyright 2017-2018 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ******************************************************************************
+import os
+
+import numpy as np
+import pytest
+
+from neon.frontend.data.shakespeare import Shakespeare
+from neon.util.persist import load_data_cache
+
+
+@pytest.fixture
+def cache_dir(tmpdir, monkeypatch):
+    monkeypatch.setenv('NGRAPH_DATA_CACHE_DIR', str(tmpdir.join('cache')))
+    return tmpdir
+
+
+def make_dataset():
+    train = {'image': {'data': np.arange(24, dtype=np.float32).reshape(2, 3, 4),
+                       'axes': ('N', 'H', 'W')}}
+    return train, {'vocab': [u'a', u'b'], 'sizes': [1, 2]}
+
+
+def test_load_data_cache(cache_dir):
+    source = cache_dir.join('source.txt')
+    source.write('abc')
+    calls = []
+
+    def build():
+        calls.append(None)
+        return make_dataset()
+
+    expected = make_dataset()
+    first = load_data_cache('test', [str(source)], build, split=0.5)
+    second = load_data_cache('test', [str(source)], build, split=0.5)
+    assert len(calls) == 1
+    assert isinstance(second, tuple)
+    assert second[0]['image']['axes'] == ('N', 'H', 'W')
+    for dataset in (first, second):
+        assert isinstance(dataset[0]['image']['data'], np.memmap)
+        assert dataset[0]['image']['data'].flags.writeable
+        np.testing.assert_array_equal(dataset[0]['image']['data'],
+                                      expected[0]['image']['data'])
+        assert dataset[1] == expected[1]
+
+    load_data_cache('test', [str(source)], build, split=0.25)
+    assert len(calls) == 2
+    source.write('abcd')
+    load_data_cache('test', [str(source)], build, split=0.5)
+    assert len(calls) == 3
+
+
+def test_load_data_cache_failure(cache_dir):
+    def build():
+        return {'data': np.zeros(3), 'bad': object()}
+
+    with pytest.raises(TypeError):
+        load_data_cache('test', [], build)
+    assert os.listdir(str(cache_dir.join('cache', 'datasets'))) == []
+
+
+def test_no_cache_dir(monkeypatch):
+    monkeypatch.delenv('NGRAPH_DATA_CACHE_DIR', raising=False)
+    calls = []
+    for _ in range(2):
+        load_data_cache('test', [], lambda: calls.append(None))
+    assert len(calls) == 2
+
+
+def test_shakespeare_cache(cache_dir):
+    cache_dir.join('text.txt').write('to be, or not to be: that is the question')
+    built = Shakespeare(path=str(cache_dir), url='unused', filename='text.txt',
+                        train_split=.5)
+    cached = Shakespeare(path=str(cache_dir), url='unused', filename='text.txt',
+                         train_split=.5)
+    assert len(os.listdir(str(cache_dir.join('cache', 'datasets')))) == 1
+    assert cached.vocab == built.vocab
+    assert cached.token_to_index == built.token_to_index
+    assert cached.index_to_token == built.index_to_token
+    np.testing.assert_array_equal(cached.train, built.train)
+    np.testing.assert_array_equal(cached.test, built.test)
@@ -0,0 +1,79 @@
+# ******************************************************************************
+# Copyright 2017-2018 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ******************************************************************************
+import numpy as np
+import pytest
+
+import neon as ng
+from neon.frontend import Dropout
+from neon.op_graph.op_graph import Op, AssignableTensorOp, RngOp
+from neon.util.philox import philox, philox_normal, philox_uniform, step_words, stream_key
+
+
+# known answers of Philox4x32-10 from the Random123 distribution
+@pytest.mark.parametrize('counter,key,expected', [
+    ((0, 0, 0, 0), (0, 0),
+     (0x6627e8d5, 0xe169c58d, 0xbc57ac4c, 0x9b00dbd8)),
+    ((0xffffffff, 0xffffffff, 0xffffffff, 0xffffffff), (0xffffffff, 0xffffffff),
+     (0x408f276d, 0x41c83b0e, 0xa20bc7c6, 0x6d5451fd)),
+    ((0x243f6a88, 0x85a308d3, 0x13198a2e, 0x03707344), (0xa4093822, 0x299f31d0),
+     (0xd16cfe09, 0x94fdcceb, 0x5001e420, 0x24126ea1)),
+])
+def test_philox_known_answers(counter, key, expected):
+    assert tuple(int(x) for x in philox(counter, key)) == expected
+
+
+def test_step_counter_is_not_truncated():
+    assert step_words((1 << 32) + 5) == (5, 1)
+    key = stream_key(1, 0)
+    assert not np.array_equal(philox_uniform((10,), key, step=1 << 24),
+                              philox_uniform((10,), key, step=0))
+    assert not np.array_equal(philox_uniform((10,), key, step=1 << 32),
+                              philox_uniform((10,), key, step=0))
+
+
+def test_uniform_reproducible():
+    key = stream_key(1, 0)
+    u = philox_uniform((100, 10), key, step=3)
+    np.testing.assert_array_equal(u, philox_uniform((100, 10), key, step=3))
+    assert not np.array_equal(u, philox_uniform((100, 10), key, step=4))
+    assert not np.array_equal(u, philox_uniform((100, 10), stream_key(1, 1), step=3))
+    assert not np.array_equal(u, philox_uniform((100, 10), stream_key(2, 0), step=3))
+
+
+def test_distributions():
+    key = stream_key(0, 0)
+    u = philox_uniform((100000,), key, step=0, low=-1.0, high=3.0)
+    assert -1.0 <= u.min() and u.max() < 3.0
+    assert abs(u.mean() - 1.0) < 0.02
+    assert abs(np.corrcoef(u, philox_uniform((100000,), key, step=1, low=-1.0, high=3.0))[0, 1]
+               ) < 0.02
+
+    z = philox_normal((100000,), key, step=0, loc=1.0, scale=2.0)
+    assert abs(z.mean() - 1.0) < 0.05
+    assert abs(z.std() - 2.0) < 0.05
+
+
+def test_dropout_mask_has_no_host_tensor():
+    F = ng.make_axis(length=8, name='F')
+    N = ng.make_axis(length=4, name='N')
+    x = ng.placeholder([F, N])
+    output = Dropout(keep=0.5)(x)
+
+    ops = Op.ordered_ops([output])
+    rngs = [op for op in ops if isinstance(op, RngOp)]
+    assert len(rngs) == 1
+    assert rngs[0].axes == ng.make_axes([F])
+    assert all(op.is_placeholder for op in ops if isinstance(op, AssignableTensorOp))
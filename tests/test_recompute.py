@@ -0,0 +1,116 @@
+# ******************************************************************************
+# Copyright 2017-2018 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ******************************************************************************
+import neon as ng
+from neon.analysis.memory import estimate_memory
+from neon.frontend import GaussianInit, Logistic, LSTM, Tanh
+from neon.op_graph.op_graph import Op, ExpOp
+
+
+def make_chain(length):
+    N = ng.make_axis(length=4)
+    w = ng.variable([N], initial_value=0.5)
+    x = ng.placeholder([N])
+    activations = []
+    h = x * w
+    for _ in range(length):
+        h = ng.exp(h)
+        activations.append(h)
+    return w, activations
+
+
+def backward_ops(cost, w):
+    grad = ng.deriv(cost, w)
+    forward = set(Op.ordered_ops([cost]))
+    return [op for op in Op.ordered_ops([grad]) if op not in forward]
+
+
+def forward_args(ops, forward_ops):
+    return set(arg.forwarded for op in ops for arg in op.args) & set(forward_ops)
+
+
+def test_marked_checkpoints():
+    w, activations = make_chain(6)
+    ng.checkpoint(activations[2])
+    cost = ng.sum(activations[-1], out_axes=())
+    backward = backward_ops(cost, w)
+
+    used = forward_args(backward, activations)
+    assert used == {activations[2]}
+    recomputed = [op for op in backward if isinstance(op, ExpOp)]
+    assert len(recomputed) == len(activations) - 1
+
+
+def test_no_recompute_by_default():
+    w, activations = make_chain(6)
+    cost = ng.sum(activations[-1], out_axes=())
+    backward = backward_ops(cost, w)
+
+    assert forward_args(backward, activations) == set(activations)
+    assert not any(isinstance(op, ExpOp) for op in backward)
+
+
+def test_sqrt_policy():
+    w, activations = make_chain(16)
+    cost = ng.recompute(ng.sum(activations[-1], out_axes=()))
+    backward = backward_ops(cost, w)
+
+    used = forward_args(backward, activations)
+    assert 0 < len(used) < len(activations) // 2
+
+
+def test_recompute_lowers_peak_memory():
+    def peak_bytes(policy):
+        w, activations = make_chain(16)
+        cost = ng.sum(activations[-1], out_axes=())
+        if policy is not None:
+            ng.recompute(cost, policy=policy)
+        return estimate_memory([cost, ng.deriv(cost, w)]).peak_bytes
+
+    assert peak_bytes('sqrt') < peak_bytes(None)
+
+
+def test_recomputed_with_backward_pass():
+    w, activations = make_chain(6)
+    ng.checkpoint(activations[1])
+    ng.checkpoint(activations[3])
+    cost = ng.sum(activations[-1], out_axes=())
+    grad = ng.deriv(cost, w)
+    order = Op.ordered_ops([grad])
+    forward = set(Op.ordered_ops([cost]))
+    copies = [op for op in order if isinstance(op, ExpOp) and op not in forward]
+
+    def copy_of(checkpoint):
+        copy, = [op for op in copies if op.args[0].forwarded is checkpoint]
+        return copy
+
+    # in any schedule, the segment after activations[1] is recomputed once backprop has gone
+    # through the segment after activations[3]
+    later_segment = [op for op in order if op not in forward and op not in copies
+                     and copy_of(activations[3]) in op.args]
+    assert later_segment
+    assert set(later_segment) <= set(Op.ordered_ops([copy_of(activations[1])]))
+
+
+def test_recompute_scan():
+    F = ng.make_axis(length=3, name='F')
+    N = ng.make_axis(length=2, name='N')
+    REC = ng.make_axis(length=5, name='REC')
+    lstm = LSTM(4, GaussianInit(), activation=Tanh(), gate_activation=Logistic(),
+                use_scan=True)
+    output = ng.tanh(lstm(ng.placeholder([F, REC, N])))
+    cost = ng.recompute(ng.sum(output, out_axes=()))
+    grad = ng.deriv(cost, lstm.W_recur['i'])
+    assert grad.axes == lstm.W_recur['i'].axes
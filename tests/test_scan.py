@@ -0,0 +1,76 @@
+# ******************************************************************************
+# Copyright 2017-2018 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ******************************************************************************
+import pytest
+
+import neon as ng
+from neon.frontend import GaussianInit, Logistic, LSTM, Tanh
+from neon.op_graph.op_graph import Op, DotOp
+from neon.op_graph.scan import ScanOp, ScanOutputOp
+from neon.transformers.passes.scan import ScanExpansion
+
+
+def make_rnn(length):
+    F = ng.make_axis(length=3, name='F')
+    N = ng.make_axis(length=2, name='N')
+    REC = ng.make_axis(length=length, name='REC')
+    x = ng.placeholder([F, REC, N])
+    W = ng.variable([ng.make_axis(length=3, name='H'), F], initial_value=0)
+    h_init = ng.constant(0, axes=[F, N])
+
+    def step(inputs, states):
+        h = ng.tanh(ng.cast_role(ng.dot(W, states[0]), states[0].axes) + inputs[0])
+        return [h], [h]
+
+    (h_seq,), (h_last,) = ng.scan(step, [x], [h_init], REC, pos=1)
+    cost = ng.sum(h_seq, out_axes=()) + ng.sum(h_last, out_axes=())
+    return [cost, ng.deriv(cost, W), ng.deriv(cost, x)]
+
+
+def test_scan_graph_size_does_not_grow_with_length():
+    assert len(Op.ordered_ops(make_rnn(3))) == len(Op.ordered_ops(make_rnn(1000)))
+
+
+def test_expand_scan():
+    ops = make_rnn(3)
+    assert [op for op in Op.ordered_ops(ops) if isinstance(op, DotOp)] == []
+    ScanExpansion().wrapped_do_pass(ops=ops)
+
+    ops = Op.ordered_ops(op.forwarded for op in ops)
+    assert [op for op in ops if isinstance(op, (ScanOp, ScanOutputOp))] == []
+    # three forward steps, and for each backward step its recomputation and the derivatives
+    # for W and the state, except the derivative for the constant initial state
+    assert len([op for op in ops if isinstance(op, DotOp)]) == 3 + 3 * 3 - 1
+
+
+def test_scan_second_derivative():
+    cost, dW, dx = make_rnn(3)
+    W, = cost.variables()
+    with pytest.raises(NotImplementedError):
+        ng.deriv(ng.sum(dW * dW, out_axes=()), W)
+
+
+def test_lstm_scan():
+    def lstm_ops(length):
+        F = ng.make_axis(length=3, name='F')
+        N = ng.make_axis(length=2, name='N')
+        REC = ng.make_axis(length=length, name='REC')
+        lstm = LSTM(4, GaussianInit(), activation=Tanh(), gate_activation=Logistic(),
+                    use_scan=True)
+        output = lstm(ng.placeholder([F, REC, N]))
+        assert output.axes.lengths == (4, length, 2)
+        return Op.ordered_ops([ng.deriv(ng.sum(output, out_axes=()), lstm.W_recur['i'])])
+
+    assert len(lstm_ops(5)) == len(lstm_ops(500))
@@ -0,0 +1,50 @@
+# ******************************************************************************
+# Copyright 2017-2018 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ******************************************************************************
+import numpy as np
+import pytest
+
+from neon.frontend.data.imdb import preprocess_text
+from neon.frontend.data.text import lookup, make_vocab
+
+
+def test_char_vocab():
+    vocab, indices = make_vocab(u'the caté sat\n')
+    assert vocab == sorted(set(u'the caté sat\n'))
+    assert [vocab[i] for i in indices] == list(u'the caté sat\n')
+
+    indices = lookup(u'a hat!', vocab, offset=1, unknown=0)
+    expected = [vocab.index(c) + 1 if c in vocab else 0 for c in u'a hat!']
+    np.testing.assert_array_equal(indices, expected)
+
+
+def test_word_vocab():
+    words = 'the cat sat on the mat'.split()
+    vocab, indices = make_vocab(words)
+    assert vocab == sorted(set(words))
+    assert [vocab[i] for i in indices] == words
+
+    np.testing.assert_array_equal(lookup(['mat', 'cat'], vocab), [1, 0])
+    np.testing.assert_array_equal(lookup(['dog', 'zebra'], vocab, unknown=7), [7, 7])
+    with pytest.raises(KeyError):
+        lookup(['the', 'dog'], vocab)
+
+
+def test_preprocess_text():
+    X = [[5, 1, 19997], [], [20000, 3]]
+    expected = [[1, 8, 4, 2], [1], [1, 2, 6]]
+    assert [x.tolist() for x in preprocess_text(X, 20000)] == expected
+    assert [x.tolist() for x in preprocess_text(X, None, start=None)] == \
+        [[8, 4, 20000], [], [2, 6]]
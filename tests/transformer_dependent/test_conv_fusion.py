@@ -0,0 +1,88 @@
+# ******************************************************************************
+# Copyright 2017-2018 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ******************************************************************************
+import numpy as np
+import pytest
+
+import neon as ng
+from neon.testing import ExecutorFactory
+
+pytestmark = pytest.mark.transformer_dependent
+
+
+def conv_bias_relu_reference(x, filters, bias, delta):
+    """
+    Returns relu(conv(x) + bias), and the derivatives of sum(relu(conv(x) + bias) * delta) with
+    respect to x, filters and bias, computed unfused.
+    """
+    height = x.shape[2] - filters.shape[2] + 1
+    width = x.shape[3] - filters.shape[3] + 1
+    conv = np.zeros((x.shape[0], filters.shape[0], height, width))
+    for i in range(height):
+        for j in range(width):
+            window = x[:, :, i:i + filters.shape[2], j:j + filters.shape[3]]
+            conv[:, :, i, j] = np.einsum('ncrs,kcrs->nk', window, filters)
+    pre_activation = conv + bias[:, np.newaxis, np.newaxis]
+    output = np.maximum(pre_activation, 0)
+    grad = delta * (pre_activation > 0)
+
+    dx = np.zeros_like(x)
+    dfilters = np.zeros_like(filters)
+    for i in range(height):
+        for j in range(width):
+            window = (slice(None), slice(None),
+                      slice(i, i + filters.shape[2]), slice(j, j + filters.shape[3]))
+            dx[window] += np.einsum('nk,kcrs->ncrs', grad[:, :, i, j], filters)
+            dfilters += np.einsum('nk,ncrs->kcrs', grad[:, :, i, j], x[window])
+    # the bias is broadcast over the batch and spatial axes
+    dbias = grad.sum(axis=(0, 2, 3))
+    return output, dx, dfilters, dbias
+
+
+@pytest.mark.parametrize('bias_arg', [False, True])
+def test_conv_bias_relu_numeric(bias_arg):
+    rng = np.random.RandomState(0)
+    N = ng.make_axis(length=2, name='N')
+    C = ng.make_axis(length=3, name='C')
+    K = ng.make_axis(length=4, name='K')
+    H = ng.make_axis(length=5, name='H')
+    W = ng.make_axis(length=5, name='W')
+    R = ng.make_axis(length=3, name='R')
+    S = ng.make_axis(length=3, name='S')
+    H_out = ng.make_axis(length=3, name='H')
+    W_out = ng.make_axis(length=3, name='W')
+    conv_params = dict(str_h=1, str_w=1, dil_h=1, dil_w=1, pad_h=0, pad_w=0)
+
+    x_value = rng.uniform(-1, 1, (2, 3, 5, 5))
+    filters_value = rng.uniform(-1, 1, (4, 3, 3, 3))
+    bias_value = rng.uniform(-1, 1, (4,))
+    delta_value = rng.uniform(-1, 1, (2, 4, 3, 3))
+    x = ng.variable([N, C, H, W], initial_value=x_value)
+    filters = ng.variable([K, C, R, S], initial_value=filters_value)
+    bias = ng.variable([K], initial_value=bias_value)
+    axes = ng.make_axes([N, K, H_out, W_out])
+    if bias_arg:
+        conv = ng.convolution(conv_params, x, filters, axes=axes, bias=bias)
+    else:
+        # the pattern ConvolutionFusion folds into a convolution with a bias
+        conv = ng.convolution(conv_params, x, filters, axes=axes) + bias
+    output = ng.relu(conv, axes=axes)
+    cost = ng.sum(output * ng.constant(delta_value, axes), out_axes=())
+
+    with ExecutorFactory() as ex:
+        result = ex.executor([output] + [ng.deriv(cost, v) for v in (x, filters, bias)])()
+    expected = conv_bias_relu_reference(x_value, filters_value, bias_value, delta_value)
+    for value, expected_value in zip(result, expected):
+        np.testing.assert_allclose(value, expected_value, rtol=1e-5, atol=1e-5)
@@ -0,0 +1,85 @@
+# ******************************************************************************
+# Copyright 2017-2018 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ******************************************************************************
+import numpy as np
+import pytest
+
+import neon as ng
+from neon.testing import ExecutorFactory
+
+pytestmark = pytest.mark.transformer_dependent
+
+
+def deconv_reference(x, filters, delta, conv_params, out_shape):
+    """
+    Returns the deconvolution of x, and the derivatives of sum(deconvolution * delta) with
+    respect to x and filters, computed by scattering each input window into the output.
+    """
+    output = np.zeros(out_shape)
+    dx = np.zeros_like(x)
+    dfilters = np.zeros_like(filters)
+    height, width = out_shape[2:]
+    for i in range(x.shape[2]):
+        for j in range(x.shape[3]):
+            for r in range(filters.shape[2]):
+                for s in range(filters.shape[3]):
+                    h = i * conv_params['str_h'] - conv_params['pad_h_below'] + \
+                        r * conv_params['dil_h']
+                    w = j * conv_params['str_w'] - conv_params['pad_w_below'] + \
+                        s * conv_params['dil_w']
+                    if not (0 <= h < height and 0 <= w < width):
+                        continue
+                    output[:, :, h, w] += x[:, :, i, j].dot(filters[:, :, r, s])
+                    dx[:, :, i, j] += delta[:, :, h, w].dot(filters[:, :, r, s].T)
+                    dfilters[:, :, r, s] += x[:, :, i, j].T.dot(delta[:, :, h, w])
+    return output, dx, dfilters
+
+
+@pytest.mark.parametrize('pad_h,pad_w,filter_size', [
+    ((1, 1), (1, 1), 4),
+    # the same stride 2 deconvolution with an odd filter needs one more row and column of
+    # padding on one side
+    ((1, 0), (0, 1), 3),
+])
+def test_deconv_numeric(pad_h, pad_w, filter_size):
+    rng = np.random.RandomState(0)
+    N = ng.make_axis(length=2, name='N')
+    K = ng.make_axis(length=3, name='K')
+    C = ng.make_axis(length=4, name='C')
+    H_in = ng.make_axis(length=4, name='H')
+    W_in = ng.make_axis(length=4, name='W')
+    H = ng.make_axis(length=8, name='H')
+    W = ng.make_axis(length=8, name='W')
+    R = ng.make_axis(length=filter_size, name='R')
+    S = ng.make_axis(length=filter_size, name='S')
+    conv_params = dict(str_h=2, str_w=2, dil_h=1, dil_w=1,
+                       pad_h=pad_h[0], pad_h_below=pad_h[0], pad_h_above=pad_h[1],
+                       pad_w=pad_w[0], pad_w_below=pad_w[0], pad_w_above=pad_w[1])
+
+    x_value = rng.uniform(-1, 1, (2, 3, 4, 4))
+    filters_value = rng.uniform(-1, 1, (3, 4, filter_size, filter_size))
+    delta_value = rng.uniform(-1, 1, (2, 4, 8, 8))
+    x = ng.variable([N, K, H_in, W_in], initial_value=x_value)
+    filters = ng.variable([K, C, R, S], initial_value=filters_value)
+    delta = ng.constant(delta_value, [N, C, H, W])
+    deconv = ng.deconvolution(conv_params, x, filters, axes=ng.make_axes([N, C, H, W]))
+    cost = ng.sum(deconv * delta, out_axes=())
+
+    with ExecutorFactory() as ex:
+        result = ex.executor([deconv, ng.deriv(cost, x), ng.deriv(cost, filters)])()
+    expected = deconv_reference(x_value, filters_value, delta_value, conv_params,
+                                (2, 4, 8, 8))
+    for value, expected_value in zip(result, expected):
+        np.testing.assert_allclose(value, expected_value, rtol=1e-5, atol=1e-5)
@@ -0,0 +1,108 @@
+# ******************************************************************************
+# Copyright 2017-2018 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ******************************************************************************
+import numpy as np
+import pytest
+
+import neon as ng
+from neon.frontend import GradientDescentMomentum
+from neon.testing import ExecutorFactory
+
+pytestmark = pytest.mark.transformer_dependent
+
+V = ng.make_axis(length=10, name='V')
+F = ng.make_axis(length=4, name='F')
+N = ng.make_axis(length=3, name='N')
+T = ng.make_axis(length=2, name='T')
+
+rng = np.random.RandomState(0)
+lut_value = rng.randn(V.length, F.length).astype(np.float32)
+idx_value = np.array([[1, 7], [7, 0], [3, 1]], dtype=np.float32)
+delta_value = rng.randn(N.length, T.length, F.length).astype(np.float32)
+
+
+def expected_gradient(idx, pad_idx=None):
+    """
+    Returns the gradient of sum(lookup * delta) over the rows of the lut.
+    """
+    idx = idx.astype(int)
+    delta = delta_value.reshape(idx.shape + (F.length,))
+    if pad_idx is not None:
+        delta = delta * (idx != pad_idx)[..., np.newaxis]
+    gradient = np.zeros_like(lut_value)
+    np.add.at(gradient, idx, delta)
+    return gradient
+
+
+@pytest.mark.parametrize('idx_axes,idx_values', [([N, T], idx_value), ([N], idx_value[:, 0])])
+@pytest.mark.parametrize('transpose', [False, True])
+def test_lookup(idx_axes, idx_values, transpose):
+    if transpose:
+        lut = ng.constant(lut_value.T, [F, V])
+        out_axes = [F] + idx_axes
+    else:
+        lut = ng.constant(lut_value, [V, F])
+        out_axes = idx_axes + [F]
+    idx = ng.placeholder(idx_axes)
+    with ExecutorFactory() as ex:
+        result = ex.executor(ng.lookuptable(lut, idx, out_axes), idx)(idx_values)
+    expected = lut_value[idx_values.astype(int)]
+    if transpose:
+        expected = np.moveaxis(expected, -1, 0)
+    ng.testing.assert_allclose(result, expected)
+
+
+@pytest.mark.parametrize('pad_idx', [None, 7])
+@pytest.mark.parametrize('transpose', [False, True])
+def test_lookup_gradient(pad_idx, transpose):
+    if transpose:
+        lut = ng.variable([F, V], initial_value=lut_value.T)
+        out_axes = [F, N, T]
+    else:
+        lut = ng.variable([V, F], initial_value=lut_value)
+        out_axes = [N, T, F]
+    idx = ng.placeholder([N, T])
+    lookup = ng.lookuptable(lut, idx, out_axes, pad_idx=pad_idx)
+    cost = ng.sum(lookup * ng.constant(delta_value, [N, T, F]), out_axes=())
+    with ExecutorFactory() as ex:
+        result = ex.executor(ng.deriv(cost, lut), idx)(idx_value)
+    expected = expected_gradient(idx_value, pad_idx)
+    ng.testing.assert_allclose(result, expected.T if transpose else expected)
+
+
+def test_lookup_no_update():
+    lut = ng.variable([V, F], initial_value=lut_value)
+    idx = ng.placeholder([N, T])
+    lookup = ng.lookuptable(lut, idx, [N, T, F], update=False)
+    cost = ng.sum(lookup * ng.constant(delta_value, [N, T, F]), out_axes=())
+    with ExecutorFactory() as ex:
+        result = ex.executor(ng.deriv(cost, lut), idx)(idx_value)
+    ng.testing.assert_allclose(result, np.zeros_like(lut_value))
+
+
+@pytest.mark.parametrize('momentum_coef', [0.0, 0.5])
+def test_sgd_update(momentum_coef):
+    lut = ng.variable([V, F], initial_value=lut_value)
+    idx = ng.placeholder([N, T])
+    lookup = ng.lookuptable(lut, idx, [N, T, F], pad_idx=0)
+    cost = ng.sum(lookup * ng.constant(delta_value, [N, T, F]), out_axes=())
+    update = GradientDescentMomentum(0.1, momentum_coef=momentum_coef)(cost)
+    with ExecutorFactory() as ex:
+        train = ex.executor(update, idx)
+        weights = ex.executor(lut)
+        train(idx_value)
+        result = weights()
+    expected = lut_value - 0.1 * expected_gradient(idx_value, pad_idx=0)
+    ng.testing.assert_allclose(result, expected, rtol=1e-5, atol=1e-6)
@@ -0,0 +1,47 @@
+# ******************************************************************************
+# Copyright 2017-2018 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ******************************************************************************
+import numpy as np
+import pytest
+
+import neon as ng
+from neon.frontend import GaussianInit, Logistic, LSTM, Tanh
+from neon.testing import ExecutorFactory
+
+pytestmark = pytest.mark.transformer_dependent
+
+
+def lstm_outputs(fuse_gates, backward=False):
+    F = ng.make_axis(length=5, name='F')
+    T = ng.make_axis(length=4, name='REC')
+    N = ng.make_axis(length=3, name='N')
+    x = ng.constant(np.random.RandomState(0).randn(5, 4, 3), axes=[F, T, N])
+    # the same seed gives both layers the same weights
+    np.random.seed(1)
+    lstm = LSTM(6, GaussianInit(std=0.5), activation=Tanh(), gate_activation=Logistic(),
+                backward=backward, fuse_gates=fuse_gates)
+    output = lstm(x)
+    cost = ng.sum(output * output, out_axes=())
+    params = [lstm.W_input[k] for k in 'ifog'] + [lstm.W_recur[k] for k in 'ifog']
+    with ExecutorFactory() as ex:
+        return ex.executor([output] + [ng.deriv(cost, w) for w in params])()
+
+
+@pytest.mark.parametrize('backward', [False, True])
+def test_lstm_fused_gates_match_unfused(backward):
+    expected = lstm_outputs(False, backward)
+    result = lstm_outputs(True, backward)
+    for x, y in zip(expected, result):
+        np.testing.assert_allclose(x, y, rtol=1e-5, atol=1e-6)
@@ -19,6 +19,7 @@ import numpy as np
 import pytest
 
 import neon as ng
+from neon.op_graph.op_graph import TensorOp
 from neon.testing import ExecutorFactory, executor
 
 
@@ -308,6 +309,10 @@ def test_tensor_dot_tensor():
     (ng.Equal, np.equal),
     (ng.NotEqual, np.not_equal),
     (ng.Less, np.less),
+    (ng.LessEqual, np.less_equal),
+    (ng.Power, np.power),
+    (ng.FloorDivide, np.floor_divide),
+    (ng.Mod, np.mod),
 ])
 def test_binary_op(ng_func, np_func):
     H = ng.make_axis().named('H')
@@ -320,6 +325,14 @@ def test_binary_op(ng_func, np_func):
             'tensor2': [[10, 2, 3, 40], [15, 6, 9, 8]],
             'tensor2_axes': (H, W),
             'axes_lengths': {H: 2, W: 4}
+        },
+        {
+            # operands of both signs, for the sign conventions of FloorDivide and Mod
+            'tensor1': [[-7, 7, -7, 7], [-6, 5, 1, -1]],
+            'tensor1_axes': (H, W),
+            'tensor2': [[2, -2, -2, 2], [3, -3, -2, 4]],
+            'tensor2_axes': (H, W),
+            'axes_lengths': {H: 2, W: 4}
         }]
 
     for test in tests:
@@ -342,7 +355,7 @@ def test_binary_op(ng_func, np_func):
             _ng_computation = ex.executor(_ng_func, tensor1, tensor2)
             _ng_val = _ng_computation(value1, value2)
             _ng_ref = np_func(value1, value2)
-            np.testing.assert_equal(_ng_val, _ng_ref)
+            np.testing.assert_allclose(_ng_val, _ng_ref, rtol=1e-6)
 
 
 @pytest.mark.parametrize('ng_func, np_func', [
@@ -378,3 +391,68 @@ def test_unary_op_(ng_func, np_func):
             _ng_val = _ng_computation(value1)
             _ng_ref = np_func(value1)
             assert np.allclose(_ng_val, _ng_ref, rtol=0, atol=2)
+
+
+@pytest.mark.parametrize('ng_func, np_func', [
+    (ng.tanh, np.tanh),
+    (ng.sigmoidAtomic, lambda x: 1 / (1 + np.exp(-x))),
+    (ng.sin, np.sin),
+    (ng.cos, np.cos),
+    (ng.absolute, np.abs),
+    (ng.sign, np.sign),
+])
+def test_signed_unary_op(ng_func, np_func):
+    H = ng.make_axis(length=2, name='H')
+    W = ng.make_axis(length=4, name='W')
+    x = ng.placeholder([H, W])
+    x_value = np.array([[-3, -1.5, -0.25, 0], [0.25, 1, 2.5, 4]], dtype=np.float32)
+
+    with ExecutorFactory() as ex:
+        result = ex.executor(ng_func(x), x)(x_value)
+    np.testing.assert_allclose(result, np_func(x_value), rtol=1e-5, atol=1e-6)
+
+
+def test_min():
+    H = ng.make_axis(length=2, name='H')
+    W = ng.make_axis(length=3, name='W')
+    x = ng.placeholder([H, W])
+    x_value = np.array([[4, -2, 7], [-5, 3, 0]], dtype=np.float32)
+
+    with ExecutorFactory() as ex:
+        min_h = ex.executor(ng.min(x, reduction_axes=H), x)(x_value)
+        np.testing.assert_array_equal(min_h, x_value.min(axis=0))
+        min_all = ex.executor(ng.min(x, reduction_axes=[H, W]), x)(x_value)
+        np.testing.assert_array_equal(min_all, x_value.min())
+
+
+class UnloweredOp(TensorOp):
+    pass
+
+
+def test_unhandled_op_types():
+    from neon.transformers.passes.pybindwrapperpass import PybindWrapperGenerator
+
+    N = ng.make_axis(length=4)
+    x = ng.placeholder([N])
+    ops = [ng.tanh(UnloweredOp(args=(x,), axes=x.axes)) + UnloweredOp(args=(x,), axes=x.axes)]
+
+    unhandled = PybindWrapperGenerator(None, None).unhandled_op_types(ops)
+    assert list(unhandled.items()) == [('UnloweredOp', 2)]
+
+
+@pytest.mark.parametrize('ng_func, np_func', [
+    (ng.argmax, np.argmax),
+    (ng.argmin, np.argmin),
+])
+@pytest.mark.parametrize('dtype', [np.int32, np.int64])
+def test_index_reduction(ng_func, np_func, dtype):
+    H = ng.make_axis(length=3, name='H')
+    W = ng.make_axis(length=4, name='W')
+    x = ng.placeholder([H, W])
+    # ties resolve to the first index, as in numpy
+    x_value = np.array([[1, 7, 7, 2], [5, 0, 3, 0], [4, 4, 4, 4]], dtype=np.float32)
+
+    with ExecutorFactory() as ex:
+        result = ex.executor(ng_func(x, dtype=dtype, out_axes=[H]), x)(x_value)
+    assert result.dtype == dtype
+    np.testing.assert_array_equal(result, np_func(x_value, axis=1))
@@ -0,0 +1,49 @@
+# ******************************************************************************
+# Copyright 2017-2018 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ******************************************************************************
+import numpy as np
+import pytest
+
+import neon as ng
+from neon.testing import ExecutorFactory
+
+pytestmark = pytest.mark.transformer_dependent
+
+
+def gradients(policy, checkpoints=()):
+    rng = np.random.RandomState(0)
+    F = ng.make_axis(length=5, name='F')
+    G = ng.make_axis(length=5, name='G')
+    N = ng.make_axis(length=3, name='N')
+    x = ng.constant(rng.randn(5, 3), axes=[F, N])
+    weights = [ng.variable([G, F], initial_value=rng.randn(5, 5) / 5) for _ in range(6)]
+    h = x
+    for i, w in enumerate(weights):
+        h = ng.tanh(ng.cast_role(ng.dot(w, h), [F, N])) * ng.exp(h / 10)
+        if i in checkpoints:
+            ng.checkpoint(h)
+    cost = ng.sum(h * h, out_axes=())
+    if policy is not None:
+        ng.recompute(cost, policy=policy)
+    with ExecutorFactory() as ex:
+        return ex.executor([cost] + [ng.deriv(cost, w) for w in weights])()
+
+
+@pytest.mark.parametrize('policy,checkpoints', [('sqrt', ()), ('marked', (1, 3))])
+def test_recompute_gradients(policy, checkpoints):
+    expected = gradients(None)
+    result = gradients(policy, checkpoints)
+    for x, y in zip(expected, result):
+        np.testing.assert_allclose(x, y, rtol=1e-5, atol=1e-6)
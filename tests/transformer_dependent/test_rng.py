@@ -0,0 +1,61 @@
+# ******************************************************************************
+# Copyright 2017-2018 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ******************************************************************************
+import numpy as np
+import pytest
+
+import neon as ng
+import neon.transformers as ngt
+from neon.testing import ExecutorFactory
+from neon.util.philox import philox_normal, philox_uniform, stream_key
+
+pytestmark = pytest.mark.transformer_dependent
+
+
+def test_rng_matches_reference(transformer_factory):
+    ngt.set_transformer_factory(
+        ngt.make_transformer_factory(transformer_factory.name, device_rng=True))
+    A = ng.make_axis(length=3, name='A')
+    B = ng.make_axis(length=5, name='B')
+    u = ng.uniform(ng.make_axes([A, B]), low=-1.0, high=2.0)
+    z = ng.normal(ng.make_axes([A, B]), loc=1.0, scale=3.0)
+    with ExecutorFactory() as ex:
+        uniform = ex.executor(u)
+        normal = ex.executor(z)
+        seed = ex.transformer.rng_seed
+        u_values = [uniform() for _ in range(2)]
+        z_value = normal()
+
+    for step, u_value in enumerate(u_values):
+        np.testing.assert_allclose(u_value, philox_uniform((3, 5), stream_key(seed, 0), step,
+                                                           low=-1.0, high=2.0), rtol=1e-6)
+    # the streams are numbered across the computations of the transformer
+    np.testing.assert_allclose(z_value, philox_normal((3, 5), stream_key(seed, 1), 0,
+                                                      loc=1.0, scale=3.0), rtol=1e-4)
+
+
+def test_host_rng(transformer_factory):
+    ngt.set_transformer_factory(
+        ngt.make_transformer_factory(transformer_factory.name, rng_seed=5))
+    A = ng.make_axis(length=3, name='A')
+    B = ng.make_axis(length=5, name='B')
+    u = ng.uniform(ng.make_axes([A, B]), low=-1.0, high=2.0)
+    with ExecutorFactory() as ex:
+        uniform = ex.executor(u)
+        u_values = [uniform().copy() for _ in range(2)]
+
+    rng = np.random.RandomState(list(stream_key(5, 0)))
+    for u_value in u_values:
+        np.testing.assert_allclose(u_value, rng.uniform(-1.0, 2.0, (3, 5)), rtol=1e-6)
@@ -0,0 +1,56 @@
+# ******************************************************************************
+# Copyright 2017-2018 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ******************************************************************************
+import numpy as np
+import pytest
+
+import neon as ng
+from neon.frontend import GaussianInit, Logistic, LSTM, Recurrent, Tanh
+from neon.testing import ExecutorFactory
+
+pytestmark = pytest.mark.transformer_dependent
+
+
+def recurrent_outputs(layer_type, use_scan, backward):
+    F = ng.make_axis(length=5, name='F')
+    T = ng.make_axis(length=4, name='REC')
+    N = ng.make_axis(length=3, name='N')
+    x = ng.constant(np.random.RandomState(0).randn(5, 4, 3), axes=[F, T, N])
+    # the same seed gives both layers the same weights
+    np.random.seed(1)
+    if layer_type == 'lstm':
+        layer = LSTM(6, GaussianInit(std=0.5), activation=Tanh(), gate_activation=Logistic(),
+                     backward=backward, use_scan=use_scan)
+    else:
+        layer = Recurrent(6, GaussianInit(std=0.5), activation=Tanh(), backward=backward,
+                          use_scan=use_scan)
+    output = layer(x)
+    cost = ng.sum(output * output, out_axes=())
+    if layer_type == 'lstm':
+        params = [layer.W_input[k] for k in 'ifog'] + [layer.W_recur[k] for k in 'ifog'] + \
+            [layer.b[k] for k in 'ifog']
+    else:
+        params = [layer.W_input, layer.W_recur, layer.b]
+    with ExecutorFactory() as ex:
+        return ex.executor([output] + [ng.deriv(cost, w) for w in params])()
+
+
+@pytest.mark.parametrize('layer_type', ['rnn', 'lstm'])
+@pytest.mark.parametrize('backward', [False, True])
+def test_scan_matches_unrolled(layer_type, backward):
+    expected = recurrent_outputs(layer_type, False, backward)
+    result = recurrent_outputs(layer_type, True, backward)
+    for x, y in zip(expected, result):
+        np.testing.assert_allclose(x, y, rtol=1e-5, atol=1e-6)
@@ -0,0 +1,60 @@
+# ******************************************************************************
+# Copyright 2017-2018 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ******************************************************************************
+import numpy as np
+import pytest
+
+import neon as ng
+from neon.testing import check_derivative, RandomTensorGenerator
+
+pytestmark = pytest.mark.transformer_dependent
+
+rng = RandomTensorGenerator(0, np.float32)
+
+C = ng.make_axis(length=5, name='C')
+N = ng.make_axis(length=3, name='N')
+
+
+def make_values():
+    logits = rng.uniform(-2, 2, [C, N])
+    targets = rng.uniform(0.1, 1, [C, N])
+    return logits, targets / targets.sum(axis=0)
+
+
+def test_cross_entropy_logits_gradient():
+    logits_value, targets_value = make_values()
+    logits = ng.placeholder([C, N])
+    targets = ng.constant(targets_value, [C, N])
+    probs = ng.softmax(logits, normalization_axes=[C])
+    cost = ng.sum(ng.cross_entropy_multi(probs, targets), out_axes=())
+    check_derivative(cost, logits, 0.001, logits_value, atol=1e-2, rtol=1e-2)
+
+
+def test_cross_entropy_targets_gradient():
+    logits_value, targets_value = make_values()
+    logits = ng.constant(logits_value, [C, N])
+    targets = ng.placeholder([C, N])
+    probs = ng.softmax(logits, normalization_axes=[C])
+    cost = ng.sum(ng.cross_entropy_multi(probs, targets), out_axes=())
+    check_derivative(cost, targets, 0.001, targets_value, atol=1e-2, rtol=1e-2)
+
+
+def test_softmax_gradient():
+    # the adjoint of the softmax comes from a weighted sum, not from a cross-entropy
+    logits_value, weights_value = make_values()
+    logits = ng.placeholder([C, N])
+    probs = ng.softmax(logits, normalization_axes=[C])
+    cost = ng.sum(probs * ng.constant(weights_value, [C, N]) * probs, out_axes=())
+    check_derivative(cost, logits, 0.001, logits_value, atol=1e-2, rtol=1e-2)